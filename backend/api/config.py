@@ -10,12 +10,24 @@ class Settings(BaseSettings):
     # Database
     firebase_project_id: str = "talent-spark-dev"
     firebase_credentials_path: str = ""
+    database_backend: str = "firestore"  # firestore, sqlite
+    sqlite_path: str = "talent_spark.db"
+    sqlite_pool_size: int = 4
     
     # Storage
-    storage_provider: str = "firebase"  # firebase, cloudinary, s3
+    storage_provider: str = "firebase"  # firebase, cloudinary, local, s3
     cloudinary_cloud_name: str = ""
     cloudinary_api_key: str = ""
     cloudinary_api_secret: str = ""
+    local_storage_root: str = "./data/media"
+    local_storage_base_url: str = "http://localhost:8000"  # public URL of this API, used in media links
+    media_max_age: int = 604800  # stored media never changes once written
+    s3_bucket: str = "talent-spark-videos"
+    s3_endpoint_url: str = ""  # set for MinIO/R2/other S3-compatible servers
+    s3_region: str = ""
+    s3_access_key_id: str = ""  # empty falls back to the standard AWS credential chain
+    s3_secret_access_key: str = ""
+    s3_public_base_url: str = ""  # e.g. a CDN in front of the bucket
     
     # Security
     secret_key: str = "talent-spark-secret-key-change-in-production"
@@ -25,11 +37,95 @@ class Settings(BaseSettings):
     # Upload limits
     max_file_size: int = 100 * 1024 * 1024  # 100MB
     allowed_video_types: list = ["video/webm", "video/mp4"]
+    max_request_overhead: int = 10 * 1024 * 1024  # multipart framing + integrity bundle
+    
+    # Admission control for uploads
+    max_concurrent_uploads: int = 8
+    max_upload_bytes_in_flight: int = 400 * 1024 * 1024
+    upload_rate_per_minute: float = 6.0  # per athlete (or per session for clients without an athlete ID)
+    upload_burst: int = 3
+    upload_device_rate_per_minute: float = 60.0  # per device model; shared by everyone on identical phones
+    upload_device_burst: int = 30
+    admission_retry_after: int = 5  # seconds suggested to shed clients
+    
+    # Review media (proxy, preview clip, poster and sprite sheet)
+    media_pipeline_enabled: bool = True
+    media_pipeline_workers: int = 2  # worker processes
+    media_pipeline_max_pending: int = 8  # jobs waiting or rendering; uploads beyond this get media "deferred"
+    media_backlog_max: int = 10000  # deferred submissions remembered for rendering once slots free up
+    media_spool_dir: str = ""  # uploads wait here for rendering unless storage is local; empty is the system temp dir
+    review_proxy_height: int = 360
+    review_proxy_fps: float = 15.0
+    preview_clip_seconds: float = 4.0
+    sprite_tile_width: int = 160
+    sprite_columns: int = 10
+    sprite_max_frames: int = 50
+    review_jpeg_quality: int = 70
+    review_max_thumbnails: int = 120  # distinct face snapshot images stored per submission
     
     # Admin settings
     admin_emails: list = ["admin@talentspark.com"]
     auto_approve_threshold: float = 0.95
     
+    # Startup
+    prewarm_on_startup: bool = True  # create clients and load OpenCV before reporting ready
+    
+    # Windowed leaderboards (daily, weekly, season)
+    leaderboard_window_top_k: int = 100  # entries kept per window; also the max servable limit
+    season_start_month: int = 1
+    season_length_months: int = 3
+    leaderboard_window_retention_days: int = 400
+    leaderboard_compaction_interval: float = 3600.0  # seconds; 0 disables the background task
+    
+    # Athlete/device performance history
+    history_ring_size: int = 20  # recent values kept per metric
+    history_ewma_alpha: float = 0.3
+    history_z_threshold: float = 3.0  # flag a submission this many std-devs past its history
+    history_min_samples: int = 3  # submissions needed before history can flag anything
+    
+    # Device fingerprint index (multi-account farming)
+    fingerprint_window_hours: float = 168.0  # sliding window for counting profiles per device
+    fingerprint_max_tracked: int = 200  # profiles/sessions kept per device entry
+    shared_device_max_profiles: int = 3  # more distinct profiles than this on one install in the window is flagged
+    shared_model_max_profiles: int = 40  # the same on one phone model/browser/timezone, with or without install IDs
+    
+    # Review queue
+    review_lease_seconds: int = 300  # a claim expires unless renewed or decided within this
+    review_queue_scan: int = 50  # candidates read per page when looking for a free item
+    review_red_head_start_hours: float = 48.0  # red items queue as if submitted this much earlier
+    review_yellow_head_start_hours: float = 12.0
+    review_confidence_head_start_hours: float = 6.0  # scaled by (1 - auto-approval confidence)
+    
+    # Write-behind event log
+    event_spool_dir: str = "./data/events"  # one spool file per worker process
+    event_flush_batch_size: int = 200  # flush as soon as this many events are buffered
+    event_flush_interval: float = 0.5  # seconds; otherwise flush at least this often
+    event_spool_fsync: bool = False  # fsync every append (survives power loss, not just crashes)
+    event_spool_compact_bytes: int = 8 * 1024 * 1024
+    event_projection_max_attempts: int = 5  # then the failing projection skips that event
+    
+    # HTTP caching (seconds clients may reuse a response before revalidating)
+    leaderboard_max_age: int = 15
+    benchmark_max_age: int = 86400
+    admin_stats_refresh_seconds: int = 15  # new uploads show in the admin stats within this
+    
+    # Submission document cache
+    submission_cache_backend: str = "memory"  # memory (per worker), redis (shared across workers)
+    submission_cache_ttl: float = 30.0  # seconds; bounds staleness of per-worker caches
+    submission_cache_max_entries: int = 10000
+    redis_url: str = "redis://localhost:6379/0"
+    
+    # Status push (SSE)
+    status_push_bridge: str = "none"  # none, firestore (on_snapshot for multi-worker deployments)
+    status_stream_poll_interval: float = 30.0  # seconds between fallback re-reads per stream
+    status_stream_max_duration: float = 900.0  # close streams after this long; clients reconnect
+    status_bridge_rewatch_after: int = 200  # restart the Firestore watch once it holds this many documents
+    
+    # Observability
+    metrics_enabled: bool = True
+    profiling_header_enabled: bool = True  # honour X-Profile: 1 with a Server-Timing breakdown
+    health_probe_timeout: float = 2.0  # seconds per dependency probe
+    
     class Config:
         env_file = ".env"
 
@@ -1,21 +1,74 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+import time
+
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.datastructures import Headers, MutableHeaders
+from contextlib import asynccontextmanager
 import uvicorn
 from typing import Optional
+import asyncio
 import json
 
-from .routes import submissions, decisions
+from .routes import submissions, decisions, exports, athletes, media, events, review_queue
 from .config import get_settings
+from .services.repository import get_repository
+from .services.storage import get_storage_service
+from .services.warmup import prewarm
+from .services.status_broker import status_broker, start_status_broker
+from .services.admission import AdmissionMiddleware
+from .services.submission_cache import get_submission_cache
+from .services.media import get_media_pipeline
+from .services.leaderboard_windows import leaderboard_compactor
+from .services.event_log import get_event_log
+from .services.review_queue import backfill_queue_keys
+from .services.metrics import (
+    registry, timed, start_profile, format_server_timing, HTTP_LATENCY
+)
 
 settings = get_settings()
 
+startup_report = {
+    "import_ms": round((time.perf_counter() - _import_started) * 1000, 2),
+    "ready": False
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-warm clients before accepting traffic"""
+    startup_report["warmup"] = await prewarm()
+    start_status_broker()
+    leaderboard_compactor.start(get_repository)
+    get_event_log().start(get_repository)
+    if settings.media_pipeline_enabled:
+        get_media_pipeline().start(get_repository)
+    try:
+        backfilled = await asyncio.to_thread(backfill_queue_keys, get_repository())
+        if backfilled:
+            print(f"Review queue: added {backfilled} pending submissions")
+    except Exception as e:
+        print(f"Review queue backfill failed: {e}")
+    startup_report["ready"] = True
+    print(f"Startup: imports {startup_report['import_ms']} ms, warm-up {startup_report['warmup']}")
+    yield
+    status_broker.stop()
+    leaderboard_compactor.stop()
+    # Write through whatever is still buffered; anything that fails stays spooled
+    await get_event_log().stop(get_repository())
+    get_media_pipeline().shutdown()
+
 app = FastAPI(
     title="Talent Spark API",
     description="AI-powered sports talent assessment backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Upload admission control; registered first so CORS headers wrap its rejections
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,26 +76,129 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Server-Timing", "Retry-After"],
 )
 
+class RequestInstrumentation:
+    """
+    Record request latency and optionally return a per-stage breakdown.
+
+    Plain ASGI rather than @app.middleware("http"): it only touches the
+    response start message, so streamed and zero-copy file bodies pass
+    through untouched.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stages = None
+        if settings.profiling_header_enabled and Headers(scope=scope).get("x-profile") == "1":
+            stages = start_profile()
+        
+        start = time.perf_counter()
+        
+        async def send_instrumented(message):
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start
+                route = scope.get("route")
+                HTTP_LATENCY.observe(
+                    duration,
+                    method=scope["method"],
+                    route=route.path if route is not None else "unmatched",
+                    status=str(message["status"])
+                )
+                if stages is not None:
+                    stages.append(("total", duration))
+                    MutableHeaders(scope=message)["Server-Timing"] = format_server_timing(stages)
+            await send(message)
+        
+        await self.app(scope, receive, send_instrumented)
+
+app.add_middleware(RequestInstrumentation)
+
 # Health check
 @app.get("/")
 async def health_check():
     return {"status": "healthy", "service": "talent-spark-api"}
 
+async def _probe(name: str, check) -> dict:
+    """Run a dependency probe with a timeout and report its latency"""
+    start = time.perf_counter()
+    try:
+        with timed(f"health.{name}"):
+            ok = await asyncio.wait_for(check(), timeout=settings.health_probe_timeout)
+        status = "connected" if ok else "unavailable"
+        error = None
+    except asyncio.TimeoutError:
+        status, error = "timeout", f"No response within {settings.health_probe_timeout}s"
+    except Exception as e:
+        status, error = "error", str(e)
+    
+    result = {"status": status, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+    if error:
+        result["error"] = error
+    return result
+
+async def _check_database() -> bool:
+    repository = get_repository()
+    return await asyncio.to_thread(repository.ping)
+
+async def _check_storage() -> bool:
+    storage = get_storage_service()
+    return await storage.health_check()
+
 @app.get("/health")
 async def detailed_health():
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "environment": settings.environment,
-        "database": "connected",
-        "storage": "connected"
-    }
+    database, storage = await asyncio.gather(
+        _probe("database", _check_database),
+        _probe("storage", _check_storage)
+    )
+    healthy = database["status"] == "connected" and storage["status"] == "connected"
+    
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "degraded",
+            "version": "1.0.0",
+            "environment": settings.environment,
+            "database": database,
+            "storage": storage,
+            "submission_cache": get_submission_cache().stats(),
+            "event_log": get_event_log().stats(),
+            "startup": startup_report
+        }
+    )
+
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once warm-up has finished"""
+    if not startup_report["ready"]:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True, "startup": startup_report}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of internal metrics"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 # Include routers
 app.include_router(submissions.router, prefix="/api", tags=["submissions"])
 app.include_router(decisions.router, prefix="/api", tags=["decisions"])
+app.include_router(exports.router, prefix="/api", tags=["exports"])
+app.include_router(athletes.router, prefix="/api", tags=["athletes"])
+app.include_router(media.router, prefix="/api", tags=["media"])
+app.include_router(events.router, prefix="/api", tags=["events"])
+app.include_router(review_queue.router, prefix="/api", tags=["review-queue"])
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -7,6 +7,9 @@ class Gender(str, Enum):
     MALE = "male"
     FEMALE = "female"
 
+# Leaderboard age bands, as assigned by routes.decisions.get_age_band
+AGE_BANDS = ("13-15", "16-18", "19-25", "26-35", "36+")
+
 class SubmissionStatus(str, Enum):
     PENDING = "pending"
     APPROVED = "approved"
@@ -18,6 +21,18 @@ class RiskLevel(str, Enum):
     YELLOW = "yellow" 
     RED = "red"
 
+class LeaderboardWindow(str, Enum):
+    ALL = "all"
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    SEASON = "season"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
 class ProfileData(BaseModel):
     age: int = Field(..., ge=10, le=100)
     gender: Gender
@@ -59,6 +74,7 @@ class IntegrityBundle(BaseModel):
     assessment_data: AssessmentData
     content_hash: str
     version: str
+    athlete_id: Optional[str] = Field(None, max_length=64)  # stable per-install ID; history falls back to the device
 
 class SubmissionCreate(BaseModel):
     integrity_bundle: IntegrityBundle
@@ -69,6 +85,21 @@ class SubmissionResponse(BaseModel):
     message: str
     upload_url: Optional[str] = None
 
+class SpriteLayout(BaseModel):
+    tile_width: int
+    tile_height: int
+    columns: int
+    offsets: List[float]  # seconds into the video, one per tile
+
+class ReviewMedia(BaseModel):
+    status: str  # pending, ready, failed, deferred (pipeline was full)
+    proxy_url: Optional[str] = None
+    preview_url: Optional[str] = None
+    poster_url: Optional[str] = None
+    sprite_url: Optional[str] = None
+    sprite: Optional[SpriteLayout] = None
+    error: Optional[str] = None
+
 class SubmissionDetail(BaseModel):
     id: str
     profile_data: ProfileData
@@ -80,10 +111,14 @@ class SubmissionDetail(BaseModel):
     created_at: datetime
     reviewed_at: Optional[datetime] = None
     reviewer_notes: Optional[str] = None
+    reviewed_by: Optional[str] = None
+    media: Optional[ReviewMedia] = None  # filled in after ingestion by the media pipeline
 
 class ReviewDecision(BaseModel):
     decision: SubmissionStatus
     notes: Optional[str] = None
+    reviewer: Optional[str] = Field(None, max_length=64)
+    lease_token: Optional[str] = None  # required while someone holds a review lease on it
     
     @validator('decision')
     def validate_decision(cls, v):
@@ -100,6 +135,73 @@ class LeaderboardEntry(BaseModel):
     form_score: float
     submission_date: datetime
     
+class MetricProgress(BaseModel):
+    count: int
+    mean: float
+    std: float
+    ewma: float
+    min: float
+    max: float
+    last: float
+    recent: List[float]  # oldest first
+
+class ClaimRequest(BaseModel):
+    reviewer: str = Field(..., min_length=1, max_length=64)
+
+class LeaseRequest(BaseModel):
+    lease_token: str
+
+class ReviewLease(BaseModel):
+    submission_id: str
+    reviewer: str
+    lease_token: str
+    expires_at: datetime
+
+class ReviewQueueItem(BaseModel):
+    submission_id: str
+    risk_score: RiskLevel
+    created_at: datetime
+    auto_approval_confidence: Optional[float] = None
+    claimed_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    queue_key: float  # with submission_id, the cursor for the next page
+
+class FaceTimeline(BaseModel):
+    started_at: Optional[int] = None  # epoch ms of the first snapshot
+    offsets_ms: List[int]  # from started_at; the arrays below line up with this one
+    confidence: List[float]
+    gap_before: List[bool]  # a face gap longer than the verifier allows precedes this snapshot
+    thumbnails: List[Optional[str]]
+    max_gap_ms: int
+    low_confidence: int
+    min_confidence: float
+
+class VerificationCheck(BaseModel):
+    check: str
+    label: str
+    passed: bool
+    detail: Optional[str] = None
+
+class ReviewEvent(BaseModel):
+    type: str
+    at: datetime
+    actor: Optional[str] = None
+
+class ReviewBundle(BaseModel):
+    submission: SubmissionDetail
+    checks: List[VerificationCheck]
+    timeline: FaceTimeline
+    history_zscores: Dict[str, float] = {}
+    device_profiles: Optional[int] = None
+    events: List[ReviewEvent] = []
+
+class AthleteProgress(BaseModel):
+    athlete_id: str
+    submissions: int
+    first_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    metrics: Dict[str, MetricProgress]
+
 class BenchmarkResult(BaseModel):
     grade: str
     percentile: int
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException
+
+from ..models.schemas import AthleteProgress
+from ..services.repository import get_repository
+from ..services.history import HISTORY_COLLECTION, progress
+
+router = APIRouter()
+
+@router.get("/athletes/{athlete_id}/progress", response_model=AthleteProgress)
+async def get_athlete_progress(athlete_id: str):
+    """
+    Running performance statistics for the Profile screen, read from the
+    precomputed history rather than past submissions
+    """
+    try:
+        repository = get_repository()
+        history = repository.get_document(HISTORY_COLLECTION, f"athlete:{athlete_id}")
+        
+        if not history:
+            raise HTTPException(status_code=404, detail="No history for this athlete")
+        
+        return AthleteProgress(athlete_id=athlete_id, **progress(history))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Progress fetch failed: {str(e)}")
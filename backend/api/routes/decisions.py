@@ -1,43 +1,73 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
+import time
 
 from ..models.schemas import (
     ReviewDecision, SubmissionStatus, LeaderboardEntry, 
-    BenchmarkResult, Gender
+    BenchmarkResult, Gender, LeaderboardWindow
 )
 from ..services.scoring import ScoreCalculator
-from ..services.db import get_firestore_client
+from ..services.repository import get_repository
+from ..services.submission_cache import get_submission_cache
+from ..services.leaderboard_windows import record_approval, current_window_key, get_window_entries
+from ..services.status_broker import status_broker, status_payload
+from ..services.event_log import get_event_log, projection, SUBMISSION_DECIDED, LEADERBOARD_UPDATED
+from ..services.review_queue import decide, LeaseConflict
+from ..services.metrics import timed
+from ..services.http_cache import (
+    conditional_response, make_etag, leaderboard_version_key, leaderboards_version,
+    SUBMISSIONS_VERSION_KEY
+)
+from ..config import get_settings
 
 router = APIRouter()
 
+# Bump whenever the benchmark tables in ScoreCalculator change
+BENCHMARK_TABLES_VERSION = "2024-1"
+
 @router.post("/submissions/{submission_id}/decision")
 async def make_decision(submission_id: str, decision: ReviewDecision):
     """
     Admin decision on submission (approve/reject)
     """
     try:
-        db = get_firestore_client()
-        
-        # Get submission
-        doc = db.collection("submissions").document(submission_id).get()
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail="Submission not found")
-            
-        submission_data = doc.to_dict()
+        repository = get_repository()
+        cache = get_submission_cache()
         
         # Update submission status
+        reviewed_at = datetime.now()
         update_data = {
             "status": decision.decision.value,
-            "reviewed_at": datetime.now(),
-            "reviewer_notes": decision.notes
+            "reviewed_at": reviewed_at,
+            "updated_at": reviewed_at,
+            "reviewer_notes": decision.notes,
+            "reviewed_by": decision.reviewer
         }
         
-        db.collection("submissions").document(submission_id).update(update_data)
+        # Checks the review lease, records the decision and releases the lease in one
+        # transaction, so an item is decided once however many reviewers try
+        try:
+            submission_data = decide(repository, submission_id, decision.lease_token, update_data)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        except LeaseConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        cache.put(submission_data)
+        repository.touch_version(SUBMISSIONS_VERSION_KEY)
+        status_broker.publish(submission_id, status_payload(submission_id, submission_data))
         
-        # If approved, add to leaderboard
+        # If approved, the leaderboard entry goes in the same event
+        leaderboard_entry = None
         if decision.decision == SubmissionStatus.APPROVED:
-            await add_to_leaderboard(submission_data, db)
+            leaderboard_entry = leaderboard_entry_for(submission_data)
+        
+        # Leaderboards and counters follow on the next flush
+        get_event_log().append(SUBMISSION_DECIDED, submission_id, {
+            "decision": decision.decision.value,
+            "update": update_data,
+            "leaderboard_entry": leaderboard_entry
+        }, actor=decision.reviewer)
             
         return {
             "success": True,
@@ -46,33 +76,52 @@ async def make_decision(submission_id: str, decision: ReviewDecision):
             "message": "Decision recorded successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Decision failed: {str(e)}")
 
-async def add_to_leaderboard(submission_data: dict, db):
+@projection(SUBMISSION_DECIDED)
+def apply_decision(repository, event: dict):
     """
-    Add approved submission to leaderboard
+    Put an approved submission on the leaderboards; the submission itself
+    was updated when the decision was made
     """
+    entry = event["data"].get("leaderboard_entry")
+    if entry is None:
+        return []
+    write_leaderboard_entry(repository, entry)
+    return [(LEADERBOARD_UPDATED, event["submission_id"], {
+        "age_band": entry["age_band"],
+        "gender": entry["gender"],
+        "total_reps": entry["total_reps"]
+    }, event.get("actor"))]
+
+def leaderboard_entry_for(submission_data: dict) -> dict:
+    """Leaderboard entry for an approved submission"""
     profile = submission_data["profile_data"]
     assessment = submission_data["assessment_data"]
     
-    # Determine age band
-    age_band = get_age_band(profile["age"])
-    
-    # Create leaderboard entry
-    leaderboard_entry = {
+    return {
         "user_id": f"user_{submission_data['id'][-8:]}",  # Anonymized
-        "age_band": age_band,
+        "age_band": get_age_band(profile["age"]),
         "gender": profile["gender"],
         "total_reps": assessment["total_reps"],
         "form_score": assessment["form_score"],
         "submission_date": submission_data["created_at"],
+        # Picks the daily/weekly/season windows, so a late-night upload approved
+        # the next morning lands on the board that is showing now
+        "approved_at": submission_data.get("reviewed_at"),
         "submission_id": submission_data["id"]
     }
-    
-    # Add to appropriate leaderboard collection
-    collection_name = f"leaderboard_{age_band}_{profile['gender']}"
-    db.collection(collection_name).add(leaderboard_entry)
+
+def write_leaderboard_entry(repository, leaderboard_entry: dict):
+    """Idempotent: entries are keyed by submission, so a replayed approval overwrites itself"""
+    # Add to appropriate age band/gender leaderboard
+    repository.add_leaderboard_entry(leaderboard_entry)
+    # And to the daily/weekly/season rollups
+    record_approval(repository, leaderboard_entry)
+    repository.touch_version(leaderboard_version_key(leaderboard_entry["age_band"], leaderboard_entry["gender"]))
 
 def get_age_band(age: int) -> str:
     """Calculate age band from age"""
@@ -89,61 +138,80 @@ def get_age_band(age: int) -> str:
 
 @router.get("/leaderboard", response_model=List[LeaderboardEntry])
 async def get_leaderboard(
+    request: Request,
     age_band: Optional[str] = None,
     gender: Optional[Gender] = None,
-    limit: int = 100
+    limit: int = 100,
+    window: LeaderboardWindow = LeaderboardWindow.ALL,
+    day: Optional[date] = None
 ):
     """
-    Get leaderboard entries with optional filters
+    Get leaderboard entries with optional filters, all-time or for the
+    day/week/season containing `day` (today by default)
     """
     try:
-        db = get_firestore_client()
+        repository = get_repository()
+        gender_value = gender.value if gender else None
         
-        # If specific filters, query that collection
-        if age_band and gender:
-            collection_name = f"leaderboard_{age_band}_{gender.value}"
-            query = db.collection(collection_name)
+        # One small versions read decides whether the top-N query is needed at all
+        versions = repository.get_versions()
+        if age_band and gender_value and window == LeaderboardWindow.ALL:
+            version = versions.get(leaderboard_version_key(age_band, gender_value), 0)
         else:
-            # Query all leaderboard collections and merge
-            query = db.collection_group("leaderboard")
-            if age_band:
-                query = query.where("age_band", "==", age_band)
-            if gender:
-                query = query.where("gender", "==", gender.value)
-                
-        # Order by reps descending, then form score descending
-        docs = query.order_by("total_reps", direction="DESCENDING")\
-                   .order_by("form_score", direction="DESCENDING")\
-                   .limit(limit).stream()
-        
-        entries = []
-        rank = 1
-        
-        for doc in docs:
-            data = doc.to_dict()
-            entry = LeaderboardEntry(
-                rank=rank,
-                user_id=data["user_id"],
-                age_band=data["age_band"],
-                gender=Gender(data["gender"]),
-                total_reps=data["total_reps"],
-                form_score=data["form_score"],
-                submission_date=data["submission_date"]
-            )
-            entries.append(entry)
-            rank += 1
+            version = leaderboards_version(versions)
+        
+        # Windowed boards are one precomputed document; the key changes at rollover
+        window_key = window.value
+        if window != LeaderboardWindow.ALL:
+            # Past windows are read by naming any day inside them
+            at = datetime.combine(day, datetime.min.time()) if day else None
+            window_key = current_window_key(window.value, at)
+        
+        def build():
+            if window != LeaderboardWindow.ALL:
+                docs = get_window_entries(repository, window_key, age_band, gender_value, limit)
+            else:
+                docs = repository.get_leaderboard(age_band=age_band, gender=gender_value, limit=limit)
+            
+            entries = []
+            rank = 1
             
-        return entries
+            for data in docs:
+                entry = LeaderboardEntry(
+                    rank=rank,
+                    user_id=data["user_id"],
+                    age_band=data["age_band"],
+                    gender=Gender(data["gender"]),
+                    total_reps=data["total_reps"],
+                    form_score=data["form_score"],
+                    submission_date=data["submission_date"]
+                )
+                entries.append(entry)
+                rank += 1
+                
+            return entries
+        
+        return conditional_response(
+            request,
+            endpoint="leaderboard",
+            etag=make_etag("leaderboard", window_key, age_band, gender_value, limit, version),
+            cache_control=f"public, max-age={get_settings().leaderboard_max_age}",
+            build=build
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Leaderboard fetch failed: {str(e)}")
 
 @router.get("/benchmark/{age}/{gender}/{reps}", response_model=BenchmarkResult)
-async def get_benchmark_result(age: int, gender: Gender, reps: int):
+async def get_benchmark_result(age: int, gender: Gender, reps: int, request: Request):
     """
     Get benchmark comparison for given performance
     """
     try:
+        # Pure function of the path and the benchmark tables, so it can be cached freely
+        etag = make_etag("benchmark", age, gender.value, reps, BENCHMARK_TABLES_VERSION)
+        cache_control = f"public, max-age={get_settings().benchmark_max_age}"
+        
         calculator = ScoreCalculator()
         
         profile_data = {
@@ -153,38 +221,54 @@ async def get_benchmark_result(age: int, gender: Gender, reps: int):
             "weight": 65    # Default for benchmark calculation
         }
         
-        result = calculator.compare_performance(reps, profile_data)
+        def build():
+            with timed("scoring.compare_performance"):
+                result = calculator.compare_performance(reps, profile_data)
+            return BenchmarkResult(**result)
         
-        return BenchmarkResult(**result)
+        return conditional_response(
+            request, endpoint="benchmark", etag=etag, cache_control=cache_control, build=build
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Benchmark calculation failed: {str(e)}")
 
 @router.get("/admin/stats")
-async def get_admin_stats():
+async def get_admin_stats(request: Request):
     """
     Get admin dashboard statistics
     """
     try:
-        db = get_firestore_client()
+        repository = get_repository()
+        version = repository.get_versions().get(SUBMISSIONS_VERSION_KEY, 0)
+        # Uploads don't bump the version, so the counts are also refreshed on a timer
+        settings = get_settings()
+        refresh = int(time.time() // settings.admin_stats_refresh_seconds)
         
-        # Get counts by status
-        submissions_ref = db.collection("submissions")
-        
-        pending_count = len(list(submissions_ref.where("status", "==", "pending").stream()))
-        approved_count = len(list(submissions_ref.where("status", "==", "approved").stream()))
-        rejected_count = len(list(submissions_ref.where("status", "==", "rejected").stream()))
-        flagged_count = len(list(submissions_ref.where("risk_score", "==", "red").stream()))
-        
-        total_count = pending_count + approved_count + rejected_count
+        def build():
+            # Get counts by status
+            pending_count = repository.count_submissions(status="pending")
+            approved_count = repository.count_submissions(status="approved")
+            rejected_count = repository.count_submissions(status="rejected")
+            flagged_count = repository.count_submissions(risk_score="red")
+            
+            total_count = pending_count + approved_count + rejected_count
+            
+            return {
+                "pending_reviews": pending_count,
+                "approved_today": approved_count,  # Could be refined to today only
+                "flagged_submissions": flagged_count,
+                "total_assessments": total_count,
+                "approval_rate": round((approved_count / total_count * 100), 1) if total_count > 0 else 0
+            }
         
-        return {
-            "pending_reviews": pending_count,
-            "approved_today": approved_count,  # Could be refined to today only
-            "flagged_submissions": flagged_count,
-            "total_assessments": total_count,
-            "approval_rate": round((approved_count / total_count * 100), 1) if total_count > 0 else 0
-        }
+        return conditional_response(
+            request,
+            endpoint="admin_stats",
+            etag=make_etag("admin_stats", version, refresh),
+            cache_control="private, no-cache",
+            build=build
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Stats fetch failed: {str(e)}")
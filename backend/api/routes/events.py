@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException
+
+from ..services.repository import get_repository
+from ..services.event_log import audit_trail, get_counters
+
+router = APIRouter()
+
+@router.get("/submissions/{submission_id}/audit")
+async def get_submission_audit(submission_id: str):
+    """
+    Audit trail for a submission, oldest first, including events this
+    worker has not flushed yet
+    """
+    try:
+        events = audit_trail(get_repository(), submission_id)
+        
+        if not events:
+            raise HTTPException(status_code=404, detail="No events for this submission")
+        
+        return {"submission_id": submission_id, "events": events}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Event fetch failed: {str(e)}")
+
+@router.get("/events/counters")
+async def get_event_counters():
+    """
+    Lifetime event counts projected from the log
+    """
+    try:
+        return {"counts": get_counters(get_repository())}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Counter fetch failed: {str(e)}")
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+
+from ..models.schemas import ExportFormat, SubmissionStatus, Gender
+from ..services.repository import get_repository
+from ..services.export import (
+    stream_export, parse_fields, arrow_available, EXPORT_FORMATS,
+    SUBMISSION_FIELDS, DEFAULT_SUBMISSION_FIELDS, LEADERBOARD_FIELDS, DEFAULT_LEADERBOARD_FIELDS
+)
+
+router = APIRouter()
+
+# Rows per repository page and per encoded chunk
+EXPORT_BATCH_SIZE = 500
+
+def _export_response(dataset: str, format: ExportFormat, fields: list, types: dict, rows) -> StreamingResponse:
+    media_type, extension = EXPORT_FORMATS[format.value]
+    filename = f"{dataset}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    
+    # A plain generator, so Starlette pulls each chunk in its threadpool and
+    # the blocking repository reads never run on the event loop
+    return StreamingResponse(
+        stream_export(rows, fields, types, format.value, dataset, EXPORT_BATCH_SIZE),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store"
+        }
+    )
+
+def _resolve_fields(raw: Optional[str], allowed: dict, default: list, format: ExportFormat) -> list:
+    if format in (ExportFormat.PARQUET, ExportFormat.ARROW) and not arrow_available():
+        raise HTTPException(status_code=501, detail=f"{format.value} export requires pyarrow on the server")
+    try:
+        return parse_fields(raw, allowed, default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/exports/submissions")
+async def export_submissions(
+    format: ExportFormat = ExportFormat.NDJSON,
+    status: Optional[SubmissionStatus] = None,
+    fields: Optional[str] = None
+):
+    """
+    Stream every submission, newest first, for selection committees
+    """
+    selected = _resolve_fields(fields, SUBMISSION_FIELDS, DEFAULT_SUBMISSION_FIELDS, format)
+    
+    rows = get_repository().iter_submissions(
+        status=status.value if status else None, fields=selected, batch_size=EXPORT_BATCH_SIZE
+    )
+    return _export_response("submissions", format, selected, SUBMISSION_FIELDS, rows)
+
+@router.get("/exports/leaderboard")
+async def export_leaderboard(
+    format: ExportFormat = ExportFormat.NDJSON,
+    age_band: Optional[str] = None,
+    gender: Optional[Gender] = None,
+    fields: Optional[str] = None
+):
+    """
+    Stream the full leaderboard in rank order
+    """
+    selected = _resolve_fields(fields, LEADERBOARD_FIELDS, DEFAULT_LEADERBOARD_FIELDS, format)
+    
+    rows = get_repository().iter_leaderboard(
+        age_band=age_band, gender=gender.value if gender else None,
+        fields=selected, batch_size=EXPORT_BATCH_SIZE
+    )
+    return _export_response("leaderboard", format, selected, LEADERBOARD_FIELDS, rows)
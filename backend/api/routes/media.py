@@ -0,0 +1,78 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from datetime import datetime
+from email.utils import format_datetime
+import mimetypes
+import os
+import posixpath
+import stat
+
+from ..config import get_settings
+from ..services.storage import get_storage_service, LocalStorageService, TEMP_PREFIX
+from ..services.http_cache import is_not_modified, CONDITIONAL_REQUESTS
+from ..services.file_response import (
+    RangeFileResponse, RangeNotSatisfiable, parse_range, file_etag
+)
+
+router = APIRouter()
+
+# Not in every platform's mimetypes table
+mimetypes.add_type("video/webm", ".webm")
+
+@router.api_route("/media/{path:path}", methods=["GET", "HEAD"])
+async def get_media(path: str, request: Request):
+    """
+    Serve a locally stored video or review asset, honouring Range requests
+    so the admin player can seek without downloading the whole file
+    """
+    storage = get_storage_service()
+    if not isinstance(storage, LocalStorageService):
+        raise HTTPException(status_code=404, detail="Media is not served by this node")
+
+    if posixpath.basename(path).startswith(TEMP_PREFIX):
+        # A half-written upload; the finished object appears under its own name
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    try:
+        file_path = storage.path_for(path)
+        file_stat = os.stat(file_path)
+    except (ValueError, FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        # Shard and submission directories, sockets, devices
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    etag = file_etag(file_stat)
+    last_modified = datetime.fromtimestamp(file_stat.st_mtime)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(), usegmt=True),
+        "Cache-Control": f"public, max-age={get_settings().media_max_age}",
+        "Accept-Ranges": "bytes",
+    }
+
+    if is_not_modified(request, etag, last_modified):
+        CONDITIONAL_REQUESTS.inc(endpoint="media", result="not_modified")
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    size = file_stat.st_size
+
+    # A stale If-Range means the client's partial copy is of an older file: send it all
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers=dict(headers, **{"Content-Range": f"bytes */{size}"}))
+
+    if byte_range is None:
+        return RangeFileResponse(file_path, 0, size, 200, headers, media_type)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return RangeFileResponse(file_path, start, end - start + 1, 206, headers, media_type)
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from datetime import datetime
+from typing import List, Optional
+import time
+
+from ..models.schemas import ClaimRequest, LeaseRequest, ReviewLease, ReviewQueueItem
+from ..services.repository import get_repository
+from ..services.submission_cache import get_submission_cache
+from ..services.review_queue import (
+    claim_next, renew, release, queue_item, LeaseConflict, QUEUE_FIELDS
+)
+
+router = APIRouter()
+
+def _lease(data: dict) -> ReviewLease:
+    lease = data["lease"]
+    return ReviewLease(
+        submission_id=data["id"],
+        reviewer=lease["reviewer"],
+        lease_token=lease["token"],
+        expires_at=datetime.fromtimestamp(lease["expires_at"])
+    )
+
+@router.get("/review-queue", response_model=List[ReviewQueueItem])
+async def get_review_queue(limit: int = 50, after_key: Optional[float] = None, after_id: Optional[str] = None):
+    """
+    Pending submissions in the order they will be handed out, with who holds
+    each. Pass the last item's queue_key and submission_id to get the next page
+    """
+    if (after_key is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_key and after_id go together")
+    
+    try:
+        after = (after_key, after_id) if after_key is not None else None
+        docs = get_repository().list_review_queue(limit=min(limit, 200), after=after, fields=QUEUE_FIELDS)
+        now = time.time()
+        return [queue_item(data, now) for data in docs]
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Queue fetch failed: {str(e)}")
+
+@router.post("/review-queue/claim", response_model=ReviewLease)
+async def claim_review(request: ClaimRequest):
+    """
+    Lease the next submission to review; 204 when nothing is free
+    """
+    try:
+        claimed = claim_next(get_repository(), request.reviewer)
+        if claimed is None:
+            return Response(status_code=204)
+        
+        # The transaction read the whole document; the reviewer opens it next
+        get_submission_cache().put(claimed)
+        return _lease(claimed)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Claim failed: {str(e)}")
+
+@router.post("/review-queue/{submission_id}/renew", response_model=ReviewLease)
+async def renew_review(submission_id: str, request: LeaseRequest):
+    """
+    Extend a lease while the reviewer is still working on the item
+    """
+    try:
+        return _lease(renew(get_repository(), submission_id, request.lease_token))
+        
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    except LeaseConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Renew failed: {str(e)}")
+
+@router.post("/review-queue/{submission_id}/release")
+async def release_review(submission_id: str, request: LeaseRequest):
+    """
+    Hand an item back to the queue without deciding it
+    """
+    try:
+        release(get_repository(), submission_id, request.lease_token)
+        get_submission_cache().invalidate(submission_id)
+        return {"success": True, "submission_id": submission_id}
+        
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    except LeaseConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Release failed: {str(e)}")
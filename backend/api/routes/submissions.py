@@ -1,18 +1,35 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 import json
 import asyncio
+import time
 from datetime import datetime
 
 from ..models.schemas import (
     SubmissionCreate, SubmissionResponse, SubmissionDetail,
-    IntegrityBundle, SubmissionStatus, RiskLevel
+    IntegrityBundle, SubmissionStatus, RiskLevel, ReviewBundle
 )
 from ..services.verify import IntegrityVerifier
 from ..services.scoring import ScoreCalculator
-from ..services.storage import get_storage_service
-from ..services.db import get_firestore_client
+from ..services.storage import get_storage_service, LocalStorageService, video_key
+from ..services.repository import get_repository
+from ..services.submission_cache import get_submission_cache, STATUS
+from ..services.media import get_media_pipeline
+from ..services.history import history_keys, load_histories, anomaly_flags, record_submission
+from ..services.fingerprint import record_sighting
+from ..services.status_broker import status_broker, status_payload
+from ..services.event_log import get_event_log, audit_trail, SUBMISSION_CREATED, SUBMISSION_VERIFIED
+from ..services.review import store_thumbnails, stored_bundle, face_timeline, stored_timeline, verification_checks
+from ..services.review_queue import queue_fields
+from ..services.http_cache import conditional_response, make_etag
+from ..services.admission import (
+    get_upload_rate_limiter, upload_rate_keys, retry_after_header, ADMISSION_REJECTIONS
+)
+from ..config import get_settings
+from ..services.metrics import (
+    timed, RISK_LEVELS, RISK_FLAGS, UPLOADS_IN_FLIGHT, UPLOAD_BYTES_BUFFERED
+)
 
 router = APIRouter()
 
@@ -24,54 +41,156 @@ async def create_submission(
     """
     Create new assessment submission with video and integrity data
     """
+    UPLOADS_IN_FLIGHT.inc()
+    buffered_bytes = 0
+    media_slot = None
     try:
-        # Parse integrity bundle
-        bundle_data = json.loads(integrity_bundle)
-        bundle = IntegrityBundle(**bundle_data)
+        settings = get_settings()
         
-        # Verify video file
-        if video.content_type not in ["video/webm", "video/mp4"]:
+        # Verify video file; malformed requests are turned away before they use up rate limit tokens
+        if video.content_type not in settings.allowed_video_types:
             raise HTTPException(status_code=400, detail="Invalid video format")
         
-        if video.size > 100 * 1024 * 1024:  # 100MB limit
+        if video.size > settings.max_file_size:
             raise HTTPException(status_code=400, detail="Video file too large")
         
+        # Parse integrity bundle
+        with timed("parse.integrity_bundle"):
+            bundle_data = json.loads(integrity_bundle)
+            bundle = IntegrityBundle(**bundle_data)
+        
+        # Per-athlete and per-device rate limit, before any verification work
+        wait = get_upload_rate_limiter().acquire(*upload_rate_keys(bundle))
+        if wait > 0:
+            ADMISSION_REJECTIONS.inc(reason="rate_limited")
+            raise HTTPException(
+                status_code=429,
+                detail="Too many submissions, retry later",
+                headers={"Retry-After": retry_after_header(wait)}
+            )
+        
         # Initialize services
         verifier = IntegrityVerifier()
         storage = get_storage_service()
-        db = get_firestore_client()
+        repository = get_repository()
         
         # Generate submission ID
         submission_id = f"sub_{int(datetime.now().timestamp())}_{bundle.session_id[-6:]}"
         
         # Perform integrity verification
-        video_content = await video.read()
+        with timed("upload.read_body"):
+            video_content = await video.read()
+        buffered_bytes = len(video_content)
+        UPLOAD_BYTES_BUFFERED.inc(buffered_bytes)
         verification_result = await verifier.verify_bundle(bundle, video_content)
         
-        # Upload video to storage
-        video_filename = f"submissions/{submission_id}/video.webm"
-        video_url = await storage.upload_video(video_content, video_filename)
+        # Upload video and face thumbnails to storage
+        video_filename = video_key(submission_id)
+        snapshots = bundle.face_snapshots
+        video_url, thumbnails = await asyncio.gather(
+            storage.upload_video(video_content, video_filename, content_type=video.content_type),
+            store_thumbnails(storage, submission_id, snapshots),
+            return_exceptions=True
+        )
+        if isinstance(video_url, Exception):
+            raise video_url
+        if isinstance(thumbnails, Exception):
+            # The review screen copes without them
+            print(f"Thumbnail upload failed for {submission_id}: {thumbnails}")
+            thumbnails = None
+        
+        # Compare against the athlete's and device's running history
+        assessment = bundle.assessment_data.dict()
+        keys = history_keys(bundle)
+        try:
+            history_flags = anomaly_flags(load_histories(repository, keys), assessment)
+        except Exception as e:
+            print(f"History lookup failed: {e}")
+            history_flags = {}
+        
+        # Profiles seen on this device recently; records this one in the same transaction
+        created_at = datetime.now()
+        try:
+            device_sighting = record_sighting(repository, bundle, created_at)
+        except Exception as e:
+            print(f"Device fingerprint lookup failed: {e}")
+            device_sighting = None
         
         # Calculate risk score
         risk_score, risk_flags = verifier.calculate_risk_score(
-            verification_result, bundle
+            verification_result, bundle, history_flags, device_sighting
         )
+        RISK_LEVELS.inc(level=risk_score.value)
+        for flag in risk_flags:
+            RISK_FLAGS.inc(flag=flag)
         
         # Store in database
         submission_doc = {
             "id": submission_id,
             "profile_data": bundle.profile_data.dict(),
-            "assessment_data": bundle.assessment_data.dict(),
+            "assessment_data": assessment,
             "video_url": video_url,
             "risk_score": risk_score.value,
             "risk_flags": risk_flags,
+            "athlete_id": bundle.athlete_id,
+            "history_zscores": history_flags,
+            "device_fingerprint": device_sighting["fingerprint"] if device_sighting else None,
+            "device_profiles": device_sighting["profiles"] if device_sighting else None,
             "status": SubmissionStatus.PENDING.value,
-            "created_at": datetime.now(),
-            "integrity_bundle": bundle.dict(),
-            "verification_result": verification_result
+            "created_at": created_at,
+            "updated_at": created_at,
+            "integrity_bundle": stored_bundle(bundle, thumbnails),
+            "verification_result": verification_result,
+            # Precomputed for the review screen
+            "face_timeline": face_timeline(
+                snapshots, thumbnails, verifier.max_face_gap_seconds * 1000, verifier.min_face_confidence
+            ),
+            # Position in the review queue
+            **queue_fields(risk_score.value, created_at, verification_result, risk_flags)
         }
         
-        db.collection("submissions").document(submission_id).set(submission_doc)
+        # Review proxy, preview clip and rep sprite sheet are rendered after we respond,
+        # if the pipeline has room
+        if settings.media_pipeline_enabled:
+            media_slot = get_media_pipeline().reserve()
+            submission_doc["media"] = {"status": "pending" if media_slot else "deferred"}
+        
+        repository.create_submission(submission_doc)
+        if settings.media_pipeline_enabled and media_slot is None:
+            # Rendered once a slot frees up
+            get_media_pipeline().defer(submission_id)
+        # The uploader starts polling status right away
+        get_submission_cache().put(submission_doc)
+        status_broker.publish(submission_id, status_payload(submission_id, submission_doc))
+        
+        # Audit trail and counters; flushed to the database in the background
+        event_log = get_event_log()
+        event_log.append(SUBMISSION_CREATED, submission_id, {
+            "athlete_id": bundle.athlete_id,
+            "device_fingerprint": submission_doc["device_fingerprint"],
+            "session_id": bundle.session_id
+        })
+        event_log.append(SUBMISSION_VERIFIED, submission_id, {
+            "risk_score": risk_score.value,
+            "risk_flags": risk_flags,
+            "verification_result": verification_result
+        })
+        
+        # Red submissions stay out of the baseline so an outlier can't become the new normal
+        if risk_score != RiskLevel.RED:
+            try:
+                record_submission(repository, keys, assessment, created_at)
+            except Exception as e:
+                print(f"History update failed for {submission_id}: {e}")
+        
+        if media_slot is not None:
+            # Local storage already has the upload on disk for the worker to read
+            stored_path = storage.path_for(video_filename) if isinstance(storage, LocalStorageService) else None
+            slot, media_slot = media_slot, None
+            await get_media_pipeline().schedule(
+                slot, submission_id, video_content, bundle.assessment_data.timestamps,
+                bundle.video_metrics.duration, bundle.video_metrics.fps, stored_path
+            )
         
         return SubmissionResponse(
             success=True,
@@ -80,10 +199,35 @@ async def create_submission(
             upload_url=video_url
         )
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid integrity bundle format")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Submission failed: {str(e)}")
+    finally:
+        if media_slot is not None:
+            # Reserved, but the submission never got as far as scheduling its job
+            media_slot.release()
+        UPLOADS_IN_FLIGHT.dec()
+        UPLOAD_BYTES_BUFFERED.dec(buffered_bytes)
+
+def submission_detail(data: dict) -> SubmissionDetail:
+    """Admin view of a stored submission document"""
+    return SubmissionDetail(
+        id=data["id"],
+        profile_data=data["profile_data"],
+        assessment_data=data["assessment_data"],
+        video_url=data["video_url"],
+        risk_score=RiskLevel(data["risk_score"]),
+        risk_flags=data["risk_flags"],
+        status=SubmissionStatus(data["status"]),
+        created_at=data["created_at"],
+        reviewed_at=data.get("reviewed_at"),
+        reviewer_notes=data.get("reviewer_notes"),
+        reviewed_by=data.get("reviewed_by"),
+        media=data.get("media")
+    )
 
 @router.get("/submissions", response_model=List[SubmissionDetail])
 async def list_submissions(
@@ -95,31 +239,15 @@ async def list_submissions(
     Get list of submissions for admin review
     """
     try:
-        db = get_firestore_client()
+        repository = get_repository()
         
-        query = db.collection("submissions").order_by("created_at", direction="DESCENDING")
-        
-        if status:
-            query = query.where("status", "==", status.value)
-            
-        docs = query.limit(limit).offset(offset).stream()
+        docs = repository.list_submissions(
+            status=status.value if status else None, limit=limit, offset=offset
+        )
         
         submissions = []
-        for doc in docs:
-            data = doc.to_dict()
-            submission = SubmissionDetail(
-                id=data["id"],
-                profile_data=data["profile_data"],
-                assessment_data=data["assessment_data"],
-                video_url=data["video_url"],
-                risk_score=RiskLevel(data["risk_score"]),
-                risk_flags=data["risk_flags"],
-                status=SubmissionStatus(data["status"]),
-                created_at=data["created_at"],
-                reviewed_at=data.get("reviewed_at"),
-                reviewer_notes=data.get("reviewer_notes")
-            )
-            submissions.append(submission)
+        for data in docs:
+            submissions.append(submission_detail(data))
             
         return submissions
         
@@ -127,57 +255,148 @@ async def list_submissions(
         raise HTTPException(status_code=500, detail=f"Failed to fetch submissions: {str(e)}")
 
 @router.get("/submissions/{submission_id}", response_model=SubmissionDetail)
-async def get_submission(submission_id: str):
+async def get_submission(submission_id: str, request: Request):
     """
     Get detailed submission info for admin review
     """
     try:
-        db = get_firestore_client()
-        
-        doc = db.collection("submissions").document(submission_id).get()
+        data = get_submission_cache().get(submission_id, get_repository().get_submission)
         
-        if not doc.exists:
+        if data is None:
             raise HTTPException(status_code=404, detail="Submission not found")
-            
-        data = doc.to_dict()
-        
-        return SubmissionDetail(
-            id=data["id"],
-            profile_data=data["profile_data"],
-            assessment_data=data["assessment_data"],
-            video_url=data["video_url"],
-            risk_score=RiskLevel(data["risk_score"]),
-            risk_flags=data["risk_flags"],
-            status=SubmissionStatus(data["status"]),
-            created_at=data["created_at"],
-            reviewed_at=data.get("reviewed_at"),
-            reviewer_notes=data.get("reviewer_notes")
+        
+        # Documents written before updated_at existed change at most once, on review
+        updated_at = data.get("updated_at") or data.get("reviewed_at") or data["created_at"]
+        
+        return conditional_response(
+            request,
+            endpoint="submission",
+            etag=make_etag(submission_id, updated_at),
+            last_modified=updated_at,
+            cache_control="private, no-cache",
+            build=lambda: submission_detail(data)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch submission: {str(e)}")
 
+@router.get("/submissions/{submission_id}/review", response_model=ReviewBundle)
+async def get_review_bundle(submission_id: str, request: Request):
+    """
+    Everything the admin review screen needs in one response: the
+    submission, per-check verification results, the precomputed face
+    timeline with thumbnail URLs, and the audit trail
+    """
+    try:
+        repository = get_repository()
+        cache = get_submission_cache()
+        
+        # Independent reads; run them side by side
+        data, events = await asyncio.gather(
+            asyncio.to_thread(cache.get, submission_id, repository.get_submission),
+            asyncio.to_thread(audit_trail, repository, submission_id)
+        )
+        
+        if data is None:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        
+        updated_at = data.get("updated_at") or data.get("reviewed_at") or data["created_at"]
+        
+        def build():
+            timeline = stored_timeline(data)
+            return ReviewBundle(
+                submission=submission_detail(data),
+                checks=verification_checks(data.get("verification_result") or {}, timeline),
+                timeline=timeline,
+                history_zscores=data.get("history_zscores") or {},
+                device_profiles=data.get("device_profiles"),
+                events=[{"type": e["type"], "at": e["at"], "actor": e.get("actor")} for e in events]
+            )
+        
+        return conditional_response(
+            request,
+            endpoint="review",
+            # Events can land after the last document change (e.g. the leaderboard update)
+            etag=make_etag(submission_id, "review", updated_at, len(events)),
+            cache_control="private, no-cache",
+            build=build
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Review fetch failed: {str(e)}")
+
 @router.get("/submissions/{submission_id}/status")
 async def get_submission_status(submission_id: str):
     """
     Get submission status for frontend polling
     """
     try:
-        db = get_firestore_client()
+        data = get_submission_cache().get(submission_id, get_repository().get_submission, projection=STATUS)
         
-        doc = db.collection("submissions").document(submission_id).get()
-        
-        if not doc.exists:
+        if data is None:
             raise HTTPException(status_code=404, detail="Submission not found")
-            
-        data = doc.to_dict()
         
-        return {
-            "submission_id": submission_id,
-            "status": data["status"],
-            "created_at": data["created_at"].isoformat(),
-            "reviewed_at": data.get("reviewed_at").isoformat() if data.get("reviewed_at") else None
-        }
+        return status_payload(submission_id, data)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Status check failed: {str(e)}")
+
+TERMINAL_STATUSES = {SubmissionStatus.APPROVED.value, SubmissionStatus.REJECTED.value}
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@router.get("/submissions/{submission_id}/events")
+async def stream_submission_status(submission_id: str):
+    """
+    Server-Sent Events stream of status changes, replacing polling.
+    
+    Sends the current status immediately, then pushes every change until
+    the submission is approved or rejected. If nothing is pushed for
+    `status_stream_poll_interval` seconds the status is re-read once, which
+    covers updates made by other workers when no bridge is configured.
+    """
+    settings = get_settings()
+    repository = get_repository()
+    cache = get_submission_cache()
+    
+    if await asyncio.to_thread(cache.get, submission_id, repository.get_submission, STATUS) is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    
+    async def events():
+        async with status_broker.subscribe(submission_id) as queue:
+            # Read only once subscribed: a change published before this is in the
+            # read, and one published after it is queued, so none falls in between
+            data = await asyncio.to_thread(cache.get, submission_id, repository.get_submission, STATUS)
+            if data is None:
+                return
+            last = status_payload(submission_id, data)
+            yield f"retry: 5000\n{_sse('status', last)}"
+            
+            deadline = time.monotonic() + settings.status_stream_max_duration
+            while last["status"] not in TERMINAL_STATUSES and time.monotonic() < deadline:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=settings.status_stream_poll_interval)
+                except asyncio.TimeoutError:
+                    # Polling fallback; also doubles as a keep-alive
+                    current = await asyncio.to_thread(cache.get, submission_id, repository.get_submission, STATUS)
+                    payload = status_payload(submission_id, current) if current else last
+                    if payload == last:
+                        yield ": keep-alive\n\n"
+                        continue
+                
+                if payload != last:
+                    last = payload
+                    yield _sse("status", payload)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
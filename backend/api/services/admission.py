@@ -0,0 +1,212 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from ..config import get_settings
+from ..models.schemas import IntegrityBundle
+from .fingerprint import device_fingerprint
+from .metrics import registry
+
+ADMISSION_REJECTIONS = registry.counter(
+    "talentspark_admission_rejections_total",
+    "Uploads turned away before processing, by reason",
+    ("reason",)
+)
+ADMITTED_UPLOADS = registry.gauge(
+    "talentspark_admission_active_uploads",
+    "Uploads currently holding an admission slot"
+)
+ADMITTED_BYTES = registry.gauge(
+    "talentspark_admission_bytes_reserved",
+    "Request bytes reserved by admitted uploads"
+)
+
+class AdmissionTicket:
+    """Slot held by one admitted upload; release exactly once"""
+
+    def __init__(self, controller: "AdmissionController", nbytes: int):
+        self._controller = controller
+        self.nbytes = nbytes
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release(self.nbytes)
+
+class AdmissionController:
+    """
+    Global cap on concurrent ingestions and bytes in flight.
+
+    Requests over the cap are shed immediately rather than queued, so the
+    uploads that are admitted keep a predictable latency.
+    """
+
+    def __init__(self, max_concurrent: int, max_bytes: int):
+        self.max_concurrent = max_concurrent
+        self.max_bytes = max_bytes
+        self.active = 0
+        self.bytes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_admit(self, nbytes: int) -> Optional[AdmissionTicket]:
+        with self._lock:
+            if self.active >= self.max_concurrent:
+                ADMISSION_REJECTIONS.inc(reason="concurrency")
+                return None
+            # A single request larger than the byte budget is still let through
+            # when nothing else is in flight, otherwise it could never succeed
+            if self.active and self.bytes_in_flight + nbytes > self.max_bytes:
+                ADMISSION_REJECTIONS.inc(reason="bytes_in_flight")
+                return None
+            self.active += 1
+            self.bytes_in_flight += nbytes
+
+        ADMITTED_UPLOADS.inc()
+        ADMITTED_BYTES.inc(nbytes)
+        return AdmissionTicket(self, nbytes)
+
+    def _release(self, nbytes: int):
+        with self._lock:
+            self.active -= 1
+            self.bytes_in_flight -= nbytes
+        ADMITTED_UPLOADS.dec()
+        ADMITTED_BYTES.dec(nbytes)
+
+class RateLimiter:
+    """
+    Token buckets keyed by client or device, bounded to the most recent keys.
+
+    A key's limits come from its "scope:" prefix when that scope is in
+    `scopes` ({scope: (rate_per_minute, burst)}), otherwise the defaults.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int = 10000,
+                 scopes: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self.scopes = {scope: (rate / 60.0, scope_burst) for scope, (rate, scope_burst) in (scopes or {}).items()}
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _limits(self, key: str) -> Tuple[float, int]:
+        return self.scopes.get(key.partition(":")[0], (self.rate, self.burst))
+
+    def acquire(self, *keys: str) -> float:
+        """
+        Take one token from every key's bucket. Returns 0 when allowed,
+        otherwise the seconds until all buckets would have a token (nothing
+        is consumed in that case).
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key in keys:
+                rate, burst = self._limits(key)
+                tokens, updated = self._buckets.get(key, (float(burst), now))
+                tokens = min(float(burst), tokens + (now - updated) * rate)
+                levels.append((key, tokens))
+                if tokens < 1.0:
+                    wait = max(wait, (1.0 - tokens) / rate if rate > 0 else float("inf"))
+
+            if wait > 0:
+                return wait
+
+            for key, tokens in levels:
+                self._buckets[key] = (tokens - 1.0, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0.0
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    settings = get_settings()
+    return AdmissionController(settings.max_concurrent_uploads, settings.max_upload_bytes_in_flight)
+
+@lru_cache()
+def get_upload_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    return RateLimiter(
+        settings.upload_rate_per_minute, settings.upload_burst,
+        scopes={"device": (settings.upload_device_rate_per_minute, settings.upload_device_burst)}
+    )
+
+def upload_rate_keys(bundle: IntegrityBundle) -> Tuple[str, str]:
+    """
+    Rate limit buckets for an upload: the client (its per-install athlete
+    ID, or the session for clients without one) and, much more loosely, the
+    device model. The coarse device fingerprint is shared by every athlete
+    on the same phone model, OS and timezone, so on its own it would
+    throttle a whole school on identical devices.
+    """
+    client = f"athlete:{bundle.athlete_id}" if bundle.athlete_id else f"session:{bundle.session_id}"
+    return client, f"device:{device_fingerprint(bundle.device_info)}"
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware guarding POST /api/submissions before the body is read.
+
+    Rejects on Content-Length alone (413) and sheds load with 503 when the
+    global concurrency or bytes-in-flight budget is exhausted. The slot is
+    held until the response has been sent.
+    """
+
+    def __init__(self, app, path: str = "/api/submissions"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        limit = settings.max_file_size + settings.max_request_overhead
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    pass
+                break
+
+        if content_length is not None and content_length > limit:
+            ADMISSION_REJECTIONS.inc(reason="too_large")
+            await self._reject(send, 413, "Video file too large")
+            return
+
+        # Without a length (chunked upload) reserve the worst case
+        ticket = get_admission_controller().try_admit(content_length if content_length is not None else limit)
+        if ticket is None:
+            await self._reject(send, 503, "Server busy, retry later",
+                               retry_after_header(settings.admission_retry_after))
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ticket.release()
+
+    async def _reject(self, send, status: int, detail: str, retry_after: Optional[str] = None):
+        body = json.dumps({"detail": detail}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            # The body is never read, so the connection cannot be reused
+            (b"connection", b"close"),
+        ]
+        if retry_after is not None:
+            headers.append((b"retry-after", retry_after.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
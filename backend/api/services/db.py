@@ -1,10 +1,6 @@
-from google.cloud import firestore
-from google.oauth2 import service_account
 from ..config import get_settings
 import os
 
-settings = get_settings()
-
 _firestore_client = None
 
 def get_firestore_client():
@@ -12,6 +8,11 @@ def get_firestore_client():
     global _firestore_client
     
     if _firestore_client is None:
+        # Deferred so deployments on another backend never load the GCP SDK
+        from google.cloud import firestore
+        from google.oauth2 import service_account
+        
+        settings = get_settings()
         if settings.firebase_credentials_path and os.path.exists(settings.firebase_credentials_path):
             # Use service account file
             credentials = service_account.Credentials.from_service_account_file(
@@ -29,6 +30,8 @@ def get_firestore_client():
 
 def init_collections():
     """Initialize Firestore collections with indexes"""
+    from google.cloud import firestore
+    
     db = get_firestore_client()
     
     # Create initial documents to establish collections
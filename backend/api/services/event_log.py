@@ -0,0 +1,384 @@
+"""
+Append-only event log with write-behind flushing.
+
+Request handlers append events (submission created, verified, decided,
+leaderboard updated) to an in-process buffer and a local spool file and
+return straight away. A background task writes the buffer to the
+database in batches - when it reaches event_flush_batch_size, or every
+event_flush_interval seconds - then runs the registered projections
+(submission status, leaderboards, counters) over each batch.
+
+Each worker process spools to its own file and holds a lock on it. On
+start, spool files no live process holds are replayed. Event IDs,
+leaderboard entries and counters are all idempotent, so replaying an
+event that had already been flushed before a crash is harmless.
+"""
+import asyncio
+import glob
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no spool locking, so run a single worker
+    fcntl = None
+
+from ..config import get_settings
+from .metrics import registry, timed
+from .serialization import dumps, loads
+
+SUBMISSION_CREATED = "submission_created"
+SUBMISSION_VERIFIED = "submission_verified"
+SUBMISSION_DECIDED = "submission_decided"
+LEADERBOARD_UPDATED = "leaderboard_updated"
+
+COUNTERS_COLLECTION = "event_counters"
+COUNTERS_DOC = "totals"
+
+EVENTS_APPENDED = registry.counter(
+    "talentspark_events_appended_total",
+    "Events appended to the log by type",
+    ("type",)
+)
+EVENT_FLUSHES = registry.counter(
+    "talentspark_event_flushes_total",
+    "Event log batch flushes by trigger and outcome",
+    ("trigger", "result")
+)
+EVENT_FLUSH_SIZE = registry.histogram(
+    "talentspark_event_flush_batch_size",
+    "Events written per flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+EVENT_BUFFER = registry.gauge(
+    "talentspark_event_buffer_depth",
+    "Events appended but not yet flushed to the database"
+)
+PROJECTION_FAILURES = registry.counter(
+    "talentspark_event_projection_failures_total",
+    "Projection errors by event type; the batch is retried",
+    ("type",)
+)
+
+# A projection gets (repository, event) and may return follow-up events
+# as (type, submission_id, data, actor) tuples to append after the batch
+Projection = Callable[[Any, Dict], Optional[List[Tuple]]]
+_projections: Dict[str, List[Projection]] = {}
+
+def projection(event_type: str):
+    """Register a function to run for every flushed event of `event_type`; it must be idempotent"""
+    def register(fn: Projection) -> Projection:
+        _projections.setdefault(event_type, []).append(fn)
+        return fn
+    return register
+
+class EventSpool:
+    """Local append-only file holding every event not yet known to be in the database"""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, "ab")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def write(self, event: Dict):
+        self._file.write(dumps(event).encode() + b"\n")
+        # Flushed to the OS on every append, so a process crash loses nothing;
+        # fsync as well to survive power loss
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def truncate(self):
+        self._file.truncate(0)
+        self._file.seek(0)
+
+    def rewrite(self, events: List[Dict]):
+        """Keep only `events`, e.g. when a busy log never fully drains"""
+        self.truncate()
+        for event in events:
+            self.write(event)
+
+    def close(self):
+        self._file.close()
+
+    @staticmethod
+    def read(path: str) -> List[Dict]:
+        events = []
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    events.append(loads(line))
+                except ValueError:
+                    # Torn final line from a crash mid-write
+                    break
+        return events
+
+def _claim_orphan(path: str) -> Optional[List[Dict]]:
+    """Events from a spool no running process holds, or None if it is in use"""
+    with open(path, "ab") as f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+        return EventSpool.read(path)
+
+class EventLog:
+    """Buffered, spooled, batch-flushed event log for one worker process"""
+
+    def __init__(self, spool_dir: str, batch_size: int = 200, interval: float = 0.5,
+                 fsync: bool = False, compact_bytes: int = 8 * 1024 * 1024):
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.interval = interval
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+        # Unique per process; (producer, seq) orders this process's events
+        self.producer = f"{os.getpid():x}{time.time_ns():x}"
+        self._seq = itertools.count(1)
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._spool: Optional[EventSpool] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._failures: Dict[str, int] = {}
+        self.flushed = 0
+
+    @property
+    def spool(self) -> EventSpool:
+        if self._spool is None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._spool = EventSpool(os.path.join(self.spool_dir, f"events-{self.producer}.spool"), self.fsync)
+        return self._spool
+
+    def append(self, event_type: str, submission_id: Optional[str] = None,
+               data: Optional[Dict] = None, actor: Optional[str] = None,
+               caused_by: Optional[str] = None) -> Dict:
+        """Record an event; returns once it is spooled, before it reaches the database"""
+        seq = next(self._seq)
+        # A follow-up's ID derives from its cause, so replaying the cause can't duplicate it
+        event_id = f"{caused_by}/{event_type}" if caused_by else f"{self.producer}-{seq:010d}"
+        event = {
+            "id": event_id,
+            "producer": self.producer,
+            "seq": seq,
+            "type": event_type,
+            "submission_id": submission_id,
+            "actor": actor,
+            "caused_by": caused_by,
+            "at": datetime.now(),
+            "data": data or {}
+        }
+        with self._lock:
+            self.spool.write(event)
+            self._buffer.append(event)
+            depth = len(self._buffer)
+        EVENTS_APPENDED.inc(type=event_type)
+        EVENT_BUFFER.set(depth)
+        if depth >= self.batch_size and self._wake is not None:
+            self._wake.set()
+        return event
+
+    def _recover(self):
+        """Adopt events left in spools of processes that are no longer running"""
+        own = self.spool.path
+        recovered = []
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "events-*.spool"))):
+            if path == own:
+                continue
+            events = _claim_orphan(path)
+            if events is None:
+                continue
+            with self._lock:
+                for event in events:
+                    self.spool.write(event)
+                # Re-spooled above; the orphan can go
+                os.remove(path)
+                self._buffer[:0] = events
+            recovered.extend(events)
+        if recovered:
+            print(f"Event log: replaying {len(recovered)} spooled events")
+
+    def start(self, repository_factory: Callable):
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._recover()
+        self._task = asyncio.create_task(self._run(repository_factory))
+
+    async def _run(self, repository_factory: Callable):
+        backoff = self.interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+                trigger = "size"
+            except asyncio.TimeoutError:
+                trigger = "interval"
+            self._wake.clear()
+            try:
+                await self.flush(repository_factory(), trigger)
+                backoff = self.interval
+            except Exception as e:
+                # Events stay buffered and spooled; retry with backoff
+                print(f"Event log flush failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def flush(self, repository, trigger: str = "manual") -> int:
+        """Write everything buffered so far; returns the number of events flushed"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        total = 0
+        async with self._flush_lock:
+            while True:
+                with self._lock:
+                    # Appends only ever add to the end, so this prefix is stable
+                    batch = self._buffer[:self.batch_size]
+                if not batch:
+                    break
+                commit = asyncio.ensure_future(asyncio.to_thread(self._commit, repository, batch))
+                cancelled = None
+                try:
+                    try:
+                        follow_ups = await asyncio.shield(commit)
+                    except asyncio.CancelledError as e:
+                        # The commit thread carries on regardless; wait for it and
+                        # record the batch, or the next flush commits it again
+                        cancelled = e
+                        follow_ups = await commit
+                except Exception:
+                    EVENT_FLUSHES.inc(trigger=trigger, result="failed")
+                    raise
+                self._committed(batch, follow_ups, trigger)
+                total += len(batch)
+                if cancelled is not None:
+                    raise cancelled
+        return total
+
+    def _committed(self, batch: List[Dict], follow_ups: List[Tuple[str, Tuple]], trigger: str):
+        """Drop a batch now in the database from the buffer and spool, and queue its follow-ups"""
+        with self._lock:
+            del self._buffer[:len(batch)]
+            if not self._buffer:
+                self.spool.truncate()
+            elif self.spool.size() > self.compact_bytes:
+                self.spool.rewrite(self._buffer)
+            depth = len(self._buffer)
+        EVENT_BUFFER.set(depth)
+        EVENT_FLUSHES.inc(trigger=trigger, result="ok")
+        EVENT_FLUSH_SIZE.observe(len(batch))
+        self.flushed += len(batch)
+        for caused_by, follow_up in follow_ups:
+            self.append(*follow_up, caused_by=caused_by)
+
+    def _commit(self, repository, batch: List[Dict]) -> List[Tuple[str, Tuple]]:
+        with timed("events.append_batch"):
+            repository.append_events(batch)
+
+        follow_ups = []
+        with timed("events.projections"):
+            for event in batch:
+                for handler in _projections.get(event["type"], []):
+                    try:
+                        follow_ups.extend((event["id"], follow_up) for follow_up in handler(repository, event) or [])
+                    except Exception as e:
+                        PROJECTION_FAILURES.inc(type=event["type"])
+                        attempts = self._failures.get(event["id"], 0) + 1
+                        if attempts < get_settings().event_projection_max_attempts:
+                            self._failures[event["id"]] = attempts
+                            raise
+                        # Don't let one bad event stall the log forever
+                        print(f"Event {event['id']} ({event['type']}) dropped from {handler.__name__}: {e}")
+                self._failures.pop(event["id"], None)
+            _count(repository, batch, follow_ups)
+        return follow_ups
+
+    async def stop(self, repository=None):
+        """Stop the background task, flushing what is buffered if a repository is given"""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            # Let a flush already in flight finish before the shutdown flush starts
+            await asyncio.gather(task, return_exceptions=True)
+        if repository is not None:
+            try:
+                await self.flush(repository, "shutdown")
+            except Exception as e:
+                # Still spooled; the next start replays it
+                print(f"Event log flush on shutdown failed: {e}")
+
+    def buffered(self, submission_id: str) -> List[Dict]:
+        """Events for a submission still waiting to be flushed"""
+        with self._lock:
+            return [event for event in self._buffer if event["submission_id"] == submission_id]
+
+    def stats(self) -> Dict:
+        return {"buffered": len(self._buffer), "flushed": self.flushed, "producer": self.producer}
+
+def _count(repository, batch: List[Dict], follow_ups: List[Tuple[str, Tuple]]):
+    """
+    Counters projection; per-producer watermarks make replays idempotent.
+    Follow-ups are counted along with the event that caused them.
+    """
+    caused: Dict[str, List[str]] = {}
+    for caused_by, follow_up in follow_ups:
+        caused.setdefault(caused_by, []).append(follow_up[0])
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        current = current or {"counts": {}, "watermarks": {}}
+        counts = dict(current["counts"])
+        watermarks = dict(current["watermarks"])
+        changed = False
+        for event in batch:
+            if event.get("caused_by") or event["seq"] <= watermarks.get(event["producer"], 0):
+                continue
+            keys = [event["type"]] + caused.get(event["id"], [])
+            if event["type"] == SUBMISSION_DECIDED:
+                keys.append(f"{event['type']}_{event['data'].get('decision')}")
+            for key in keys:
+                counts[key] = counts.get(key, 0) + 1
+            watermarks[event["producer"]] = event["seq"]
+            changed = True
+        return {"counts": counts, "watermarks": watermarks, "updated_at": datetime.now()} if changed else None
+
+    repository.update_document(COUNTERS_COLLECTION, COUNTERS_DOC, mutate)
+
+def audit_trail(repository, submission_id: str) -> List[Dict]:
+    """A submission's events, oldest first, including any this worker has not flushed yet"""
+    flushed = repository.list_events(submission_id)
+    seen = {event["id"] for event in flushed}
+    return flushed + [event for event in get_event_log().buffered(submission_id) if event["id"] not in seen]
+
+def get_counters(repository) -> Dict[str, int]:
+    document = repository.get_document(COUNTERS_COLLECTION, COUNTERS_DOC)
+    return document["counts"] if document else {}
+
+# Global event log instance
+_event_log = None
+
+def get_event_log() -> EventLog:
+    """Get the event log singleton"""
+    global _event_log
+
+    if _event_log is None:
+        settings = get_settings()
+        _event_log = EventLog(
+            settings.event_spool_dir,
+            settings.event_flush_batch_size,
+            settings.event_flush_interval,
+            settings.event_spool_fsync,
+            settings.event_spool_compact_bytes
+        )
+
+    return _event_log
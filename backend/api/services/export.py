@@ -0,0 +1,235 @@
+"""
+Streaming bulk export. Rows come from the repository's cursor iterators
+and are encoded a batch at a time, so memory stays flat however many rows
+are exported.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .metrics import registry
+from .serialization import to_utc
+
+EXPORT_ROWS = registry.counter(
+    "talentspark_export_rows_total",
+    "Rows streamed by bulk exports",
+    ("dataset", "format")
+)
+
+# Exportable fields (dotted paths into the stored document) and their column types.
+# The integrity bundle is deliberately absent: it carries face snapshots.
+SUBMISSION_FIELDS = {
+    "id": "string",
+    "status": "string",
+    "risk_score": "string",
+    "risk_flags": "list",
+    "created_at": "timestamp",
+    "reviewed_at": "timestamp",
+    "reviewer_notes": "string",
+    "reviewed_by": "string",
+    "video_url": "string",
+    "profile_data.age": "int",
+    "profile_data.gender": "string",
+    "profile_data.height": "float",
+    "profile_data.weight": "float",
+    "assessment_data.total_reps": "int",
+    "assessment_data.average_depth": "float",
+    "assessment_data.form_score": "float",
+    "assessment_data.average_rep_time": "float",
+    "assessment_data.consistency": "float",
+}
+DEFAULT_SUBMISSION_FIELDS = [
+    "id", "status", "risk_score", "created_at", "reviewed_at",
+    "profile_data.age", "profile_data.gender",
+    "assessment_data.total_reps", "assessment_data.form_score",
+]
+
+LEADERBOARD_FIELDS = {
+    "user_id": "string",
+    "submission_id": "string",
+    "age_band": "string",
+    "gender": "string",
+    "total_reps": "int",
+    "form_score": "float",
+    "submission_date": "timestamp",
+}
+DEFAULT_LEADERBOARD_FIELDS = list(LEADERBOARD_FIELDS)
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+def parse_fields(raw: Optional[str], allowed: Dict[str, str], default: List[str]) -> List[str]:
+    """Comma-separated field list from the query string; ValueError on unknown fields"""
+    if not raw:
+        return list(default)
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown)}")
+    # Keep the caller's order, drop repeats
+    return list(dict.fromkeys(fields))
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _lookup(document: Dict, path: str) -> Any:
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return to_utc(value).isoformat()
+    return str(value)
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return to_utc(value).isoformat()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+def _batches(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _ndjson(rows: Iterable[Dict], fields: List[str], batch_size: int) -> Iterator[bytes]:
+    for batch in _batches(rows, batch_size):
+        yield "".join(
+            json.dumps({field: _lookup(row, field) for field in fields},
+                       default=_json_value, separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode()
+
+def _csv(rows: Iterable[Dict], fields: List[str], batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in _batches(rows, batch_size):
+        for row in batch:
+            writer.writerow([_csv_value(_lookup(row, field)) for field in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out whatever has been written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _arrow_schema(pa, fields: List[str], types: Dict[str, str]):
+    arrow_types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "list": pa.list_(pa.string()),
+    }
+    return pa.schema([(field, arrow_types[types[field]]) for field in fields])
+
+def _arrow_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    if kind == "timestamp":
+        return to_utc(value) if isinstance(value, datetime) else None
+    if kind == "string":
+        return str(value)
+    if kind == "list":
+        return [str(item) for item in value]
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return float(value)
+    return value
+
+def _columnar(rows: Iterable[Dict], fields: List[str], types: Dict[str, str],
+              batch_size: int, fmt: str) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, fields, types)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        # One row group / record batch per repository batch
+        for batch in _batches(rows, batch_size):
+            columns = [
+                [_arrow_value(_lookup(row, field), types[field]) for row in batch]
+                for field in fields
+            ]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                schema=schema
+            ))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def stream_export(rows: Iterable[Dict], fields: List[str], types: Dict[str, str], fmt: str,
+                  dataset: str, batch_size: int = 500) -> Iterator[bytes]:
+    """Encode rows incrementally as `fmt`, yielding one chunk per batch"""
+
+    def counted(source: Iterable[Dict]) -> Iterator[Dict]:
+        for row in source:
+            EXPORT_ROWS.inc(dataset=dataset, format=fmt)
+            yield row
+
+    rows = counted(rows)
+    if fmt == "ndjson":
+        return _ndjson(rows, fields, batch_size)
+    if fmt == "csv":
+        return _csv(rows, fields, batch_size)
+    if fmt in ("parquet", "arrow"):
+        return _columnar(rows, fields, types, batch_size, fmt)
+    raise ValueError(f"Unsupported export format: {fmt}")
@@ -0,0 +1,118 @@
+"""
+Device fingerprints and the inverted index behind the shared-device check.
+
+A fingerprint is a short hash of normalised device attributes. The index
+keeps one document per fingerprint listing the profiles and sessions seen
+on it within a sliding window, so spotting one device feeding many
+accounts takes a single indexed read-modify-write at ingestion rather
+than a query across submissions.
+
+Normalised attributes alone are coarse: every install of the same phone
+model and browser release in one timezone collides. When the client sends
+its per-install ID a second entry is kept for the install itself, held to
+the tight shared-device threshold. The attribute-only entry is always kept
+too, with a much looser threshold, so a client that drops or rotates its
+install ID still shows up once enough accounts pile onto one phone model.
+"""
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from ..config import get_settings
+from ..models.schemas import DeviceInfo, IntegrityBundle
+from .metrics import timed
+
+FINGERPRINT_COLLECTION = "device_fingerprints"
+
+# "Chrome/120.0.6099.144" -> "chrome/120": point releases shouldn't split a device
+_DOTTED_VERSION = re.compile(r"(\d+)(?:[._]\d+)+")
+
+def _normalise_screen(resolution: str) -> str:
+    try:
+        width, height = (int(part) for part in resolution.lower().split("x"))
+    except ValueError:
+        return resolution.strip().lower()
+    # Rotating the phone swaps the reported dimensions
+    return f"{min(width, height)}x{max(width, height)}"
+
+def normalise_device(device_info: DeviceInfo) -> Dict[str, str]:
+    return {
+        "user_agent": _DOTTED_VERSION.sub(r"\1", " ".join(device_info.user_agent.lower().split())),
+        "platform": device_info.platform.strip().lower(),
+        "timezone": device_info.timezone.strip(),
+        "screen": _normalise_screen(device_info.screen_resolution),
+    }
+
+def _digest(values) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+def device_fingerprint(device_info: DeviceInfo, install_id: Optional[str] = None) -> str:
+    """
+    Stable 16-hex-digit key for a device from the attributes the client
+    reports, narrowed to one install when its ID is known
+    """
+    attributes = normalise_device(device_info)
+    values = [attributes["user_agent"], attributes["platform"], attributes["timezone"], attributes["screen"]]
+    if install_id:
+        values.append(install_id)
+    return _digest(values)
+
+def profile_key(bundle: IntegrityBundle) -> str:
+    """Key for the account a submission claims to be from"""
+    profile = bundle.profile_data
+    return _digest([bundle.athlete_id, profile.age, profile.gender.value, profile.height, profile.weight])
+
+def _prune(seen: Dict[str, float], cutoff: float, limit: int) -> Dict[str, float]:
+    recent = {key: at for key, at in seen.items() if at >= cutoff}
+    if len(recent) > limit:
+        # Keep the newest; anything past the cap is already well over any threshold
+        recent = dict(sorted(recent.items(), key=lambda item: item[1], reverse=True)[:limit])
+    return recent
+
+def _record(repository, fingerprint: str, bundle: IntegrityBundle, at: datetime) -> Dict:
+    """Add this submission's profile and session to one index entry, in one transaction"""
+    settings = get_settings()
+    profile = profile_key(bundle)
+    # Epoch seconds in the maps: compact, and no naive/aware datetime mixing across backends
+    now = at.timestamp()
+    cutoff = (at - timedelta(hours=settings.fingerprint_window_hours)).timestamp()
+    limit = settings.fingerprint_max_tracked
+
+    def mutate(current):
+        entry = current or {"attributes": normalise_device(bundle.device_info), "first_seen": at, "submissions": 0}
+        profiles = _prune(entry.get("profiles", {}), cutoff, limit)
+        sessions = _prune(entry.get("sessions", {}), cutoff, limit)
+        profiles[profile] = now
+        sessions[bundle.session_id] = now
+        return dict(entry, profiles=profiles, sessions=sessions, last_seen=at,
+                    submissions=entry["submissions"] + 1)
+
+    return repository.update_document(FINGERPRINT_COLLECTION, fingerprint, mutate)
+
+def record_sighting(repository, bundle: IntegrityBundle, at: datetime) -> Dict:
+    """
+    Record this submission against its phone model's entry and, when the
+    client sent an install ID, its install's entry; return the counts inside
+    the sliding window. `fingerprint`/`profiles` are the install's when
+    known, else the model's; `model_profiles` is always the model's.
+    """
+    model = device_fingerprint(bundle.device_info)
+    with timed("fingerprint.record"):
+        model_entry = _record(repository, model, bundle, at)
+        if bundle.athlete_id:
+            fingerprint = device_fingerprint(bundle.device_info, bundle.athlete_id)
+            entry = _record(repository, fingerprint, bundle, at)
+        else:
+            fingerprint, entry = model, model_entry
+
+    return {
+        "fingerprint": fingerprint,
+        "profiles": len(entry["profiles"]),
+        "sessions": len(entry["sessions"]),
+        "model_profiles": len(model_entry["profiles"]),
+        # No install ID: only the model entry, which identical phones share
+        "coarse": not bundle.athlete_id,
+    }
@@ -0,0 +1,168 @@
+"""
+Per-athlete and per-device performance history kept as running aggregates.
+
+Each submission updates one small document per key in O(1): Welford
+mean/variance, an exponentially weighted mean, min/max/last and a ring
+buffer of recent values packed as float32. Risk scoring and the progress
+endpoint read these aggregates instead of querying earlier submissions.
+"""
+import base64
+import math
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..config import get_settings
+from ..models.schemas import IntegrityBundle
+from .fingerprint import device_fingerprint
+from .metrics import registry, timed
+
+HISTORY_COLLECTION = "performance_history"
+
+METRICS = ("total_reps", "form_score", "average_rep_time")
+METRIC_LABELS = {
+    "total_reps": "Rep count",
+    "form_score": "Form score",
+    "average_rep_time": "Rep time",
+}
+# Which way is "suspiciously better": more reps, better form, faster reps.
+# Drops are normal (a bad day) and are not flagged.
+SUSPICIOUS_DIRECTION = {"total_reps": 1, "form_score": 1, "average_rep_time": -1}
+# Std-dev floors, so a perfectly steady history doesn't turn any change into an outlier
+MIN_STD = {"total_reps": 2.0, "form_score": 5.0, "average_rep_time": 150.0}
+
+HISTORY_ANOMALIES = registry.counter(
+    "talentspark_history_anomalies_total",
+    "Submissions flagged against athlete/device history by metric and scope",
+    ("metric", "scope")
+)
+
+def history_keys(bundle: IntegrityBundle) -> List[str]:
+    """
+    History document a submission belongs to: the athlete's install, or the
+    device when the client sent no ID. The device fingerprint is shared by
+    every identical phone, so it is never mixed into a known athlete's history.
+    """
+    if bundle.athlete_id:
+        return [f"athlete:{bundle.athlete_id}"]
+    return [f"device:{device_fingerprint(bundle.device_info)}"]
+
+def _ring_push(encoded: Optional[str], position: int, value: float, capacity: int) -> str:
+    ring = array("f")
+    if encoded:
+        ring.frombytes(base64.b64decode(encoded))
+    if len(ring) != capacity:
+        # First value, or the configured size changed; keep what still fits
+        ring = array("f", list(ring)[:capacity] + [0.0] * max(0, capacity - len(ring)))
+    ring[position % capacity] = value
+    # base64 so the same document stores in Firestore and in SQLite's JSON column
+    return base64.b64encode(ring.tobytes()).decode("ascii")
+
+def _ring_values(encoded: Optional[str], count: int) -> List[float]:
+    """Ring contents, oldest first"""
+    if not encoded:
+        return []
+    ring = array("f")
+    ring.frombytes(base64.b64decode(encoded))
+    capacity = len(ring)
+    if count <= capacity:
+        return [round(v, 3) for v in ring[:count]]
+    start = count % capacity
+    return [round(v, 3) for v in list(ring[start:]) + list(ring[:start])]
+
+def _fold(history: Optional[Dict], values: Dict[str, float], at: datetime,
+          alpha: float, capacity: int) -> Dict:
+    history = history or {"metrics": {}, "recent": {}, "first_at": at}
+
+    for metric in METRICS:
+        value = float(values[metric])
+        stats = history["metrics"].get(metric)
+        if stats is None:
+            stats = {"count": 0, "mean": 0.0, "m2": 0.0, "ewma": value, "min": value, "max": value}
+
+        count = stats["count"] + 1
+        delta = value - stats["mean"]
+        mean = stats["mean"] + delta / count
+        history["metrics"][metric] = {
+            "count": count,
+            "mean": mean,
+            "m2": stats["m2"] + delta * (value - mean),
+            "ewma": alpha * value + (1 - alpha) * stats["ewma"],
+            "min": min(stats["min"], value),
+            "max": max(stats["max"], value),
+            "last": value,
+        }
+        history["recent"][metric] = _ring_push(history["recent"].get(metric), count - 1, value, capacity)
+
+    history["count"] = max(stats["count"] for stats in history["metrics"].values())
+    history["updated_at"] = at
+    return history
+
+def std(stats: Dict) -> float:
+    return math.sqrt(stats["m2"] / (stats["count"] - 1)) if stats["count"] > 1 else 0.0
+
+def z_score(history: Optional[Dict], metric: str, value: float, min_samples: int) -> Optional[float]:
+    """Standard score of `value` against the history, or None if the history is too short"""
+    if not history:
+        return None
+    stats = history["metrics"].get(metric)
+    if stats is None or stats["count"] < min_samples:
+        return None
+    return (value - stats["mean"]) / max(std(stats), MIN_STD[metric])
+
+def load_histories(repository, keys: List[str]) -> Dict[str, Optional[Dict]]:
+    with timed("history.load"):
+        return {key: repository.get_document(HISTORY_COLLECTION, key) for key in keys}
+
+def anomaly_flags(histories: Dict[str, Optional[Dict]], assessment: Dict) -> Dict[str, float]:
+    """Risk flag -> z-score for every metric that jumped past the threshold in the suspicious direction"""
+    settings = get_settings()
+    flags = {}
+
+    for key, history in histories.items():
+        scope = key.split(":", 1)[0]
+        for metric in METRICS:
+            z = z_score(history, metric, float(assessment[metric]), settings.history_min_samples)
+            if z is None or z * SUSPICIOUS_DIRECTION[metric] < settings.history_z_threshold:
+                continue
+            direction = "above" if z > 0 else "below"
+            flags[f"{METRIC_LABELS[metric]} far {direction} {scope} history"] = round(z, 2)
+            HISTORY_ANOMALIES.inc(metric=metric, scope=scope)
+
+    return flags
+
+def record_submission(repository, keys: List[str], assessment: Dict, at: datetime) -> None:
+    """Fold a submission's assessment into each history document"""
+    settings = get_settings()
+    values = {metric: assessment[metric] for metric in METRICS}
+
+    with timed("history.record"):
+        for key in keys:
+            repository.update_document(
+                HISTORY_COLLECTION, key,
+                lambda current, key=key: dict(
+                    _fold(current, values, at, settings.history_ewma_alpha, settings.history_ring_size),
+                    key=key
+                )
+            )
+
+def progress(history: Dict) -> Dict:
+    """Summary of a history document for the Profile screen"""
+    return {
+        "submissions": history.get("count", 0),
+        "first_at": history.get("first_at"),
+        "updated_at": history.get("updated_at"),
+        "metrics": {
+            metric: {
+                "count": stats["count"],
+                "mean": round(stats["mean"], 3),
+                "std": round(std(stats), 3),
+                "ewma": round(stats["ewma"], 3),
+                "min": stats["min"],
+                "max": stats["max"],
+                "last": stats["last"],
+                "recent": _ring_values(history["recent"].get(metric), stats["count"]),
+            }
+            for metric, stats in history["metrics"].items()
+        },
+    }
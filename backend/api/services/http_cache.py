@@ -0,0 +1,88 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from .metrics import registry
+from .serialization import to_utc
+
+CONDITIONAL_REQUESTS = registry.counter(
+    "talentspark_http_cache_total",
+    "Conditional GET outcomes for cacheable endpoints",
+    ("endpoint", "result")
+)
+
+# Keys passed to Repository.touch_version() whenever the data changes.
+# Submissions are bumped on decisions only; new uploads reach the admin
+# stats through admin_stats_refresh_seconds instead, keeping the upload
+# path free of a write every request would contend on.
+SUBMISSIONS_VERSION_KEY = "submissions"
+_LEADERBOARD_PREFIX = "leaderboard_"
+
+def leaderboard_version_key(age_band: str, gender: str) -> str:
+    return f"{_LEADERBOARD_PREFIX}{age_band}_{gender}"
+
+def leaderboards_version(versions: Dict[str, int]) -> str:
+    """Combined version of every age band/gender leaderboard, for views spanning several"""
+    return ",".join(
+        f"{key}={version}" for key, version in sorted(versions.items()) if key.startswith(_LEADERBOARD_PREFIX)
+    )
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag derived from whatever identifies the current representation"""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110 13.2.2)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return to_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+def conditional_response(request: Request, endpoint: str, etag: str, build: Callable[[], Any],
+                         cache_control: str, last_modified: Optional[datetime] = None) -> Response:
+    """
+    Answer 304 when the client already has this representation, otherwise
+    call `build` and send it with validators attached.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(to_utc(last_modified), usegmt=True)
+
+    if is_not_modified(request, etag, last_modified):
+        CONDITIONAL_REQUESTS.inc(endpoint=endpoint, result="not_modified")
+        return Response(status_code=304, headers=headers)
+
+    CONDITIONAL_REQUESTS.inc(endpoint=endpoint, result="full")
+    return JSONResponse(content=jsonable_encoder(build()), headers=headers)
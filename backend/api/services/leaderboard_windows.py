@@ -0,0 +1,197 @@
+"""
+Daily, weekly and season leaderboards kept as precomputed top-K rollups.
+
+Each approval is folded into one small document per window and filter
+bucket, so a windowed leaderboard is a single document read, the same
+cost as the all-time top-N query. Window keys are derived from the
+approval time, which makes rollover implicit: a new day, week or season
+simply starts a new document, and an approval always lands in the window
+that is current when it is made. The compaction task drops windows that
+have aged out of retention.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from .metrics import registry, timed
+
+ROLLUP_COLLECTION = "leaderboard_windows"
+INDEX_DOC = "_index"
+WINDOWS = ("daily", "weekly", "season")
+
+ROLLUP_WRITES = registry.counter(
+    "talentspark_leaderboard_rollup_writes_total",
+    "Windowed leaderboard rollup updates by window and outcome",
+    ("window", "result")
+)
+
+def _local(value: datetime) -> datetime:
+    # Firestore hands back aware UTC datetimes; everything else here is naive local time
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+def window_bounds(window: str, at: datetime) -> Tuple[str, datetime, datetime]:
+    """(key, start, end) of the window containing `at`"""
+    at = _local(at)
+    day = datetime(at.year, at.month, at.day)
+
+    if window == "daily":
+        return f"daily:{day:%Y-%m-%d}", day, day + timedelta(days=1)
+
+    if window == "weekly":
+        start = day - timedelta(days=day.weekday())
+        iso_year, iso_week, _ = start.isocalendar()
+        return f"weekly:{iso_year}-W{iso_week:02d}", start, start + timedelta(days=7)
+
+    if window == "season":
+        settings = get_settings()
+        length = settings.season_length_months
+        # Months since the first season start on or before `at`
+        offset = (at.month - settings.season_start_month) % 12
+        months_back = offset % length
+        start_index = at.year * 12 + at.month - 1 - months_back
+        start = datetime(start_index // 12, start_index % 12 + 1, 1)
+        end_index = start_index + length
+        end = datetime(end_index // 12, end_index % 12 + 1, 1)
+        return f"season:{start:%Y-%m}", start, end
+
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+def bucket_id(window_key: str, age_band: Optional[str], gender: Optional[str]) -> str:
+    return f"{window_key}|{age_band or '*'}|{gender or '*'}"
+
+def _rank_key(entry: Dict) -> Tuple:
+    return (-entry["total_reps"], -entry["form_score"], entry["submission_id"])
+
+def _merge(entry: Dict, top_k: int, window: str, window_key: str, start: datetime, end: datetime):
+    """Build the mutate function that folds one entry into a rollup document"""
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        entries = list(current["entries"]) if current else []
+        # Re-approving the same submission replaces its row rather than duplicating it
+        entries = [item for item in entries if item["submission_id"] != entry["submission_id"]]
+
+        if len(entries) >= top_k and _rank_key(entry) >= _rank_key(entries[-1]):
+            ROLLUP_WRITES.inc(window=window, result="below_cutoff")
+            return None
+
+        entries.append(entry)
+        entries.sort(key=_rank_key)
+        ROLLUP_WRITES.inc(window=window, result="updated")
+        return {
+            "window": window,
+            "key": window_key,
+            "starts_at": start,
+            "ends_at": end,
+            "entries": entries[:top_k],
+            "updated_at": datetime.now()
+        }
+
+    return mutate
+
+def record_approval(repository, entry: Dict) -> List[str]:
+    """Fold an approved leaderboard entry into every window; returns the window keys touched"""
+    settings = get_settings()
+    # Entries from before approved_at was recorded fall back to the submission date
+    approved = entry.get("approved_at") or entry["submission_date"]
+    touched = []
+    registrations = []
+
+    for window in WINDOWS:
+        window_key, start, end = window_bounds(window, approved)
+        buckets = [
+            bucket_id(window_key, age_band, gender)
+            for age_band in (entry["age_band"], None)
+            for gender in (entry["gender"], None)
+        ]
+        with timed(f"leaderboard.rollup.{window}"):
+            for doc_id in buckets:
+                repository.update_document(
+                    ROLLUP_COLLECTION, doc_id,
+                    _merge(entry, settings.leaderboard_window_top_k, window, window_key, start, end)
+                )
+        registrations.append((window_key, window, end, buckets))
+        touched.append(window_key)
+
+    _register(repository, registrations)
+    return touched
+
+def _register(repository, registrations: List[Tuple[str, str, datetime, List[str]]]):
+    # The index lets compaction find every bucket without a collection scan
+    def mutate(index: Optional[Dict]) -> Optional[Dict]:
+        index = index or {"windows": {}}
+        changed = False
+        for window_key, window, end, buckets in registrations:
+            known = index["windows"].get(window_key)
+            if known and set(buckets) <= set(known["buckets"]):
+                continue
+            merged = sorted(set(buckets) | set(known["buckets"] if known else []))
+            index["windows"][window_key] = {"window": window, "ends_at": end, "buckets": merged}
+            changed = True
+        return index if changed else None
+
+    repository.update_document(ROLLUP_COLLECTION, INDEX_DOC, mutate)
+
+def current_window_key(window: str, now: Optional[datetime] = None) -> str:
+    return window_bounds(window, now or datetime.now())[0]
+
+def get_window_entries(repository, window_key: str, age_band: Optional[str], gender: Optional[str],
+                       limit: int) -> List[Dict]:
+    """Top entries of one window; a single document read"""
+    document = repository.get_document(ROLLUP_COLLECTION, bucket_id(window_key, age_band, gender))
+    return document["entries"][:limit] if document else []
+
+def compact(repository, now: Optional[datetime] = None) -> Dict:
+    """Delete rollups for windows that ended more than the retention period ago"""
+    settings = get_settings()
+    cutoff = (now or datetime.now()) - timedelta(days=settings.leaderboard_window_retention_days)
+    expired: Dict[str, List[str]] = {}
+
+    def mutate(index: Optional[Dict]) -> Optional[Dict]:
+        expired.clear()
+        if not index:
+            return None
+        for window_key, info in list(index["windows"].items()):
+            if _local(info["ends_at"]) < cutoff:
+                expired[window_key] = info["buckets"]
+                del index["windows"][window_key]
+        return index if expired else None
+
+    with timed("leaderboard.compaction"):
+        repository.update_document(ROLLUP_COLLECTION, INDEX_DOC, mutate)
+        # Removed from the index first, so a crash here only leaves orphans that
+        # are never read again rather than index entries pointing at nothing
+        for buckets in expired.values():
+            for doc_id in buckets:
+                repository.delete_document(ROLLUP_COLLECTION, doc_id)
+
+    return {"expired_windows": sorted(expired), "deleted_documents": sum(len(b) for b in expired.values())}
+
+class LeaderboardCompactor:
+    """Periodic background compaction of windowed leaderboards"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, repository_factory):
+        interval = get_settings().leaderboard_compaction_interval
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._run(repository_factory, interval))
+
+    async def _run(self, repository_factory, interval: float):
+        while True:
+            try:
+                result = await asyncio.to_thread(compact, repository_factory())
+                if result["expired_windows"]:
+                    print(f"Leaderboard compaction removed {result['expired_windows']}")
+            except Exception as e:
+                print(f"Leaderboard compaction failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+# Global compactor instance
+leaderboard_compactor = LeaderboardCompactor()
@@ -0,0 +1,496 @@
+"""
+Post-ingestion media for the admin review screens: a downscaled review
+proxy, a short preview clip, and a poster frame plus sprite sheet sampled
+at the detected reps. Rendering runs in a process pool so decoding never
+competes with request handling for the GIL.
+"""
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from .metrics import registry, timed
+
+MEDIA_JOBS = registry.counter(
+    "talentspark_media_jobs_total",
+    "Review media pipeline runs by outcome",
+    ("result",)
+)
+MEDIA_PENDING = registry.gauge(
+    "talentspark_media_jobs_pending",
+    "Review media jobs waiting for or running in the worker pool"
+)
+
+# Tried in order; OpenCV wheels usually lack H.264, and VP8 may be missing too
+_PROXY_CODECS = [
+    ("VP80", ".webm", "video/webm"),
+    ("avc1", ".mp4", "video/mp4"),
+    ("mp4v", ".mp4", "video/mp4"),
+]
+
+def rep_offsets(timestamps: List[float], duration: float) -> List[float]:
+    """
+    Convert rep timestamps to seconds into the video.
+
+    The web analyser reports seconds into the video; epoch-millisecond
+    timestamps are measured from the first rep. Offsets are clamped to
+    the clip.
+    """
+    if not timestamps:
+        return []
+    if max(timestamps) <= duration:
+        offsets = [float(t) for t in timestamps]
+    elif max(timestamps) <= duration * 1000:
+        offsets = [t / 1000 for t in timestamps]
+    else:
+        first = min(timestamps)
+        offsets = [(t - first) / 1000 for t in timestamps]
+    limit = max(0.0, duration - 0.001)
+    return [min(max(0.0, offset), limit) for offset in offsets]
+
+def _open_writer(cv2, directory: str, name: str, fps: float, size: Tuple[int, int]):
+    for fourcc, extension, content_type in _PROXY_CODECS:
+        path = os.path.join(directory, name + extension)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+        if writer.isOpened():
+            return writer, path, content_type
+        writer.release()
+    raise RuntimeError("No usable video encoder for review media")
+
+def _scaled_size(width: int, height: int, target_height: int) -> Tuple[int, int]:
+    if height <= target_height:
+        return width - width % 2, height - height % 2
+    scaled_width = int(round(width * target_height / height))
+    # Most encoders want even dimensions
+    return scaled_width - scaled_width % 2, target_height - target_height % 2
+
+def render_review_media(video_path: str, offsets: List[float], fps_hint: float,
+                        options: Dict) -> Dict:
+    """
+    Decode the upload at `video_path` once and build every review asset.
+
+    Runs in a worker process, so it takes and returns plain data only.
+    Returns {"proxy"|"preview"|"poster"|"sprite": (bytes, content_type),
+    "sprite_layout": {...}}.
+    """
+    import cv2
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as directory:
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            raise ValueError("Could not decode uploaded video")
+
+        source_fps = capture.get(cv2.CAP_PROP_FPS)
+        # WebM from MediaRecorder often reports 1000 (the timebase) or 0
+        if not 0 < source_fps <= 120:
+            source_fps = fps_hint or 30.0
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        proxy_fps = min(source_fps, options["proxy_fps"])
+        frame_step = source_fps / proxy_fps
+        proxy_size = _scaled_size(width, height, options["proxy_height"])
+        tile_width = options["sprite_tile_width"]
+        tile_size = (tile_width, max(2, int(round(height * tile_width / width))))
+
+        # Evenly thin out reps so the sprite stays small for long sets
+        wanted = sorted(offsets)
+        if len(wanted) > options["sprite_max_frames"]:
+            stride = len(wanted) / options["sprite_max_frames"]
+            wanted = [wanted[int(i * stride)] for i in range(options["sprite_max_frames"])]
+        if not wanted:
+            wanted = [0.0]
+
+        preview_start = max(0.0, wanted[0] - 0.5)
+        preview_end = preview_start + options["preview_seconds"]
+
+        proxy, proxy_path, proxy_type = _open_writer(cv2, directory, "proxy", proxy_fps, proxy_size)
+        preview, preview_path, preview_type = _open_writer(cv2, directory, "preview", proxy_fps, proxy_size)
+
+        tiles = []
+        next_output = 0.0
+        index = 0
+        try:
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                t = index / source_fps
+                index += 1
+
+                while len(tiles) < len(wanted) and t >= wanted[len(tiles)]:
+                    tiles.append(cv2.resize(frame, tile_size, interpolation=cv2.INTER_AREA))
+
+                if index - 1 < next_output:
+                    continue
+                next_output += frame_step
+
+                small = cv2.resize(frame, proxy_size, interpolation=cv2.INTER_AREA)
+                proxy.write(small)
+                if preview_start <= t < preview_end:
+                    preview.write(small)
+        finally:
+            capture.release()
+            proxy.release()
+            preview.release()
+
+        if not tiles:
+            raise ValueError("Uploaded video has no decodable frames")
+        # Reps past the last decodable frame reuse it
+        while len(tiles) < len(wanted):
+            tiles.append(tiles[-1])
+
+        columns = min(len(tiles), options["sprite_columns"])
+        rows = -(-len(tiles) // columns)
+        sheet = np.zeros((rows * tile_size[1], columns * tile_size[0], 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            row, column = divmod(i, columns)
+            sheet[row * tile_size[1]:(row + 1) * tile_size[1], column * tile_size[0]:(column + 1) * tile_size[0]] = tile
+
+        jpeg = [cv2.IMWRITE_JPEG_QUALITY, options["jpeg_quality"]]
+        sprite = cv2.imencode(".jpg", sheet, jpeg)[1].tobytes()
+        poster_frame = cv2.resize(tiles[0], proxy_size, interpolation=cv2.INTER_AREA)
+        poster = cv2.imencode(".jpg", poster_frame, jpeg)[1].tobytes()
+
+        with open(proxy_path, "rb") as f:
+            proxy_bytes = f.read()
+        with open(preview_path, "rb") as f:
+            preview_bytes = f.read()
+
+    return {
+        "proxy": (proxy_bytes, proxy_type),
+        "preview": (preview_bytes, preview_type),
+        "poster": (poster, "image/jpeg"),
+        "sprite": (sprite, "image/jpeg"),
+        "sprite_layout": {
+            "tile_width": tile_size[0],
+            "tile_height": tile_size[1],
+            "columns": columns,
+            "offsets": [round(offset, 3) for offset in wanted],
+        },
+    }
+
+def media_options() -> Dict:
+    """Rendering options from settings, as plain data for the worker processes"""
+    settings = get_settings()
+    return {
+        "proxy_height": settings.review_proxy_height,
+        "proxy_fps": settings.review_proxy_fps,
+        "preview_seconds": settings.preview_clip_seconds,
+        "sprite_tile_width": settings.sprite_tile_width,
+        "sprite_columns": settings.sprite_columns,
+        "sprite_max_frames": settings.sprite_max_frames,
+        "jpeg_quality": settings.review_jpeg_quality,
+    }
+
+_EXTENSIONS = {"video/webm": ".webm", "video/mp4": ".mp4", "image/jpeg": ".jpg"}
+
+class MediaSlot:
+    """Place in the pipeline held by one submission's job; release exactly once"""
+
+    def __init__(self, pipeline: "MediaPipeline"):
+        self._pipeline = pipeline
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._pipeline._release()
+
+class MediaPipeline:
+    """
+    Schedules review media rendering and records the results on the submission.
+
+    At most max_pending jobs wait for or run in the pool at once; an upload
+    arriving when all slots are taken gets media status "deferred" instead
+    of queueing more work. Jobs read the upload from disk, so a waiting job
+    holds a path rather than the video itself.
+
+    Deferred submissions go on a backlog that is drained as slots free up.
+    On startup, media still "pending" or "deferred" in the database (a
+    backlog lost on restart, jobs cancelled by shutdown) is queued again.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, spool_dir: str = "",
+                 max_backlog: int = 10000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.spool_dir = spool_dir or None
+        self.max_backlog = max_backlog
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks = set()
+        # Submission IDs waiting for a slot, oldest first
+        self._backlog: "OrderedDict[str, None]" = OrderedDict()
+        self._repository_factory: Optional[Callable] = None
+        self._draining = False
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the parent holds gRPC/SQLite threads that must not be copied
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def warm(self):
+        """Start the worker processes and load OpenCV in each"""
+        futures = [self.executor.submit(_warm_worker) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def reserve(self) -> Optional[MediaSlot]:
+        """A slot for one job, or None when the pipeline is full"""
+        if self.pending >= self.max_pending:
+            MEDIA_JOBS.inc(result="deferred")
+            return None
+        self.pending += 1
+        MEDIA_PENDING.inc()
+        return MediaSlot(self)
+
+    def _release(self):
+        self.pending -= 1
+        MEDIA_PENDING.dec()
+        self._drain_soon()
+
+    def _spool(self, video_content: bytes) -> str:
+        fd, path = tempfile.mkstemp(prefix="talentspark-media-", dir=self.spool_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(video_content)
+        return path
+
+    def _download(self, video_url: str) -> str:
+        """Spool a stored upload from its public URL"""
+        fd, path = tempfile.mkstemp(prefix="talentspark-media-", dir=self.spool_dir)
+        try:
+            with os.fdopen(fd, "wb") as f, urllib.request.urlopen(video_url, timeout=60) as response:
+                shutil.copyfileobj(response, f)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    async def schedule(self, slot: MediaSlot, submission_id: str, video_content: Optional[bytes],
+                       timestamps: List[float], duration: float, fps: float,
+                       stored_path: Optional[str] = None,
+                       video_url: Optional[str] = None) -> Optional[asyncio.Task]:
+        """
+        Render in the background; the upload response does not wait for it.
+        The job takes over `slot`. It reads `stored_path` when storage
+        already keeps the upload on local disk, otherwise a spooled copy of
+        `video_content`, or of `video_url` when the bytes are long gone.
+        """
+        video_path = stored_path
+        if video_path is None:
+            try:
+                if video_content is not None:
+                    video_path = await asyncio.to_thread(self._spool, video_content)
+                else:
+                    video_path = await asyncio.to_thread(self._download, video_url)
+            except Exception as e:
+                slot.release()
+                print(f"Review media spool failed for {submission_id}: {e}")
+                await self._record(submission_id, {"status": "failed", "error": "Could not spool upload"})
+                return None
+
+        task = asyncio.create_task(self._job(
+            slot, submission_id, video_path, stored_path is None, timestamps, duration, fps
+        ))
+        self._track(task)
+        return task
+
+    async def _job(self, slot: MediaSlot, submission_id: str, video_path: str, spooled: bool,
+                   timestamps: List[float], duration: float, fps: float):
+        try:
+            return await self.process(submission_id, video_path, timestamps, duration, fps)
+        finally:
+            slot.release()
+            if spooled:
+                try:
+                    os.remove(video_path)
+                except OSError:
+                    pass
+
+    async def process(self, submission_id: str, video_path: str, timestamps: List[float],
+                      duration: float, fps: float) -> Dict:
+        """Render, upload and attach review media to the submission"""
+        from .storage import get_storage_service
+
+        try:
+            with timed("media.render"):
+                rendered = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, render_review_media,
+                    video_path, rep_offsets(timestamps, duration), fps, media_options()
+                )
+
+            storage = get_storage_service()
+            names = ("proxy", "preview", "poster", "sprite")
+            with timed("media.upload"):
+                urls = await asyncio.gather(*(
+                    storage.upload_video(
+                        rendered[name][0],
+                        f"submissions/{submission_id}/{name}{_EXTENSIONS[rendered[name][1]]}",
+                        content_type=rendered[name][1]
+                    )
+                    for name in names
+                ))
+
+            media = {"status": "ready", **{f"{name}_url": url for name, url in zip(names, urls)},
+                     "sprite": rendered["sprite_layout"],
+                     "bytes": {name: len(rendered[name][0]) for name in names}}
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM on a huge upload); start a fresh pool next time
+            print(f"Review media worker crashed for {submission_id}: {e}")
+            self._executor = None
+            media = {"status": "failed", "error": "Media worker crashed"}
+        except Exception as e:
+            print(f"Review media failed for {submission_id}: {e}")
+            media = {"status": "failed", "error": str(e)}
+
+        await self._record(submission_id, media)
+        return media
+
+    async def _record(self, submission_id: str, media: Dict):
+        """Attach the outcome to the submission; nothing escapes into the unawaited task"""
+        from .repository import get_repository
+        from .submission_cache import get_submission_cache
+
+        try:
+            await asyncio.to_thread(
+                get_repository().update_submission, submission_id, {"media": media, "updated_at": datetime.now()}
+            )
+            get_submission_cache().invalidate(submission_id)
+        except Exception as e:
+            print(f"Recording review media failed for {submission_id}: {e}")
+            MEDIA_JOBS.inc(result="unrecorded")
+            return
+        MEDIA_JOBS.inc(result=media["status"])
+
+    def defer(self, submission_id: str):
+        """Render this submission's media once a slot frees up"""
+        self._backlog[submission_id] = None
+        while len(self._backlog) > self.max_backlog:
+            # The startup sweep picks up whatever falls off here
+            self._backlog.popitem(last=False)
+        self._drain_soon()
+
+    def start(self, repository_factory: Callable):
+        """Queue media left unrendered by an earlier run and drain the backlog from now on"""
+        self._repository_factory = repository_factory
+        self._track(asyncio.create_task(self._sweep()))
+
+    def _track(self, task: asyncio.Task):
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _sweep(self):
+        try:
+            submission_ids = await asyncio.to_thread(_unrendered, self._repository_factory())
+        except Exception as e:
+            print(f"Review media sweep failed: {e}")
+            return
+        for submission_id in submission_ids:
+            self.defer(submission_id)
+        if submission_ids:
+            print(f"Review media: queued {len(submission_ids)} unrendered submissions")
+
+    def _drain_soon(self):
+        if not self._backlog or self._draining or self._repository_factory is None:
+            return
+        if self.pending >= self.max_pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._draining = True
+        self._track(loop.create_task(self._drain()))
+
+    async def _drain(self):
+        try:
+            while self._backlog and self.pending < self.max_pending:
+                submission_id, _ = self._backlog.popitem(last=False)
+                slot = self.reserve()
+                try:
+                    await self._resume(slot, submission_id)
+                except Exception as e:
+                    slot.release()
+                    print(f"Review media resume failed for {submission_id}: {e}")
+        finally:
+            self._draining = False
+
+    async def _resume(self, slot: MediaSlot, submission_id: str):
+        """Schedule a backlogged submission from its stored upload"""
+        from .storage import get_storage_service, LocalStorageService, video_key
+        from .submission_cache import get_submission_cache
+
+        repository = self._repository_factory()
+        data = await asyncio.to_thread(repository.get_submission, submission_id)
+        media = (data or {}).get("media") or {}
+        if media.get("status") not in ("pending", "deferred"):
+            # Gone, or rendered since it was queued
+            slot.release()
+            return
+
+        if media["status"] == "deferred":
+            await asyncio.to_thread(
+                repository.update_submission, submission_id,
+                {"media": {"status": "pending"}, "updated_at": datetime.now()}
+            )
+            get_submission_cache().invalidate(submission_id)
+
+        storage = get_storage_service()
+        stored_path = None
+        if isinstance(storage, LocalStorageService):
+            stored_path = storage.path_for(video_key(submission_id))
+        metrics = data["integrity_bundle"]["video_metrics"]
+        await self.schedule(
+            slot, submission_id, None, data["assessment_data"].get("timestamps", []),
+            metrics["duration"], metrics["fps"], stored_path, video_url=data.get("video_url")
+        )
+
+    def shutdown(self):
+        # Cancelled jobs keep media "pending" and are picked up by the next startup sweep
+        self._backlog.clear()
+        self._repository_factory = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+def _unrendered(repository) -> List[str]:
+    """IDs of submissions awaiting review whose media never got rendered, oldest first"""
+    documents = repository.iter_submissions(status="pending", fields=["id", "media"])
+    # Yielded newest first
+    return [d["id"] for d in documents if (d.get("media") or {}).get("status") in ("pending", "deferred")][::-1]
+
+def _warm_worker():
+    import cv2
+    cv2.VideoCapture()
+
+# Global pipeline instance
+_media_pipeline = None
+
+def get_media_pipeline() -> MediaPipeline:
+    """Get the review media pipeline singleton"""
+    global _media_pipeline
+
+    if _media_pipeline is None:
+        settings = get_settings()
+        _media_pipeline = MediaPipeline(
+            settings.media_pipeline_workers, settings.media_pipeline_max_pending, settings.media_spool_dir,
+            settings.media_backlog_max
+        )
+
+    return _media_pipeline
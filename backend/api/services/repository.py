@@ -0,0 +1,377 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import heapq
+import time
+
+from ..config import get_settings
+from ..models.schemas import AGE_BANDS, Gender
+from .db import get_firestore_client
+from .metrics import timed
+
+class Repository(ABC):
+    """Abstract data access layer used by the routes"""
+
+    name = "repository"
+
+    @abstractmethod
+    def create_submission(self, submission: Dict) -> None:
+        """Store a new submission document"""
+        pass
+
+    @abstractmethod
+    def get_submission(self, submission_id: str) -> Optional[Dict]:
+        """Fetch a submission document, or None if it does not exist"""
+        pass
+
+    @abstractmethod
+    def update_submission(self, submission_id: str, updates: Dict) -> None:
+        """Merge fields into an existing submission"""
+        pass
+
+    @abstractmethod
+    def list_submissions(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """List submissions newest first, optionally filtered by status"""
+        pass
+
+    @abstractmethod
+    def iter_submissions(self, status: Optional[str] = None, fields: Optional[List[str]] = None,
+                         batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Yield every submission newest first, fetching `batch_size` at a time
+        with a cursor. `fields` (dotted paths) lets backends skip the rest of
+        the document; they may still return extra fields.
+        """
+        pass
+
+    @abstractmethod
+    def count_submissions(self, status: Optional[str] = None, risk_score: Optional[str] = None) -> int:
+        """Count submissions matching the given filters"""
+        pass
+
+    @abstractmethod
+    def transact_submission(self, submission_id: str,
+                            mutate: Callable[[Optional[Dict]], Optional[Dict]],
+                            fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Atomically read a submission and update some of its top-level fields.
+        `mutate` gets the current data (None if missing; with `fields`, at
+        least those) and returns just the fields to change, or None to leave
+        it untouched; it may run more than once under contention. Returns the
+        data read with the changes applied, or None if nothing was written.
+        The compare-and-set behind review leases.
+        """
+        pass
+
+    @abstractmethod
+    def list_review_queue(self, limit: int = 50, after: Optional[Tuple[float, str]] = None,
+                          fields: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Pending submissions in ascending (review_queue_key, id) order, from an
+        index, resuming after the given (review_queue_key, id) cursor.
+        Submissions without a key are not listed. `fields` works as in
+        iter_submissions.
+        """
+        pass
+
+    @abstractmethod
+    def add_leaderboard_entry(self, entry: Dict) -> None:
+        """Insert an approved result into its age band/gender leaderboard; one entry per submission"""
+        pass
+
+    @abstractmethod
+    def get_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                        limit: int = 100) -> List[Dict]:
+        """Top entries by reps then form score"""
+        pass
+
+    @abstractmethod
+    def iter_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                         fields: Optional[List[str]] = None, batch_size: int = 500) -> Iterator[Dict]:
+        """Yield every leaderboard entry in rank order, cursor-paged like iter_submissions"""
+        pass
+
+    @abstractmethod
+    def get_document(self, collection: str, doc_id: str) -> Optional[Dict]:
+        """Fetch a free-form document (aggregates, indexes, metadata)"""
+        pass
+
+    @abstractmethod
+    def set_document(self, collection: str, doc_id: str, data: Dict) -> None:
+        """Create or replace a free-form document"""
+        pass
+
+    @abstractmethod
+    def update_document(self, collection: str, doc_id: str,
+                        mutate: Callable[[Optional[Dict]], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Atomically read-modify-write a free-form document. `mutate` gets the
+        current data (None if missing) and returns the new data, or None to
+        leave it untouched; it may run more than once under contention.
+        """
+        pass
+
+    @abstractmethod
+    def delete_document(self, collection: str, doc_id: str) -> None:
+        """Delete a free-form document if it exists"""
+        pass
+
+    @abstractmethod
+    def append_events(self, events: List[Dict]) -> None:
+        """Write a batch of event log entries; rewriting an existing event ID is a no-op"""
+        pass
+
+    @abstractmethod
+    def list_events(self, submission_id: str) -> List[Dict]:
+        """Every logged event for a submission, oldest first"""
+        pass
+
+    @abstractmethod
+    def touch_version(self, key: str) -> int:
+        """Record that the data behind `key` changed; returns the new version"""
+        pass
+
+    @abstractmethod
+    def get_versions(self) -> Dict[str, int]:
+        """All change versions in one query, used to build ETags"""
+        pass
+
+    @abstractmethod
+    def ping(self) -> bool:
+        """Cheap round trip used by the health check"""
+        pass
+
+def _leaderboard_rank(entry: Dict):
+    return -entry["total_reps"], -entry["form_score"]
+
+class FirestoreRepository(Repository):
+    """Cloud Firestore implementation"""
+
+    name = "firestore"
+
+    @property
+    def db(self):
+        return get_firestore_client()
+
+    def create_submission(self, submission: Dict) -> None:
+        with timed("firestore.submissions.set"):
+            self.db.collection("submissions").document(submission["id"]).set(submission)
+
+    def get_submission(self, submission_id: str) -> Optional[Dict]:
+        with timed("firestore.submissions.get"):
+            doc = self.db.collection("submissions").document(submission_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def update_submission(self, submission_id: str, updates: Dict) -> None:
+        with timed("firestore.submissions.update"):
+            self.db.collection("submissions").document(submission_id).update(updates)
+
+    def list_submissions(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict]:
+        query = self.db.collection("submissions").order_by("created_at", direction="DESCENDING")
+
+        if status:
+            query = query.where("status", "==", status)
+
+        with timed("firestore.submissions.list"):
+            return [doc.to_dict() for doc in query.limit(limit).offset(offset).stream()]
+
+    def _paginate(self, query, batch_size: int, stage: str) -> Iterator[Dict]:
+        # start_after(snapshot) resumes from the last document's sort values and
+        # name, unlike offset() which re-reads (and bills) every skipped document
+        cursor = None
+        while True:
+            page = query.start_after(cursor) if cursor is not None else query
+            with timed(stage):
+                docs = list(page.limit(batch_size).stream())
+            for doc in docs:
+                yield doc.to_dict()
+            if len(docs) < batch_size:
+                return
+            cursor = docs[-1]
+
+    def iter_submissions(self, status: Optional[str] = None, fields: Optional[List[str]] = None,
+                         batch_size: int = 500) -> Iterator[Dict]:
+        query = self.db.collection("submissions")
+        if status:
+            query = query.where("status", "==", status)
+        query = query.order_by("created_at", direction="DESCENDING")
+        if fields:
+            # The cursor needs the order-by field on each snapshot
+            query = query.select(sorted(set(fields) | {"created_at"}))
+
+        return self._paginate(query, batch_size, "firestore.submissions.export")
+
+    def count_submissions(self, status: Optional[str] = None, risk_score: Optional[str] = None) -> int:
+        query = self.db.collection("submissions")
+
+        if status:
+            query = query.where("status", "==", status)
+        if risk_score:
+            query = query.where("risk_score", "==", risk_score)
+
+        # Server-side aggregation instead of streaming every matching document
+        with timed("firestore.submissions.count"):
+            result = query.count().get()
+        return int(result[0][0].value)
+
+    def transact_submission(self, submission_id: str,
+                            mutate: Callable[[Optional[Dict]], Optional[Dict]],
+                            fields: Optional[List[str]] = None) -> Optional[Dict]:
+        reference = self.db.collection("submissions").document(submission_id)
+
+        def body(transaction):
+            snapshot = reference.get(field_paths=fields, transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else None
+            updates = mutate(current)
+            if updates is None or current is None:
+                return None
+            # Only the changed fields are written; the integrity bundle is never resent
+            transaction.update(reference, updates)
+            return dict(current, **updates)
+
+        with timed("firestore.submissions.transaction"):
+            return self._run_transaction(body)
+
+    def list_review_queue(self, limit: int = 50, after: Optional[Tuple[float, str]] = None,
+                          fields: Optional[List[str]] = None) -> List[Dict]:
+        # Needs the composite index (status ASC, review_queue_key ASC, __name__ ASC).
+        # The document ID breaks ties, so the cursor is unique
+        query = (self.db.collection("submissions")
+                 .where("status", "==", "pending")
+                 .order_by("review_queue_key")
+                 .order_by("__name__"))
+        if fields:
+            query = query.select(fields)
+        if after is not None:
+            query = query.start_after({
+                "review_queue_key": after[0],
+                "__name__": self.db.collection("submissions").document(after[1]),
+            })
+
+        with timed("firestore.submissions.queue"):
+            return [doc.to_dict() for doc in query.limit(limit).stream()]
+
+    def add_leaderboard_entry(self, entry: Dict) -> None:
+        collection_name = f"leaderboard_{entry['age_band']}_{entry['gender']}"
+        with timed("firestore.leaderboard.add"):
+            # Keyed by submission, so a replayed approval overwrites instead of duplicating
+            self.db.collection(collection_name).document(entry["submission_id"]).set(entry)
+
+    def _leaderboard_queries(self, age_band: Optional[str], gender: Optional[str]) -> List:
+        """
+        One query per age band/gender collection the filters cover. Entries
+        live in leaderboard_{band}_{gender} collections rather than one
+        collection group, so unfiltered views read each board and merge.
+        """
+        bands = [age_band] if age_band else AGE_BANDS
+        genders = [gender] if gender else [member.value for member in Gender]
+
+        # Order by reps descending, then form score descending
+        return [
+            self.db.collection(f"leaderboard_{band}_{board_gender}")
+                .order_by("total_reps", direction="DESCENDING")
+                .order_by("form_score", direction="DESCENDING")
+            for band in bands for board_gender in genders
+        ]
+
+    def get_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                        limit: int = 100) -> List[Dict]:
+        queries = self._leaderboard_queries(age_band, gender)
+        with timed("firestore.leaderboard.query"):
+            # The overall top `limit` is among each board's own top `limit`
+            entries = [doc.to_dict() for query in queries for doc in query.limit(limit).stream()]
+        return sorted(entries, key=_leaderboard_rank)[:limit]
+
+    def iter_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                         fields: Optional[List[str]] = None, batch_size: int = 500) -> Iterator[Dict]:
+        queries = self._leaderboard_queries(age_band, gender)
+        if fields:
+            queries = [query.select(sorted(set(fields) | {"total_reps", "form_score"})) for query in queries]
+
+        # Each board is already in rank order, so a lazy k-way merge keeps the export streaming
+        return heapq.merge(
+            *(self._paginate(query, batch_size, "firestore.leaderboard.export") for query in queries),
+            key=_leaderboard_rank
+        )
+
+    def get_document(self, collection: str, doc_id: str) -> Optional[Dict]:
+        with timed("firestore.documents.get"):
+            doc = self.db.collection(collection).document(doc_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def set_document(self, collection: str, doc_id: str, data: Dict) -> None:
+        with timed("firestore.documents.set"):
+            self.db.collection(collection).document(doc_id).set(data)
+
+    def _run_transaction(self, body: Callable):
+        from google.cloud import firestore
+        return firestore.transactional(body)(self.db.transaction())
+
+    def update_document(self, collection: str, doc_id: str,
+                        mutate: Callable[[Optional[Dict]], Optional[Dict]]) -> Optional[Dict]:
+        reference = self.db.collection(collection).document(doc_id)
+
+        def body(transaction):
+            snapshot = reference.get(transaction=transaction)
+            data = mutate(snapshot.to_dict() if snapshot.exists else None)
+            if data is not None:
+                transaction.set(reference, data)
+            return data
+
+        with timed("firestore.documents.transaction"):
+            return self._run_transaction(body)
+
+    def delete_document(self, collection: str, doc_id: str) -> None:
+        with timed("firestore.documents.delete"):
+            self.db.collection(collection).document(doc_id).delete()
+
+    def append_events(self, events: List[Dict]) -> None:
+        collection = self.db.collection("events")
+        with timed("firestore.events.batch"):
+            # Firestore caps a write batch at 500 operations
+            for start in range(0, len(events), 500):
+                batch = self.db.batch()
+                for event in events[start:start + 500]:
+                    batch.set(collection.document(event["id"]), event)
+                batch.commit()
+
+    def list_events(self, submission_id: str) -> List[Dict]:
+        with timed("firestore.events.list"):
+            query = self.db.collection("events").where("submission_id", "==", submission_id)
+            events = [doc.to_dict() for doc in query.stream()]
+        # Sorted here rather than in the query, so no composite index is needed
+        return sorted(events, key=lambda event: (event["at"], event["id"]))
+
+    def touch_version(self, key: str) -> int:
+        version = time.time_ns()
+        # One document per key: a single shared document would take every
+        # bump and cap the write rate of everything that touches a version
+        with timed("firestore.versions.set"):
+            self.db.collection("versions").document(key).set({"version": version})
+        return version
+
+    def get_versions(self) -> Dict[str, int]:
+        with timed("firestore.versions.get"):
+            return {doc.id: doc.to_dict()["version"] for doc in self.db.collection("versions").stream()}
+
+    def ping(self) -> bool:
+        with timed("firestore.ping"):
+            list(self.db.collection("submissions").limit(1).stream())
+        return True
+
+_repository: Optional[Repository] = None
+
+def get_repository() -> Repository:
+    """Get the configured repository singleton"""
+    global _repository
+
+    if _repository is None:
+        settings = get_settings()
+        if settings.database_backend == "firestore":
+            _repository = FirestoreRepository()
+        elif settings.database_backend == "sqlite":
+            from .sqlite_repository import SQLiteRepository
+            _repository = SQLiteRepository(settings.sqlite_path, pool_size=settings.sqlite_pool_size)
+        else:
+            raise ValueError(f"Unsupported database backend: {settings.database_backend}")
+
+    return _repository
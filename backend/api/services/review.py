@@ -0,0 +1,149 @@
+"""
+Everything the admin review screen needs, precomputed at ingestion.
+
+Face snapshots arrive as inline base64 images. At ingestion each distinct
+image is stored once as a thumbnail, and the snapshot series is reduced
+to a columnar timeline (offsets, confidences, gap markers) that is kept
+on the submission. The review endpoint then sends a few small arrays and
+URLs instead of the raw images, and the stored bundle keeps only the URLs.
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..models.schemas import FaceSnapshot, IntegrityBundle
+from .metrics import timed
+
+_THUMBNAIL_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+
+CHECK_LABELS = {
+    "content_hash_valid": "Content hash matches video and assessment",
+    "timestamp_consistent": "Timestamps consistent",
+    "face_continuity_valid": "Face visible throughout",
+    "video_metrics_valid": "Video matches reported metrics",
+    "device_info_consistent": "Device info consistent",
+    "session_integrity_valid": "Session complete",
+}
+
+def _decode_image(image_data: str) -> Optional[Tuple[bytes, str]]:
+    """(bytes, content type) from a data URL or bare base64 JPEG, or None if unusable"""
+    content_type = "image/jpeg"
+    if image_data.startswith("data:"):
+        header, _, image_data = image_data.partition(",")
+        content_type = header[len("data:"):].split(";", 1)[0] or content_type
+    if not image_data or content_type not in _THUMBNAIL_TYPES:
+        return None
+    try:
+        return base64.b64decode(image_data, validate=True), content_type
+    except (binascii.Error, ValueError):
+        return None
+
+async def store_thumbnails(storage, submission_id: str, snapshots: List[FaceSnapshot]) -> List[Optional[str]]:
+    """
+    Upload each distinct snapshot image once, concurrently; returns one URL
+    (or None) per snapshot, in the order given
+    """
+    limit = get_settings().review_max_thumbnails
+    keys: List[Optional[str]] = []
+    uploads: Dict[str, Tuple[bytes, str]] = {}
+
+    for snapshot in snapshots:
+        decoded = _decode_image(snapshot.image_data)
+        if decoded is None:
+            keys.append(None)
+            continue
+        # Clients often resend the same frame; content addressing stores it once
+        key = hashlib.blake2b(decoded[0], digest_size=8).hexdigest()
+        if key not in uploads and len(uploads) >= limit:
+            keys.append(None)
+            continue
+        uploads.setdefault(key, decoded)
+        keys.append(key)
+
+    with timed("review.thumbnails"):
+        urls = await asyncio.gather(*(
+            storage.upload_video(
+                content, f"submissions/{submission_id}/faces/{key}{_THUMBNAIL_TYPES[content_type]}",
+                content_type=content_type
+            )
+            for key, (content, content_type) in uploads.items()
+        ))
+    by_key = dict(zip(uploads, urls))
+    return [by_key.get(key) if key else None for key in keys]
+
+def stored_bundle(bundle: IntegrityBundle, thumbnails: Optional[List[Optional[str]]]) -> Dict:
+    """
+    The integrity bundle as kept on the submission. Once the thumbnails are
+    stored each snapshot's inline image is replaced by its URL (None past
+    review_max_thumbnails or if it didn't decode); if the upload failed the
+    images stay, so review still has them.
+    """
+    data = bundle.dict()
+    if thumbnails is None:
+        return data
+    for snapshot, url in zip(data["face_snapshots"], thumbnails):
+        del snapshot["image_data"]
+        snapshot["thumbnail_url"] = url
+    return data
+
+def face_timeline(snapshots: List[FaceSnapshot], thumbnails: Optional[List[Optional[str]]],
+                  max_gap_ms: int, min_confidence: float) -> Dict:
+    """
+    Columnar face timeline: offsets from the first snapshot, confidences,
+    whether a gap longer than `max_gap_ms` precedes each snapshot, and the
+    matching thumbnail URLs
+    """
+    order = sorted(range(len(snapshots)), key=lambda i: snapshots[i].timestamp)
+    timestamps = [snapshots[i].timestamp for i in order]
+    start = timestamps[0] if timestamps else None
+    gaps = [0] + [b - a for a, b in zip(timestamps, timestamps[1:])]
+
+    return {
+        "started_at": start,
+        "offsets_ms": [t - start for t in timestamps],
+        "confidence": [round(snapshots[i].confidence, 3) for i in order],
+        "gap_before": [gap > max_gap_ms for gap in gaps],
+        "thumbnails": [thumbnails[i] for i in order] if thumbnails else [None] * len(order),
+        "max_gap_ms": max(gaps),
+        "low_confidence": sum(1 for i in order if snapshots[i].confidence < min_confidence),
+        "min_confidence": min_confidence,
+    }
+
+def verification_checks(verification_result: Dict, timeline: Dict) -> List[Dict]:
+    """One entry per integrity check, with detail where the stored data gives any"""
+    details = {}
+    count = len(timeline["offsets_ms"])
+    if count:
+        details["face_continuity_valid"] = (
+            f"{count} snapshots, {timeline['low_confidence']} below "
+            f"{timeline['min_confidence']:.0%} confidence, longest gap {timeline['max_gap_ms'] / 1000:g}s"
+        )
+
+    return [
+        {
+            "check": check,
+            "label": CHECK_LABELS.get(check, check.replace("_", " ").capitalize()),
+            "passed": bool(passed),
+            "detail": details.get(check),
+        }
+        for check, passed in verification_result.items()
+    ]
+
+def stored_timeline(data: Dict) -> Dict:
+    """The precomputed timeline, or one built from the stored bundle for older submissions"""
+    if data.get("face_timeline"):
+        return data["face_timeline"]
+    from .verify import IntegrityVerifier
+    verifier = IntegrityVerifier()
+    stored = data.get("integrity_bundle", {}).get("face_snapshots", [])
+    # Bundles stored after their thumbnails carry URLs instead of images
+    snapshots = [FaceSnapshot(**dict(snapshot, image_data=snapshot.get("image_data", ""))) for snapshot in stored]
+    thumbnails = [snapshot.get("thumbnail_url") for snapshot in stored]
+    return face_timeline(snapshots, thumbnails, verifier.max_face_gap_seconds * 1000, verifier.min_face_confidence)
@@ -0,0 +1,214 @@
+"""
+Risk-prioritised review queue with reviewer leases.
+
+Each pending submission carries a review_queue_key: the time it was
+submitted, moved earlier by a head start for its risk level and for low
+auto-approval confidence. Serving the smallest key first orders the queue
+by risk, confidence and age at once, and because every item ages at the
+same rate the key never has to be recomputed.
+
+Claiming sets a time-limited lease on the submission with a
+compare-and-set, so two reviewers can never hold the same item; an
+expired lease simply counts as free on the next claim. A decision checks
+the lease, records the outcome and releases it in the same transaction.
+Each transaction writes only the fields it changes, never the whole
+document.
+"""
+import secrets
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from .metrics import registry, timed
+
+# Only what claiming needs; the queue index never reads the integrity bundle
+QUEUE_FIELDS = [
+    "id", "status", "risk_score", "created_at", "auto_approval_confidence", "review_queue_key", "lease"
+]
+
+QUEUE_CLAIMS = registry.counter(
+    "talentspark_review_claims_total",
+    "Review queue claims by outcome",
+    ("result",)
+)
+LEASE_CONFLICTS = registry.counter(
+    "talentspark_review_lease_conflicts_total",
+    "Claims or decisions that lost a race for a submission",
+    ("operation",)
+)
+
+class LeaseConflict(Exception):
+    pass
+
+def auto_approval_confidence(verification_result: Dict, risk_flags: List[str]) -> float:
+    """0-1: share of integrity checks passed, less a tenth per risk flag"""
+    checks = list(verification_result.values())
+    passed = sum(1 for check in checks if check) / len(checks) if checks else 0.0
+    return round(max(0.0, min(1.0, passed - 0.1 * len(risk_flags))), 3)
+
+def queue_key(risk_score: str, created_at: datetime, confidence: float) -> float:
+    settings = get_settings()
+    head_start_hours = {
+        "red": settings.review_red_head_start_hours,
+        "yellow": settings.review_yellow_head_start_hours,
+    }.get(risk_score, 0.0)
+    head_start_hours += settings.review_confidence_head_start_hours * (1.0 - confidence)
+    return created_at.timestamp() - head_start_hours * 3600
+
+def queue_fields(risk_score: str, created_at: datetime, verification_result: Dict,
+                 risk_flags: List[str]) -> Dict:
+    """Fields to store on a new submission so the queue index picks it up"""
+    confidence = auto_approval_confidence(verification_result, risk_flags)
+    return {
+        "auto_approval_confidence": confidence,
+        "review_queue_key": queue_key(risk_score, created_at, confidence),
+    }
+
+def lease_holder(data: Dict, now: float) -> Optional[str]:
+    """Reviewer holding an unexpired lease on the submission, if any"""
+    lease = data.get("lease")
+    if lease and lease["expires_at"] > now:
+        return lease["reviewer"]
+    return None
+
+def claim_next(repository, reviewer: str) -> Optional[Dict]:
+    """
+    Lease the highest-priority free submission to `reviewer` and return it,
+    or None if everything pending is leased. An item the reviewer already
+    holds is renewed and returned rather than skipped.
+    """
+    settings = get_settings()
+    page = settings.review_queue_scan
+    after = None
+
+    with timed("review_queue.claim"):
+        while True:
+            candidates = repository.list_review_queue(limit=page, after=after, fields=QUEUE_FIELDS)
+            now = time.time()
+            for candidate in candidates:
+                holder = lease_holder(candidate, now)
+                if holder is not None and holder != reviewer:
+                    continue
+                claimed = _acquire(repository, candidate["id"], reviewer, now, settings.review_lease_seconds)
+                if claimed is not None:
+                    return claimed
+                # Someone else got there between the index read and the transaction
+                LEASE_CONFLICTS.inc(operation="claim")
+            if len(candidates) < page:
+                QUEUE_CLAIMS.inc(result="empty")
+                return None
+            # Keyset, not offset: each page starts from the index, however many are leased
+            after = queue_cursor(candidates[-1])
+
+def queue_cursor(data: Dict) -> Tuple[float, str]:
+    """Position to resume list_review_queue after this item"""
+    return data["review_queue_key"], data["id"]
+
+def _acquire(repository, submission_id: str, reviewer: str, now: float, lease_seconds: int) -> Optional[Dict]:
+    outcome = {}
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        if current is None or current["status"] != "pending":
+            return None
+        holder = lease_holder(current, now)
+        if holder is not None and holder != reviewer:
+            return None
+        previous = current.get("lease")
+        outcome["result"] = "renewed" if holder == reviewer else "reclaimed" if previous else "claimed"
+        lease = {
+            "reviewer": reviewer,
+            # A reviewer who already holds it keeps the same token
+            "token": previous["token"] if holder == reviewer else secrets.token_urlsafe(16),
+            "claimed_at": previous["claimed_at"] if holder == reviewer else now,
+            "expires_at": now + lease_seconds,
+        }
+        return {"lease": lease}
+
+    # The whole document: the reviewer opens it next
+    claimed = repository.transact_submission(submission_id, mutate)
+    if claimed is not None:
+        QUEUE_CLAIMS.inc(result=outcome["result"])
+    return claimed
+
+def _check_lease(current: Optional[Dict], submission_id: str, token: Optional[str], now: float) -> Dict:
+    """The submission, if it is pending and the caller may act on it"""
+    if current is None:
+        raise KeyError(submission_id)
+    if current["status"] != "pending":
+        raise LeaseConflict(f"Submission already {current['status']}")
+    holder = lease_holder(current, now)
+    if holder is not None and current["lease"]["token"] != token:
+        raise LeaseConflict(f"Submission is claimed by {holder}")
+    if holder is None and token is not None and (current.get("lease") or {}).get("token") != token:
+        # Expired and since released, or never held; a still-unclaimed expired lease is honoured
+        raise LeaseConflict("Lease not held")
+    return current
+
+def renew(repository, submission_id: str, token: str) -> Dict:
+    """Extend a held lease; raises LeaseConflict if it was lost"""
+    lease_seconds = get_settings().review_lease_seconds
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        now = time.time()
+        current = _check_lease(current, submission_id, token, now)
+        if not current.get("lease"):
+            raise LeaseConflict("Lease not held")
+        return {"lease": dict(current["lease"], expires_at=now + lease_seconds)}
+
+    return repository.transact_submission(submission_id, mutate, fields=QUEUE_FIELDS)
+
+def release(repository, submission_id: str, token: str) -> Dict:
+    """Give an item back to the queue without deciding it"""
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        _check_lease(current, submission_id, token, time.time())
+        return {"lease": None}
+
+    return repository.transact_submission(submission_id, mutate, fields=QUEUE_FIELDS)
+
+def decide(repository, submission_id: str, token: Optional[str], update: Dict) -> Dict:
+    """
+    Record a decision and release the lease in one transaction. Raises
+    KeyError if the submission doesn't exist and LeaseConflict if it was
+    already decided or someone else holds it. Unclaimed items can still be
+    decided directly, without a token.
+    """
+
+    def mutate(current: Optional[Dict]) -> Optional[Dict]:
+        _check_lease(current, submission_id, token, time.time())
+        return dict(update, lease=None)
+
+    try:
+        with timed("review_queue.decide"):
+            # The whole document, for the cache and the leaderboard entry
+            return repository.transact_submission(submission_id, mutate)
+    except LeaseConflict:
+        LEASE_CONFLICTS.inc(operation="decide")
+        raise
+
+def queue_item(data: Dict, now: float) -> Dict:
+    lease = data.get("lease") or {}
+    holder = lease_holder(data, now)
+    return {
+        "submission_id": data["id"],
+        "risk_score": data["risk_score"],
+        "created_at": data["created_at"],
+        "auto_approval_confidence": data.get("auto_approval_confidence"),
+        "claimed_by": holder,
+        "lease_expires_at": datetime.fromtimestamp(lease["expires_at"]) if holder else None,
+        "queue_key": data["review_queue_key"],
+    }
+
+def backfill_queue_keys(repository) -> int:
+    """Give pending submissions from before the queue existed a key; returns how many"""
+    fields = ["id", "risk_score", "created_at", "verification_result", "risk_flags", "review_queue_key"]
+    missing = [
+        data for data in repository.iter_submissions(status="pending", fields=fields)
+        if data.get("review_queue_key") is None
+    ]
+    for data in missing:
+        repository.update_submission(data["id"], queue_fields(
+            data["risk_score"], data["created_at"], data.get("verification_result") or {}, data.get("risk_flags") or []
+        ))
+    return len(missing)
@@ -1,7 +1,29 @@
 from typing import Dict, Any
+from functools import lru_cache
 import json
 import os
 
+@lru_cache()
+def _default_benchmarks() -> Dict:
+    """Benchmark tables shared by every calculator instance"""
+    # Default benchmarks if file not found
+    return {
+        "squats": {
+            "male": {
+                "13-15": {"excellent": 30, "good": 25, "average": 20, "below": 15},
+                "16-18": {"excellent": 35, "good": 30, "average": 25, "below": 20},
+                "19-25": {"excellent": 40, "good": 35, "average": 30, "below": 25},
+                "26-35": {"excellent": 35, "good": 30, "average": 25, "below": 20}
+            },
+            "female": {
+                "13-15": {"excellent": 25, "good": 20, "average": 16, "below": 12},
+                "16-18": {"excellent": 30, "good": 25, "average": 20, "below": 16},
+                "19-25": {"excellent": 35, "good": 30, "average": 25, "below": 20},
+                "26-35": {"excellent": 30, "good": 25, "average": 20, "below": 16}
+            }
+        }
+    }
+
 class ScoreCalculator:
     """Handles performance scoring and benchmark comparison"""
     
@@ -11,23 +33,7 @@ class ScoreCalculator:
     
     def load_benchmarks(self) -> Dict:
         """Load benchmark data"""
-        # Default benchmarks if file not found
-        return {
-            "squats": {
-                "male": {
-                    "13-15": {"excellent": 30, "good": 25, "average": 20, "below": 15},
-                    "16-18": {"excellent": 35, "good": 30, "average": 25, "below": 20},
-                    "19-25": {"excellent": 40, "good": 35, "average": 30, "below": 25},
-                    "26-35": {"excellent": 35, "good": 30, "average": 25, "below": 20}
-                },
-                "female": {
-                    "13-15": {"excellent": 25, "good": 20, "average": 16, "below": 12},
-                    "16-18": {"excellent": 30, "good": 25, "average": 20, "below": 16},
-                    "19-25": {"excellent": 35, "good": 30, "average": 25, "below": 20},
-                    "26-35": {"excellent": 30, "good": 25, "average": 20, "below": 16}
-                }
-            }
-        }
+        return _default_benchmarks()
     
     def get_age_band(self, age: int) -> str:
         """Get age band from age"""
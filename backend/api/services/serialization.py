@@ -0,0 +1,34 @@
+"""
+JSON encoding for stored documents and spooled events, and datetime
+normalisation for what goes out over HTTP.
+
+Datetimes are tagged as {"$datetime": iso} so they round-trip, and enums
+are stored by value. The SQLite repository and the event log spool both
+use it, so a document reads back the same from either.
+"""
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat(timespec="microseconds")}
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def json_object_hook(value: Dict) -> Any:
+    if len(value) == 1 and "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+def to_utc(value: datetime) -> datetime:
+    # Naive datetimes in this codebase come from datetime.now(), i.e. local time
+    return value.astimezone(timezone.utc)
+
+def dumps(data: Any) -> str:
+    return json.dumps(data, default=json_default, separators=(",", ":"))
+
+def loads(text) -> Any:
+    return json.loads(text, object_hook=json_object_hook)
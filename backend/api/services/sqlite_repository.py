@@ -0,0 +1,423 @@
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import timed
+from .repository import Repository
+from .serialization import dumps, loads
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    risk_score TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_created_at ON submissions (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_risk_score ON submissions (risk_score, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    rowid INTEGER PRIMARY KEY,
+    submission_id TEXT NOT NULL,
+    age_band TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    total_reps INTEGER NOT NULL,
+    form_score REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_band_gender
+    ON leaderboard (age_band, gender, total_reps DESC, form_score DESC);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_gender
+    ON leaderboard (gender, total_reps DESC, form_score DESC);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_overall
+    ON leaderboard (total_reps DESC, form_score DESC);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    submission_id TEXT,
+    type TEXT NOT NULL,
+    at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_submission ON events (submission_id, at);
+
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS versions (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# One-time changes to existing databases, in order. PRAGMA user_version
+# records how many have been applied, so each runs once per database file
+# rather than on every open.
+_MIGRATIONS = [
+    # 1: one leaderboard entry per submission; older databases may hold duplicates from re-approvals
+    (
+        "DELETE FROM leaderboard WHERE rowid NOT IN (SELECT MAX(rowid) FROM leaderboard GROUP BY submission_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_leaderboard_submission ON leaderboard (submission_id)",
+    ),
+    # 2: review queue index ends in the ID, so keyset pages come straight off it.
+    # An expression index, so the queue needs no new column on existing databases
+    (
+        "DROP INDEX IF EXISTS idx_submissions_review_queue",
+        "CREATE INDEX IF NOT EXISTS idx_submissions_review_queue_keyset "
+        "ON submissions (status, json_extract(data, '$.review_queue_key'), id)",
+    ),
+]
+
+# Statements are kept as module constants so sqlite3's per-connection
+# statement cache reuses the prepared form on every call
+_INSERT_SUBMISSION = "INSERT OR REPLACE INTO submissions (id, status, risk_score, created_at, data) VALUES (?, ?, ?, ?, ?)"
+_SELECT_SUBMISSION = "SELECT data FROM submissions WHERE id = ?"
+_UPDATE_SUBMISSION = "UPDATE submissions SET status = ?, risk_score = ?, data = ? WHERE id = ?"
+_REVIEW_QUEUE = (
+    "SELECT {columns} FROM submissions WHERE status = 'pending' "
+    "AND json_extract(data, '$.review_queue_key') IS NOT NULL{after} "
+    "ORDER BY json_extract(data, '$.review_queue_key'), id LIMIT ?"
+)
+_REVIEW_QUEUE_AFTER = " AND (json_extract(data, '$.review_queue_key'), id) > (?, ?)"
+_LIST_SUBMISSIONS = "SELECT data FROM submissions ORDER BY created_at DESC LIMIT ? OFFSET ?"
+_LIST_SUBMISSIONS_BY_STATUS = "SELECT data FROM submissions WHERE status = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
+# Keyset pagination for exports: each batch resumes after the last (sort key, id).
+# Sort-key columns come first, in the order of the resume clause, and data last
+_EXPORT_SUBMISSIONS = "SELECT created_at, id, data FROM submissions{where} ORDER BY created_at DESC, id DESC LIMIT ?"
+_EXPORT_LEADERBOARD = (
+    "SELECT total_reps, form_score, rowid, data FROM leaderboard{where} "
+    "ORDER BY total_reps DESC, form_score DESC, rowid DESC LIMIT ?"
+)
+_INSERT_LEADERBOARD = (
+    "INSERT INTO leaderboard (submission_id, age_band, gender, total_reps, form_score, data) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (submission_id) DO UPDATE SET age_band = excluded.age_band, gender = excluded.gender, "
+    "total_reps = excluded.total_reps, form_score = excluded.form_score, data = excluded.data"
+)
+_SELECT_DOCUMENT = "SELECT data FROM documents WHERE collection = ? AND id = ?"
+_UPSERT_DOCUMENT = "INSERT OR REPLACE INTO documents (collection, id, data) VALUES (?, ?, ?)"
+_DELETE_DOCUMENT = "DELETE FROM documents WHERE collection = ? AND id = ?"
+_INSERT_EVENT = "INSERT OR IGNORE INTO events (id, submission_id, type, at, data) VALUES (?, ?, ?, ?, ?)"
+_LIST_EVENTS = "SELECT data FROM events WHERE submission_id = ? ORDER BY at, id"
+_UPSERT_VERSION = "INSERT OR REPLACE INTO versions (key, version) VALUES (?, ?)"
+_SELECT_VERSIONS = "SELECT key, version FROM versions"
+
+def _sort_key(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="microseconds")
+    return str(value)
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+def _extract(fields: List[str]) -> Tuple[List[str], str, List[str]]:
+    """
+    (fields, column expression, path parameters) selecting top-level fields.
+    Multi-path json_extract returns just those values as one small JSON array.
+    SQLite still parses the stored text to find them, but only that array is
+    returned and decoded in Python. With one path it would return a bare
+    value instead, hence always asking for the ID too.
+    """
+    fields = list(dict.fromkeys(["id", *fields]))
+    paths = [f"$.{field}" for field in fields]
+    return fields, f"json_extract(data, {', '.join('?' * len(paths))})", paths
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.executescript(_SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < len(_MIGRATIONS):
+        _migrate(conn)
+
+def _migrate(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock: another process may have migrated meanwhile
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for statements in _MIGRATIONS[version:]:
+            for statement in statements:
+                conn.execute(statement)
+        if version < len(_MIGRATIONS):
+            conn.execute(f"PRAGMA user_version = {len(_MIGRATIONS)}")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of WAL-mode connections shared across threads"""
+
+    def __init__(self, path: str, size: int = 4,
+                 setup: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.path = path
+        # Each in-memory connection would be its own database
+        self.size = 1 if path == ":memory:" else max(1, size)
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self.size)
+        for index in range(self.size):
+            conn = self._connect()
+            if index == 0 and setup is not None:
+                # Before the rest connect: a connection that loaded the schema
+                # ahead of a migration keeps preparing against the old copy
+                setup(conn)
+            self._pool.put(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+            cached_statements=256,
+            timeout=30
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+class SQLiteRepository(Repository):
+    """Embedded SQLite implementation for single-node and offline deployments"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.pool = SQLiteConnectionPool(path, pool_size, setup=_create_schema)
+
+    def create_submission(self, submission: Dict) -> None:
+        with timed("sqlite.submissions.set"), self.pool.connection() as conn:
+            conn.execute(_INSERT_SUBMISSION, (
+                submission["id"],
+                _plain(submission["status"]),
+                _plain(submission["risk_score"]),
+                _sort_key(submission["created_at"]),
+                dumps(submission)
+            ))
+
+    def get_submission(self, submission_id: str) -> Optional[Dict]:
+        with timed("sqlite.submissions.get"), self.pool.connection() as conn:
+            row = conn.execute(_SELECT_SUBMISSION, (submission_id,)).fetchone()
+        return loads(row[0]) if row else None
+
+    def update_submission(self, submission_id: str, updates: Dict) -> None:
+        with timed("sqlite.submissions.update"), self.pool.transaction() as conn:
+            row = conn.execute(_SELECT_SUBMISSION, (submission_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Submission {submission_id} not found")
+            data = loads(row[0])
+            data.update(updates)
+            conn.execute(_UPDATE_SUBMISSION, (
+                _plain(data["status"]), _plain(data["risk_score"]), dumps(data), submission_id
+            ))
+
+    def list_submissions(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict]:
+        with timed("sqlite.submissions.list"), self.pool.connection() as conn:
+            if status:
+                rows = conn.execute(_LIST_SUBMISSIONS_BY_STATUS, (status, limit, offset)).fetchall()
+            else:
+                rows = conn.execute(_LIST_SUBMISSIONS, (limit, offset)).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def _keyset(self, sql: str, clauses: List[str], params: List[Any], after: str,
+                batch_size: int, stage: str) -> Iterator[Dict]:
+        # A fresh pooled connection per batch, so a slow client downloading an
+        # export never pins a connection for the whole stream
+        cursor = None
+        while True:
+            batch_clauses = clauses + ([after] if cursor is not None else [])
+            where = f" WHERE {' AND '.join(batch_clauses)}" if batch_clauses else ""
+            batch_params = params + (list(cursor) if cursor is not None else []) + [batch_size]
+            with timed(stage), self.pool.connection() as conn:
+                rows = conn.execute(sql.format(where=where), batch_params).fetchall()
+            for row in rows:
+                yield loads(row[-1])
+            if len(rows) < batch_size:
+                return
+            cursor = rows[-1][:-1]
+
+    def iter_submissions(self, status: Optional[str] = None, fields: Optional[List[str]] = None,
+                         batch_size: int = 500) -> Iterator[Dict]:
+        # Documents are stored whole, so projection happens in the caller
+        clauses, params = ([], []) if not status else (["status = ?"], [status])
+        return self._keyset(
+            _EXPORT_SUBMISSIONS, clauses, params, "(created_at, id) < (?, ?)",
+            batch_size, "sqlite.submissions.export"
+        )
+
+    def transact_submission(self, submission_id: str,
+                            mutate: Callable[[Optional[Dict]], Optional[Dict]],
+                            fields: Optional[List[str]] = None) -> Optional[Dict]:
+        with timed("sqlite.submissions.transaction"), self.pool.transaction() as conn:
+            if fields:
+                fields, columns, paths = _extract(fields)
+                row = conn.execute(f"SELECT {columns} FROM submissions WHERE id = ?", paths + [submission_id]).fetchone()
+                current = dict(zip(fields, loads(row[0]))) if row else None
+            else:
+                row = conn.execute(_SELECT_SUBMISSION, (submission_id,)).fetchone()
+                current = loads(row[0]) if row else None
+            updates = mutate(current)
+            if updates is None or current is None:
+                return None
+
+            # json_set rewrites only the changed paths; the document is not re-serialised
+            assignments, params = [], []
+            for column in ("status", "risk_score"):
+                if column in updates:
+                    assignments.append(f"{column} = ?")
+                    params.append(_plain(updates[column]))
+            assignments.append(f"data = json_set(data, {', '.join('?, json(?)' for _ in updates)})")
+            for field, value in updates.items():
+                params.extend([f"$.{field}", dumps(value)])
+            conn.execute(f"UPDATE submissions SET {', '.join(assignments)} WHERE id = ?", params + [submission_id])
+        return dict(current, **updates)
+
+    def list_review_queue(self, limit: int = 50, after: Optional[Tuple[float, str]] = None,
+                          fields: Optional[List[str]] = None) -> List[Dict]:
+        params: List[Any] = list(after) if after is not None else []
+        after_clause = _REVIEW_QUEUE_AFTER if after is not None else ""
+        if not fields:
+            sql = _REVIEW_QUEUE.format(columns="data", after=after_clause)
+            with timed("sqlite.submissions.queue"), self.pool.connection() as conn:
+                return [loads(row[0]) for row in conn.execute(sql, params + [limit])]
+
+        fields, columns, paths = _extract(fields)
+        sql = _REVIEW_QUEUE.format(columns=columns, after=after_clause)
+        with timed("sqlite.submissions.queue"), self.pool.connection() as conn:
+            rows = conn.execute(sql, paths + params + [limit]).fetchall()
+        return [dict(zip(fields, loads(row[0]))) for row in rows]
+
+    def count_submissions(self, status: Optional[str] = None, risk_score: Optional[str] = None) -> int:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if risk_score:
+            clauses.append("risk_score = ?")
+            params.append(risk_score)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with timed("sqlite.submissions.count"), self.pool.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM submissions{where}", params).fetchone()[0]
+
+    def add_leaderboard_entry(self, entry: Dict) -> None:
+        with timed("sqlite.leaderboard.add"), self.pool.connection() as conn:
+            conn.execute(_INSERT_LEADERBOARD, (
+                entry["submission_id"],
+                entry["age_band"],
+                _plain(entry["gender"]),
+                entry["total_reps"],
+                entry["form_score"],
+                dumps(entry)
+            ))
+
+    def get_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                        limit: int = 100) -> List[Dict]:
+        clauses, params = [], []
+        if age_band:
+            clauses.append("age_band = ?")
+            params.append(age_band)
+        if gender:
+            clauses.append("gender = ?")
+            params.append(gender)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        # Served straight from the composite (age_band, gender, total_reps DESC, form_score DESC) index
+        sql = f"SELECT data FROM leaderboard{where} ORDER BY total_reps DESC, form_score DESC LIMIT ?"
+        with timed("sqlite.leaderboard.query"), self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def iter_leaderboard(self, age_band: Optional[str] = None, gender: Optional[str] = None,
+                         fields: Optional[List[str]] = None, batch_size: int = 500) -> Iterator[Dict]:
+        clauses, params = [], []
+        if age_band:
+            clauses.append("age_band = ?")
+            params.append(age_band)
+        if gender:
+            clauses.append("gender = ?")
+            params.append(gender)
+        return self._keyset(
+            _EXPORT_LEADERBOARD, clauses, params, "(total_reps, form_score, rowid) < (?, ?, ?)",
+            batch_size, "sqlite.leaderboard.export"
+        )
+
+    def get_document(self, collection: str, doc_id: str) -> Optional[Dict]:
+        with timed("sqlite.documents.get"), self.pool.connection() as conn:
+            row = conn.execute(_SELECT_DOCUMENT, (collection, doc_id)).fetchone()
+        return loads(row[0]) if row else None
+
+    def set_document(self, collection: str, doc_id: str, data: Dict) -> None:
+        with timed("sqlite.documents.set"), self.pool.connection() as conn:
+            conn.execute(_UPSERT_DOCUMENT, (collection, doc_id, dumps(data)))
+
+    def update_document(self, collection: str, doc_id: str,
+                        mutate: Callable[[Optional[Dict]], Optional[Dict]]) -> Optional[Dict]:
+        # BEGIN IMMEDIATE takes the write lock up front, so mutate runs exactly once
+        with timed("sqlite.documents.transaction"), self.pool.transaction() as conn:
+            row = conn.execute(_SELECT_DOCUMENT, (collection, doc_id)).fetchone()
+            data = mutate(loads(row[0]) if row else None)
+            if data is not None:
+                conn.execute(_UPSERT_DOCUMENT, (collection, doc_id, dumps(data)))
+        return data
+
+    def delete_document(self, collection: str, doc_id: str) -> None:
+        with timed("sqlite.documents.delete"), self.pool.connection() as conn:
+            conn.execute(_DELETE_DOCUMENT, (collection, doc_id))
+
+    def append_events(self, events: List[Dict]) -> None:
+        # One transaction per batch: a single fsync however many events it holds
+        with timed("sqlite.events.batch"), self.pool.transaction() as conn:
+            conn.executemany(_INSERT_EVENT, [
+                (event["id"], event.get("submission_id"), event["type"], _sort_key(event["at"]), dumps(event))
+                for event in events
+            ])
+
+    def list_events(self, submission_id: str) -> List[Dict]:
+        with timed("sqlite.events.list"), self.pool.connection() as conn:
+            return [loads(row[0]) for row in conn.execute(_LIST_EVENTS, (submission_id,))]
+
+    def touch_version(self, key: str) -> int:
+        version = time.time_ns()
+        with timed("sqlite.versions.set"), self.pool.connection() as conn:
+            conn.execute(_UPSERT_VERSION, (key, version))
+        return version
+
+    def get_versions(self) -> Dict[str, int]:
+        with timed("sqlite.versions.get"), self.pool.connection() as conn:
+            return dict(conn.execute(_SELECT_VERSIONS).fetchall())
+
+    def ping(self) -> bool:
+        with timed("sqlite.ping"), self.pool.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        return True
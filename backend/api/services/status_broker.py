@@ -0,0 +1,150 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from ..config import get_settings
+from .metrics import registry
+
+STATUS_SUBSCRIBERS = registry.gauge(
+    "talentspark_status_subscribers",
+    "Clients currently subscribed to submission status pushes"
+)
+STATUS_EVENTS = registry.counter(
+    "talentspark_status_events_total",
+    "Status change events published, by source",
+    ("source",)
+)
+
+def status_payload(submission_id: str, data: Dict) -> Dict:
+    """Status view of a submission document, shared by polling and push"""
+    created_at = data.get("created_at")
+    reviewed_at = data.get("reviewed_at")
+    return {
+        "submission_id": submission_id,
+        "status": data["status"],
+        "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        "reviewed_at": reviewed_at.isoformat() if isinstance(reviewed_at, datetime) else reviewed_at
+    }
+
+class StatusBroker:
+    """
+    In-process pub/sub for submission status changes.
+
+    Each subscriber gets a small bounded queue; publishers never block and
+    a slow subscriber only ever loses intermediate states, never the latest.
+    """
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bridge_watch = None
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    @asynccontextmanager
+    async def subscribe(self, submission_id: str):
+        """Register for updates on one submission for the lifetime of the block"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(submission_id, set()).add(queue)
+        STATUS_SUBSCRIBERS.inc()
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(submission_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[submission_id]
+            STATUS_SUBSCRIBERS.dec()
+
+    def subscriber_count(self, submission_id: Optional[str] = None) -> int:
+        if submission_id is not None:
+            return len(self._subscribers.get(submission_id, ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, submission_id: str, payload: Dict, source: str = "local"):
+        """Fan a status change out to subscribers; safe to call from any thread"""
+        STATUS_EVENTS.inc(source=source)
+        if submission_id not in self._subscribers or self._loop is None:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._deliver(submission_id, payload)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, submission_id, payload)
+
+    def _deliver(self, submission_id: str, payload: Dict):
+        for queue in list(self._subscribers.get(submission_id, ())):
+            if queue.full():
+                # Drop the oldest pending state; the newest one is what matters
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    def start_firestore_bridge(self, since: Optional[datetime] = None):
+        """
+        Republish status changes written by other workers or services.
+
+        Only documents reviewed since `since` (default: now) are watched, so
+        the initial snapshot is empty instead of a read of the whole
+        collection. Once the watched set reaches status_bridge_rewatch_after
+        documents the watch is restarted from the newest review seen, so a
+        reconnect never replays more than that.
+        """
+        from .db import get_firestore_client
+
+        rewatch_after = get_settings().status_bridge_rewatch_after
+        query = get_firestore_client().collection("submissions").where("reviewed_at", ">=", since or datetime.now())
+        state = {}
+
+        def on_snapshot(snapshots, changes, read_time):
+            for change in changes:
+                if change.type.name == "REMOVED":
+                    continue
+                data = change.document.to_dict()
+                reviewed_at = data.get("reviewed_at")
+                # Firestore hands every reviewed_at back timezone-aware, so these compare
+                if reviewed_at is not None and ("latest" not in state or reviewed_at > state["latest"]):
+                    state["latest"] = reviewed_at
+                self.publish(change.document.id, status_payload(change.document.id, data), source="firestore")
+
+            if len(snapshots) >= rewatch_after and "latest" in state and "watch" in state and self._loop is not None:
+                # Called on the watch's own thread, which must not unsubscribe itself
+                self._loop.call_soon_threadsafe(self._rewatch, state["watch"], state["latest"])
+
+        state["watch"] = self._bridge_watch = query.on_snapshot(on_snapshot)
+
+    def _rewatch(self, watch, since: datetime):
+        if self._bridge_watch is not watch:
+            # Already restarted, or stopped
+            return
+        watch.unsubscribe()
+        self.start_firestore_bridge(since)
+
+    def stop(self):
+        if self._bridge_watch is not None:
+            self._bridge_watch.unsubscribe()
+            self._bridge_watch = None
+
+status_broker = StatusBroker()
+
+def start_status_broker():
+    """Bind the broker to the running loop and start the optional Firestore bridge"""
+    settings = get_settings()
+    status_broker.start(asyncio.get_running_loop())
+
+    if settings.status_push_bridge == "firestore":
+        try:
+            status_broker.start_firestore_bridge()
+        except Exception as e:
+            print(f"Firestore status bridge unavailable, relying on polling fallback: {e}")
@@ -1,39 +1,60 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Optional
+import asyncio
+import hashlib
 import os
-from google.cloud import storage as gcs
-import cloudinary
-import cloudinary.uploader
+import posixpath
+import tempfile
 from ..config import get_settings
+from .metrics import timed_stage
 
-settings = get_settings()
+# In-progress writes; never served, even though they sit beside the objects
+TEMP_PREFIX = ".upload-"
+
+# Provider SDKs are imported inside each implementation so only the
+# configured provider is ever loaded
+
+def video_key(submission_id: str) -> str:
+    """Storage key of a submission's uploaded video"""
+    return f"submissions/{submission_id}/video.webm"
 
 class StorageService(ABC):
     """Abstract storage service interface"""
     
     @abstractmethod
-    async def upload_video(self, video_content: bytes, filename: str) -> str:
-        """Upload video and return URL"""
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
+        """Upload video (or derived review media) and return URL"""
         pass
     
     @abstractmethod
     async def get_video_url(self, filename: str) -> str:
         """Get video URL"""
         pass
+    
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Probe the storage backend"""
+        pass
 
 class FirebaseStorageService(StorageService):
     """Firebase Cloud Storage implementation"""
     
     def __init__(self):
+        from google.cloud import storage as gcs
+        
+        settings = get_settings()
         self.client = gcs.Client(project=settings.firebase_project_id)
         self.bucket_name = f"{settings.firebase_project_id}-videos"
         self.bucket = self.client.bucket(self.bucket_name)
     
-    async def upload_video(self, video_content: bytes, filename: str) -> str:
+    @timed_stage("storage.upload_video")
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
         """Upload video to Firebase Storage"""
         try:
             blob = self.bucket.blob(filename)
-            blob.upload_from_string(video_content, content_type='video/webm')
+            blob.upload_from_string(video_content, content_type=content_type)
             
             # Make blob publicly readable
             blob.make_public()
@@ -47,25 +68,38 @@ class FirebaseStorageService(StorageService):
         """Get Firebase Storage URL"""
         blob = self.bucket.blob(filename)
         return blob.public_url
+    
+    @timed_stage("storage.health_check")
+    async def health_check(self) -> bool:
+        """Check the videos bucket is reachable"""
+        return await asyncio.to_thread(self.bucket.exists)
 
 class CloudinaryStorageService(StorageService):
     """Cloudinary implementation"""
     
     def __init__(self):
+        import cloudinary
+        import cloudinary.api
+        import cloudinary.uploader
+        
+        self.cloudinary = cloudinary
+        settings = get_settings()
         cloudinary.config(
             cloud_name=settings.cloudinary_cloud_name,
             api_key=settings.cloudinary_api_key,
             api_secret=settings.cloudinary_api_secret
         )
     
-    async def upload_video(self, video_content: bytes, filename: str) -> str:
+    @timed_stage("storage.upload_video")
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
         """Upload video to Cloudinary"""
         try:
-            # Upload video
-            response = cloudinary.uploader.upload(
+            # Upload video (poster frames and sprite sheets go up as images)
+            response = self.cloudinary.uploader.upload(
                 video_content,
                 public_id=filename.replace('/', '_'),
-                resource_type="video",
+                resource_type="image" if content_type.startswith("image/") else "video",
                 folder="talent-spark"
             )
             
@@ -76,13 +110,143 @@ class CloudinaryStorageService(StorageService):
     
     async def get_video_url(self, filename: str) -> str:
         """Get Cloudinary URL"""
-        return cloudinary.CloudinaryVideo(filename.replace('/', '_')).build_url()
+        return self.cloudinary.CloudinaryVideo(filename.replace('/', '_')).build_url()
+    
+    @timed_stage("storage.health_check")
+    async def health_check(self) -> bool:
+        """Ping the Cloudinary admin API"""
+        response = await asyncio.to_thread(self.cloudinary.api.ping)
+        return response.get("status") == "ok"
+
+class LocalStorageService(StorageService):
+    """
+    Files on local disk, served back by the /api/media endpoint.
+
+    Objects are sharded two levels deep by a hash of their directory, so a
+    submission's video and review media sit together and no directory
+    grows without bound. Writes go to a temp file in the target directory
+    and are renamed into place, so readers never see a partial file.
+    """
+    
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None):
+        settings = get_settings()
+        self.root = os.path.abspath(root or settings.local_storage_root)
+        self.base_url = (base_url or settings.local_storage_base_url).rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+    
+    def path_for(self, filename: str) -> str:
+        """Absolute path of an object; ValueError for keys that would escape the root"""
+        key = posixpath.normpath(filename)
+        if key.startswith(("/", "../")) or key in (".", "..") or "\\" in key:
+            raise ValueError(f"Invalid storage key: {filename}")
+        digest = hashlib.blake2b(posixpath.dirname(key).encode(), digest_size=2).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:], *key.split("/"))
+    
+    def _write_atomic(self, path: str, content: bytes):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+    
+    @timed_stage("storage.upload_video")
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
+        """Write video (or review media) to local disk"""
+        try:
+            await asyncio.to_thread(self._write_atomic, self.path_for(filename), video_content)
+            return await self.get_video_url(filename)
+            
+        except Exception as e:
+            raise Exception(f"Local storage write failed: {str(e)}")
+    
+    async def get_video_url(self, filename: str) -> str:
+        """URL of the range-capable media endpoint for this object"""
+        return f"{self.base_url}/api/media/{posixpath.normpath(filename)}"
+    
+    @timed_stage("storage.health_check")
+    async def health_check(self) -> bool:
+        """Check the storage root is a writable directory"""
+        return os.path.isdir(self.root) and os.access(self.root, os.W_OK)
+
+class S3StorageService(StorageService):
+    """S3-compatible object storage (AWS S3, MinIO, R2, ...)"""
+    
+    def __init__(self, client=None):
+        settings = get_settings()
+        if client is None:
+            import boto3
+            client = boto3.client(
+                "s3",
+                endpoint_url=settings.s3_endpoint_url or None,
+                region_name=settings.s3_region or None,
+                aws_access_key_id=settings.s3_access_key_id or None,
+                aws_secret_access_key=settings.s3_secret_access_key or None
+            )
+        self.client = client
+        self.bucket = settings.s3_bucket
+        
+        if settings.s3_public_base_url:
+            self.public_base_url = settings.s3_public_base_url.rstrip("/")
+        elif settings.s3_endpoint_url:
+            # Path-style, which every S3-compatible server accepts
+            self.public_base_url = f"{settings.s3_endpoint_url.rstrip('/')}/{self.bucket}"
+        else:
+            self.public_base_url = f"https://{self.bucket}.s3.{settings.s3_region or 'us-east-1'}.amazonaws.com"
+    
+    @timed_stage("storage.upload_video")
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
+        """Upload video to the S3 bucket"""
+        try:
+            # Public reads come from the bucket policy; ACLs are disabled on new buckets
+            await asyncio.to_thread(
+                self.client.put_object,
+                Bucket=self.bucket, Key=filename, Body=video_content, ContentType=content_type
+            )
+            return await self.get_video_url(filename)
+            
+        except Exception as e:
+            raise Exception(f"S3 upload failed: {str(e)}")
+    
+    async def get_video_url(self, filename: str) -> str:
+        """Get the object's public URL"""
+        return f"{self.public_base_url}/{filename}"
+    
+    @timed_stage("storage.health_check")
+    async def health_check(self) -> bool:
+        """Check the bucket exists and is reachable"""
+        await asyncio.to_thread(self.client.head_bucket, Bucket=self.bucket)
+        return True
+
+_storage_service: Optional[StorageService] = None
 
 def get_storage_service() -> StorageService:
-    """Factory function to get storage service"""
-    if settings.storage_provider == "firebase":
-        return FirebaseStorageService()
-    elif settings.storage_provider == "cloudinary":
-        return CloudinaryStorageService()
-    else:
-        raise ValueError(f"Unsupported storage provider: {settings.storage_provider}")
+    """Factory function to get the storage service singleton"""
+    global _storage_service
+    
+    if _storage_service is None:
+        settings = get_settings()
+        if settings.storage_provider == "firebase":
+            _storage_service = FirebaseStorageService()
+        elif settings.storage_provider == "cloudinary":
+            _storage_service = CloudinaryStorageService()
+        elif settings.storage_provider == "local":
+            _storage_service = LocalStorageService()
+        elif settings.storage_provider == "s3":
+            _storage_service = S3StorageService()
+        else:
+            raise ValueError(f"Unsupported storage provider: {settings.storage_provider}")
+    
+    return _storage_service
@@ -0,0 +1,208 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import pickle
+import threading
+import time
+
+from ..config import get_settings
+from .metrics import registry
+
+CACHE_REQUESTS = registry.counter(
+    "talentspark_submission_cache_total",
+    "Submission cache lookups by projection and outcome",
+    ("projection", "result")
+)
+CACHE_EVICTIONS = registry.counter(
+    "talentspark_submission_cache_evictions_total",
+    "In-process cache entries dropped to stay within max entries"
+)
+
+FULL = "full"
+STATUS = "status"
+
+# Everything status_payload() and the SSE stream need; small enough to
+# serve polling clients without shipping the integrity bundle around
+STATUS_FIELDS = ("id", "status", "risk_score", "created_at", "reviewed_at", "updated_at")
+
+def project(submission: Dict, projection: str) -> Dict:
+    if projection == STATUS:
+        return {field: submission.get(field) for field in STATUS_FIELDS}
+    return submission
+
+class CacheBackend(ABC):
+    """Key/value store behind SubmissionCache"""
+
+    name = "cache"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        """Store a value for `ttl` seconds"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop a key if present"""
+        pass
+
+    def size(self) -> Optional[int]:
+        """Number of entries, when the backend can tell cheaply"""
+        return None
+
+class InProcessCacheBackend(CacheBackend):
+    """Bounded LRU with per-entry expiry, private to one worker process"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Shallow copy so callers can't reshape the cached document
+        return dict(value)
+
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (dict(value), time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.inc()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache for multi-worker deployments, so a decision made on one
+    worker is visible to every other worker straight away.
+    """
+
+    name = "redis"
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0", prefix: str = "talentspark:"):
+        if client is None:
+            # Optional dependency, only needed when this backend is selected
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + key)
+        # Documents hold datetimes, which JSON would not round-trip
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Dict, ttl: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                        px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+class SubmissionCache:
+    """
+    Read-through cache of submission documents keyed by submission ID.
+
+    Filled on create, written through on decision and otherwise bounded by
+    TTL, so a stale entry can outlive a write made elsewhere for at most
+    `ttl` seconds when the in-process backend is used with several workers.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 30.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, submission_id: str, projection: str) -> str:
+        return f"submission:{projection}:{submission_id}"
+
+    def get(self, submission_id: str, loader: Callable[[str], Optional[Dict]],
+            projection: str = FULL) -> Optional[Dict]:
+        """Return the projected document, calling `loader` on a miss"""
+        try:
+            cached = self.backend.get(self._key(submission_id, projection))
+        except Exception as e:
+            print(f"Submission cache read failed: {e}")
+            cached = None
+
+        if cached is not None:
+            self.hits += 1
+            CACHE_REQUESTS.inc(projection=projection, result="hit")
+            return cached
+
+        self.misses += 1
+        CACHE_REQUESTS.inc(projection=projection, result="miss")
+        submission = loader(submission_id)
+        if submission is None:
+            return None
+        self.put(submission)
+        return project(submission, projection)
+
+    def put(self, submission: Dict) -> None:
+        """Store every projection of a document that was just written or read"""
+        try:
+            for projection in (FULL, STATUS):
+                self.backend.set(self._key(submission["id"], projection), project(submission, projection), self.ttl)
+        except Exception as e:
+            # The cache is an optimisation; a broken backend must not fail the request
+            print(f"Submission cache write failed: {e}")
+
+    def invalidate(self, submission_id: str) -> None:
+        try:
+            for projection in (FULL, STATUS):
+                self.backend.delete(self._key(submission_id, projection))
+        except Exception as e:
+            print(f"Submission cache invalidation failed: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+# Global cache instance
+_submission_cache = None
+
+def get_submission_cache() -> SubmissionCache:
+    """Get the configured submission cache"""
+    global _submission_cache
+
+    if _submission_cache is None:
+        settings = get_settings()
+
+        if settings.submission_cache_backend == "redis":
+            backend = RedisCacheBackend(url=settings.redis_url)
+        elif settings.submission_cache_backend == "memory":
+            backend = InProcessCacheBackend(settings.submission_cache_max_entries)
+        else:
+            raise ValueError(f"Unsupported submission cache backend: {settings.submission_cache_backend}")
+
+        _submission_cache = SubmissionCache(backend, settings.submission_cache_ttl)
+
+    return _submission_cache
@@ -1,14 +1,11 @@
 import hashlib
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import base64
-from io import BytesIO
-from PIL import Image
-import cv2
-import numpy as np
 
+from ..config import get_settings
 from ..models.schemas import IntegrityBundle, RiskLevel
+from .metrics import timed_stage
 
 class IntegrityVerifier:
     """Handles integrity verification of submissions"""
@@ -17,6 +14,8 @@ class IntegrityVerifier:
         self.max_face_gap_seconds = 30
         self.min_face_confidence = 0.7
         self.max_timestamp_drift = 5000  # milliseconds
+        self.max_profiles_per_device = get_settings().shared_device_max_profiles
+        self.max_profiles_per_model = get_settings().shared_model_max_profiles
     
     async def verify_bundle(self, bundle: IntegrityBundle, video_content: bytes) -> Dict:
         """
@@ -33,6 +32,7 @@ class IntegrityVerifier:
         
         return verification_result
     
+    @timed_stage("verify.content_hash")
     async def verify_content_hash(self, bundle: IntegrityBundle, video_content: bytes) -> bool:
         """Verify content hash matches video and assessment data"""
         try:
@@ -52,6 +52,7 @@ class IntegrityVerifier:
             print(f"Hash verification failed: {e}")
             return False
     
+    @timed_stage("verify.timestamps")
     def verify_timestamps(self, bundle: IntegrityBundle) -> bool:
         """Verify timestamp consistency"""
         try:
@@ -76,6 +77,7 @@ class IntegrityVerifier:
             print(f"Timestamp verification failed: {e}")
             return False
     
+    @timed_stage("verify.face_continuity")
     def verify_face_continuity(self, bundle: IntegrityBundle) -> bool:
         """Verify face snapshots show continuity"""
         try:
@@ -102,6 +104,7 @@ class IntegrityVerifier:
             print(f"Face continuity verification failed: {e}")
             return False
     
+    @timed_stage("verify.video_metrics")
     async def verify_video_metrics(self, bundle: IntegrityBundle, video_content: bytes) -> bool:
         """Verify video metrics match actual video"""
         try:
@@ -110,7 +113,9 @@ class IntegrityVerifier:
             with open(temp_path, 'wb') as f:
                 f.write(video_content)
             
-            # Analyze with OpenCV
+            # Analyze with OpenCV (imported here to keep it off the startup path)
+            import cv2
+            
             cap = cv2.VideoCapture(temp_path)
             
             if not cap.isOpened():
@@ -141,6 +146,7 @@ class IntegrityVerifier:
             print(f"Video metrics verification failed: {e}")
             return False
     
+    @timed_stage("verify.device_info")
     def verify_device_info(self, bundle: IntegrityBundle) -> bool:
         """Verify device info is consistent and realistic"""
         try:
@@ -163,6 +169,7 @@ class IntegrityVerifier:
             print(f"Device info verification failed: {e}")
             return False
     
+    @timed_stage("verify.session_integrity")
     def verify_session_integrity(self, bundle: IntegrityBundle) -> bool:
         """Verify overall session makes sense"""
         try:
@@ -187,8 +194,14 @@ class IntegrityVerifier:
             print(f"Session integrity verification failed: {e}")
             return False
     
-    def calculate_risk_score(self, verification_result: Dict, bundle: IntegrityBundle) -> Tuple[RiskLevel, List[str]]:
-        """Calculate overall risk score and flags"""
+    @timed_stage("verify.risk_score")
+    def calculate_risk_score(self, verification_result: Dict, bundle: IntegrityBundle,
+                             history_flags: Optional[Dict[str, float]] = None,
+                             device_sighting: Optional[Dict] = None) -> Tuple[RiskLevel, List[str]]:
+        """
+        Calculate overall risk score and flags. history_flags come from
+        history.anomaly_flags(), device_sighting from fingerprint.record_sighting().
+        """
         flags = []
         risk_points = 0
         
@@ -230,6 +243,24 @@ class IntegrityVerifier:
             flags.append("Unusually fast rep time")
             risk_points += 1
         
+        # Sudden jump against this athlete's or device's own history
+        if history_flags:
+            flags.extend(history_flags)
+            risk_points += 2
+        
+        # One install feeding many accounts, or - with a much higher bar, since
+        # identical phones collide - many accounts on one phone model, which is
+        # what's left to see when the install ID is dropped or rotated
+        if device_sighting:
+            shared_flags = []
+            if not device_sighting.get("coarse") and device_sighting["profiles"] > self.max_profiles_per_device:
+                shared_flags.append("Device shared across many profiles")
+            if device_sighting.get("model_profiles", 0) > self.max_profiles_per_model:
+                shared_flags.append("Device model shared across many profiles")
+            if shared_flags:
+                flags.extend(shared_flags)
+                risk_points += 2
+        
         # Determine risk level
         if risk_points >= 5:
             risk_level = RiskLevel.RED
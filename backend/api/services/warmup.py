@@ -0,0 +1,63 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Tuple
+
+from ..config import get_settings
+from .repository import get_repository
+from .scoring import ScoreCalculator
+from .storage import get_storage_service
+
+def _warm_repository():
+    # Creates the database client/connection pool and pays the first round trip
+    get_repository().ping()
+
+def _warm_storage():
+    get_storage_service()
+
+def _warm_scoring():
+    ScoreCalculator()
+
+def _warm_video_probe():
+    # OpenCV is the heaviest import on the upload path; load it and its
+    # FFmpeg backend now rather than inside the first submission
+    import cv2
+    cv2.VideoCapture()
+
+def _warm_media_pipeline():
+    # Spawning workers and importing OpenCV in each takes seconds
+    from .media import get_media_pipeline
+    if get_settings().media_pipeline_enabled:
+        get_media_pipeline().warm()
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("repository", _warm_repository),
+    ("storage", _warm_storage),
+    ("scoring", _warm_scoring),
+    ("video_probe", _warm_video_probe),
+    ("media_pipeline", _warm_media_pipeline),
+]
+
+async def _run_step(name: str, step: Callable[[], None]) -> Tuple[str, Dict]:
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(step)
+        result = {"status": "ok"}
+    except Exception as e:
+        print(f"Warm-up step {name} failed: {e}")
+        result = {"status": "error", "error": str(e)}
+    result["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return name, result
+
+async def prewarm() -> Dict:
+    """Initialise clients and caches before the app reports ready"""
+    settings = get_settings()
+    if not settings.prewarm_on_startup:
+        return {"enabled": False, "steps": {}, "total_ms": 0.0}
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_run_step(name, step) for name, step in WARMUP_STEPS))
+    return {
+        "enabled": True,
+        "steps": dict(results),
+        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
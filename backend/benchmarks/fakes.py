@@ -0,0 +1,448 @@
+"""
+In-memory stand-ins for Firestore, StorageService, S3 and Redis so
+benchmarks and load tests can exercise the API without any external services.
+
+Only the subset of the Firestore client API used by the backend is
+implemented: collections, documents, get/set/update/add, where,
+order_by, limit, offset, select, start_after, stream, count
+aggregations, write batches and (serialised) transactions.
+"""
+import copy
+import io
+import itertools
+import tempfile
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.services.repository import FirestoreRepository, Repository
+from api.services.storage import LocalStorageService, S3StorageService, StorageService
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "array_contains": lambda a, b: isinstance(a, list) and b in a,
+}
+
+def _get_field(data: Dict, path: str) -> Any:
+    value = data
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def _order_value(doc_id: str, data: Dict, field: str) -> Any:
+    # "__name__" is FieldPath.document_id(): order by the document ID
+    return doc_id if field == "__name__" else _get_field(data, field)
+
+def _project(data: Dict, paths: List[str]) -> Dict:
+    projected: Dict = {}
+    for path in paths:
+        value = _get_field(data, path)
+        if value is None:
+            continue
+        target = projected
+        *parents, leaf = path.split(".")
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = value
+    return projected
+
+def _encode(value: Any) -> Any:
+    """Store values the way Firestore would hand them back (enums become plain strings)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference: "FakeDocumentReference", data: Optional[Dict]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return _get_field(self._data or {}, field)
+
+class FakeDocumentReference:
+    def __init__(self, client: "FakeFirestoreClient", collection: str, doc_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self._collection}/{self.id}"
+
+    def get(self, field_paths: Optional[List[str]] = None,
+            transaction: Optional["FakeTransaction"] = None) -> FakeDocumentSnapshot:
+        self._client.reads += 1
+        with self._client.lock:
+            data = self._client.store.get(self._collection, {}).get(self.id)
+        if data is not None and field_paths is not None:
+            data = _project(data, field_paths)
+        return FakeDocumentSnapshot(self, copy.deepcopy(data))
+
+    def set(self, data: Dict, merge: bool = False):
+        self._client.writes += 1
+        with self._client.lock:
+            docs = self._client.store.setdefault(self._collection, {})
+            if merge and self.id in docs:
+                docs[self.id].update(_encode(data))
+            else:
+                docs[self.id] = _encode(data)
+
+    def update(self, data: Dict):
+        self._client.writes += 1
+        with self._client.lock:
+            docs = self._client.store.setdefault(self._collection, {})
+            if self.id not in docs:
+                raise KeyError(f"No document to update: {self.path}")
+            docs[self.id].update(_encode(data))
+
+    def delete(self):
+        self._client.writes += 1
+        with self._client.lock:
+            self._client.store.get(self._collection, {}).pop(self.id, None)
+
+class FakeTransaction:
+    """Writes apply immediately; isolation comes from holding the client lock"""
+
+    def set(self, reference: FakeDocumentReference, data: Dict, merge: bool = False):
+        reference.set(data, merge=merge)
+
+    def update(self, reference: FakeDocumentReference, data: Dict):
+        reference.update(data)
+
+    def delete(self, reference: FakeDocumentReference):
+        reference.delete()
+
+class FakeWriteBatch:
+    """Queues writes and applies them together on commit"""
+
+    def __init__(self, client: "FakeFirestoreClient"):
+        self._client = client
+        self._writes: List[Tuple[FakeDocumentReference, Dict, bool]] = []
+
+    def set(self, reference: FakeDocumentReference, data: Dict, merge: bool = False):
+        self._writes.append((reference, data, merge))
+
+    def commit(self):
+        with self._client.lock:
+            for reference, data, merge in self._writes:
+                reference.set(data, merge=merge)
+        self._writes = []
+
+class FakeQuery:
+    def __init__(self, client: "FakeFirestoreClient", collections: List[str],
+                 filters: Tuple = (), orders: Tuple = (), limit_count: Optional[int] = None,
+                 offset_count: int = 0, projection: Optional[List[str]] = None,
+                 after: Optional[Any] = None):
+        self._client = client
+        self._collections = collections
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit_count
+        self._offset = offset_count
+        self._projection = projection
+        self._after = after
+
+    def _copy(self, **changes) -> "FakeQuery":
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit_count": self._limit,
+            "offset_count": self._offset,
+            "projection": self._projection,
+            "after": self._after,
+        }
+        state.update(changes)
+        return FakeQuery(self._client, self._collections, **state)
+
+    def where(self, field: str, op: str, value: Any) -> "FakeQuery":
+        return self._copy(filters=self._filters + ((field, _OPERATORS[op], value),))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return self._copy(orders=self._orders + ((field, direction == "DESCENDING"),))
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit_count=count)
+
+    def offset(self, count: int) -> "FakeQuery":
+        return self._copy(offset_count=count)
+
+    def select(self, field_paths: List[str]) -> "FakeQuery":
+        return self._copy(projection=list(field_paths))
+
+    def start_after(self, cursor) -> "FakeQuery":
+        if isinstance(cursor, dict):
+            # Order-by values to resume after, "__name__" as a reference or an ID
+            return self._copy(after={
+                field: getattr(value, "id", value) if field == "__name__" else value
+                for field, value in cursor.items()
+            })
+        # Resumes after the snapshot's position in the current ordering, which
+        # matches Firestore as long as that document is not modified mid-scan
+        return self._copy(after=cursor.reference.path)
+
+    def _past_cursor(self, doc_id: str, data: Dict) -> bool:
+        for field, descending in self._orders:
+            value, bound = _order_value(doc_id, data, field), self._after[field]
+            if value != bound:
+                return value < bound if descending else value > bound
+        return False
+
+    def stream(self):
+        with self._client.lock:
+            rows = [
+                (collection, doc_id, copy.deepcopy(data))
+                for collection in self._collections
+                for doc_id, data in self._client.store.get(collection, {}).items()
+            ]
+
+        rows = [
+            row for row in rows
+            if all(op(_get_field(row[2], field), value) for field, op, value in self._filters)
+        ]
+        # Apply sort keys last-to-first so earlier order_by calls take precedence
+        for field, descending in reversed(self._orders):
+            rows = [row for row in rows if _order_value(row[1], row[2], field) is not None]
+            rows.sort(key=lambda row: _order_value(row[1], row[2], field), reverse=descending)
+
+        if isinstance(self._after, dict):
+            rows = [row for row in rows if self._past_cursor(row[1], row[2])]
+        elif self._after is not None:
+            paths = [f"{collection}/{doc_id}" for collection, doc_id, _ in rows]
+            rows = rows[paths.index(self._after) + 1:] if self._after in paths else []
+
+        end = self._offset + self._limit if self._limit is not None else None
+        for collection, doc_id, data in itertools.islice(rows, self._offset, end):
+            self._client.reads += 1
+            reference = FakeDocumentReference(self._client, collection, doc_id)
+            if self._projection is not None:
+                data = _project(data, self._projection)
+            yield FakeDocumentSnapshot(reference, data)
+
+    def get(self) -> List[FakeDocumentSnapshot]:
+        return list(self.stream())
+
+    def count(self) -> "FakeAggregationQuery":
+        return FakeAggregationQuery(self)
+
+class FakeAggregationResult:
+    def __init__(self, value: int):
+        self.alias = "count"
+        self.value = value
+
+class FakeAggregationQuery:
+    def __init__(self, query: FakeQuery):
+        self._query = query
+
+    def get(self) -> List[List[FakeAggregationResult]]:
+        return [[FakeAggregationResult(sum(1 for _ in self._query.stream()))]]
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client: "FakeFirestoreClient", name: str):
+        super().__init__(client, [name])
+        self.id = name
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentReference:
+        if doc_id is None:
+            doc_id = self._client.next_id()
+        return FakeDocumentReference(self._client, self.id, doc_id)
+
+    def add(self, data: Dict) -> Tuple[None, FakeDocumentReference]:
+        reference = self.document()
+        reference.set(data)
+        return None, reference
+
+class FakeFirestoreClient:
+    """Thread-safe dict-backed substitute for google.cloud.firestore.Client"""
+
+    def __init__(self):
+        self.store: Dict[str, Dict[str, Dict]] = {}
+        self.lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> str:
+        return f"doc{next(self._ids):012d}"
+
+    def collection(self, name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, name)
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction()
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def collection_group(self, name: str) -> FakeQuery:
+        # Firestore matches collections whose ID is exactly `name`
+        return FakeQuery(self, [name])
+
+class FakeFirestoreRepository(FirestoreRepository):
+    """FirestoreRepository whose transactions run under the fake client's lock"""
+
+    def _run_transaction(self, body: Callable):
+        with self.db.lock:
+            return body(self.db.transaction())
+
+class FakeStorageService(StorageService):
+    """Keeps uploaded objects in memory and hands back memory:// URLs"""
+
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self.content_types: Dict[str, str] = {}
+
+    async def upload_video(self, video_content: bytes, filename: str,
+                           content_type: str = "video/webm") -> str:
+        self.objects[filename] = bytes(video_content)
+        self.content_types[filename] = content_type
+        return await self.get_video_url(filename)
+
+    async def get_video_url(self, filename: str) -> str:
+        return f"memory://videos/{filename}"
+
+    async def health_check(self) -> bool:
+        return True
+
+class FakeRedisClient:
+    """The get/set(px=...)/delete subset of redis.Redis used by RedisCacheBackend"""
+
+    def __init__(self):
+        self.store: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self.reads += 1
+            entry = self.store.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.store[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None):
+        with self._lock:
+            self.writes += 1
+            expires_at = time.monotonic() + px / 1000 if px else float("inf")
+            self.store[key] = (bytes(value), expires_at)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self.store.pop(key, None) is not None for key in keys)
+
+class FakeS3Error(Exception):
+    pass
+
+class FakeS3Client:
+    """The put_object/get_object/head_bucket subset of a boto3 S3 client"""
+
+    def __init__(self, buckets: Tuple[str, ...] = ("talent-spark-videos",)):
+        self.buckets: Dict[str, Dict[str, Tuple[bytes, str]]] = {bucket: {} for bucket in buckets}
+        self._lock = threading.Lock()
+
+    def _bucket(self, name: str) -> Dict[str, Tuple[bytes, str]]:
+        if name not in self.buckets:
+            raise FakeS3Error(f"NoSuchBucket: {name}")
+        return self.buckets[name]
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str = "binary/octet-stream", **kwargs):
+        with self._lock:
+            self._bucket(Bucket)[Key] = (bytes(Body), ContentType)
+        return {"ETag": f'"{hash(Body) & 0xffffffff:08x}"'}
+
+    def get_object(self, Bucket: str, Key: str, Range: Optional[str] = None, **kwargs):
+        with self._lock:
+            if Key not in self._bucket(Bucket):
+                raise FakeS3Error(f"NoSuchKey: {Key}")
+            body, content_type = self._bucket(Bucket)[Key]
+        if Range:
+            start, _, end = Range[len("bytes="):].partition("-")
+            body = body[int(start):int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(body), "ContentType": content_type, "ContentLength": len(body)}
+
+    def head_bucket(self, Bucket: str, **kwargs):
+        self._bucket(Bucket)
+        return {}
+
+def install_fakes(backend: str = "firestore", sqlite_path: str = ":memory:",
+                  cache: str = "memory", storage: str = "memory") -> Tuple[Repository, StorageService]:
+    """
+    Point the API at fresh offline backends and return (repository, storage).
+
+    backend="firestore" runs the Firestore repository against FakeFirestoreClient;
+    backend="sqlite" uses the real SQLite repository at `sqlite_path`.
+    cache="memory" uses the in-process submission cache, cache="redis" the
+    shared backend over FakeRedisClient. storage="memory" keeps uploads in
+    FakeStorageService, storage="local" writes them to a temporary directory
+    and storage="s3" goes through S3StorageService over FakeS3Client.
+    The event log spools to a fresh temporary directory.
+    """
+    from api.config import get_settings
+    from api.services import db as db_module
+    from api.services import repository as repository_module
+    from api.services import storage as storage_module
+    from api.services import submission_cache as cache_module
+    from api.services import event_log as event_log_module
+
+    if backend == "firestore":
+        db_module._firestore_client = FakeFirestoreClient()
+        repository = FakeFirestoreRepository()
+    elif backend == "sqlite":
+        from api.services.sqlite_repository import SQLiteRepository
+        repository = SQLiteRepository(sqlite_path)
+    else:
+        raise ValueError(f"Unknown benchmark backend: {backend}")
+
+    if cache == "memory":
+        cache_backend = cache_module.InProcessCacheBackend(get_settings().submission_cache_max_entries)
+    elif cache == "redis":
+        cache_backend = cache_module.RedisCacheBackend(client=FakeRedisClient())
+    else:
+        raise ValueError(f"Unknown benchmark cache: {cache}")
+
+    if storage == "memory":
+        storage_service = FakeStorageService()
+    elif storage == "local":
+        storage_service = LocalStorageService(root=tempfile.mkdtemp(prefix="talentspark-media-"))
+    elif storage == "s3":
+        storage_service = S3StorageService(client=FakeS3Client((get_settings().s3_bucket,)))
+    else:
+        raise ValueError(f"Unknown benchmark storage: {storage}")
+    repository_module._repository = repository
+    storage_module._storage_service = storage_service
+    cache_module._submission_cache = cache_module.SubmissionCache(cache_backend, get_settings().submission_cache_ttl)
+    settings = get_settings()
+    event_log_module._event_log = event_log_module.EventLog(
+        tempfile.mkdtemp(prefix="talentspark-events-"),
+        settings.event_flush_batch_size,
+        settings.event_flush_interval
+    )
+
+    return repository, storage_service
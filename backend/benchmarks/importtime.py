@@ -0,0 +1,73 @@
+"""
+Import-time report for the API process, built from `python -X importtime`.
+
+    cd backend
+    python -m benchmarks.importtime [--top 25] [--module api.main]
+
+Runs the import in a fresh interpreter so nothing is already cached in
+sys.modules, then lists the slowest modules by cumulative time along with
+the total time to a ready app (import plus lifespan warm-up).
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+_READY_SNIPPET = """
+import asyncio, time
+start = time.perf_counter()
+import {module} as target
+imported = time.perf_counter()
+async def _ready():
+    async with target.app.router.lifespan_context(target.app):
+        pass
+asyncio.run(_ready())
+print(f"@@ import_ms={{(imported - start) * 1000:.1f}} ready_ms={{(time.perf_counter() - start) * 1000:.1f}}")
+"""
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Keep the leading indentation of the name: it encodes nesting depth
+        rows.append((name[1:], int(self_us), int(cumulative_us)))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Talent Spark import-time report")
+    parser.add_argument("--module", default="api.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--no-warmup", action="store_true", help="Measure imports only, skip the lifespan hook")
+    args = parser.parse_args()
+
+    code = f"import {args.module}" if args.no_warmup else _READY_SNIPPET.format(module=args.module)
+    env = dict(os.environ)
+    if args.no_warmup:
+        env["PREWARM_ON_STARTUP"] = "false"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:], file=sys.stderr)
+        sys.exit(completed.returncode)
+
+    rows = parse_importtime(completed.stderr)
+    top_level = {name.strip(): cumulative for name, _, cumulative in rows if not name.startswith(" ")}
+
+    print(f"{'module':<48}{'self ms':>10}{'cumulative ms':>16}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name.strip()[:47]:<48}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+
+    print(f"\ntop-level imports: {sum(top_level.values()) / 1000:.1f} ms across {len(top_level)} modules")
+    for line in completed.stdout.splitlines():
+        if line.startswith("@@ "):
+            print(line[3:])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+End-to-end concurrent load driver against the ASGI app with offline
+database (fake Firestore or SQLite) and storage (in-memory, local disk or
+fake S3) backends.
+
+    cd backend
+    python -m benchmarks.loadtest --requests 200 --concurrency 16 --mix upload=1,status=4,leaderboard=2
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from .fakes import install_fakes
+from .synthetic import build_bundle, generate_video
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def _parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+class LoadDriver:
+    """Issues a weighted mix of API calls with bounded concurrency"""
+
+    def __init__(self, client: httpx.AsyncClient, video_duration: int, seed: int):
+        self.client = client
+        self.rng = random.Random(seed)
+        self.video_content, self.content_type = generate_video(duration=video_duration)
+        self.video_duration = video_duration
+        self.submission_ids: List[str] = []
+        self.video_urls: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def upload(self) -> httpx.Response:
+        bundle = build_bundle(self.video_content, duration=self.video_duration,
+                              reps=self.rng.randint(5, 40), seed=self.rng.random())
+        response = await self.client.post(
+            "/api/submissions",
+            files={"video": ("assessment.webm", self.video_content, self.content_type)},
+            data={"integrity_bundle": bundle.json()},
+        )
+        if response.status_code == 200:
+            self.submission_ids.append(response.json()["submission_id"])
+            self.video_urls.append(response.json()["upload_url"])
+        return response
+
+    async def status(self) -> httpx.Response:
+        if not self.submission_ids:
+            return await self.upload()
+        submission_id = self.rng.choice(self.submission_ids)
+        return await self.client.get(f"/api/submissions/{submission_id}/status")
+
+    async def decision(self) -> httpx.Response:
+        if not self.submission_ids:
+            return await self.upload()
+        submission_id = self.rng.choice(self.submission_ids)
+        return await self.client.post(
+            f"/api/submissions/{submission_id}/decision",
+            json={"decision": "approved", "notes": "load test"},
+        )
+
+    async def leaderboard(self) -> httpx.Response:
+        age_band = self.rng.choice(["13-15", "16-18", "19-25", "26-35"])
+        gender = self.rng.choice(["male", "female"])
+        return await self.client.get("/api/leaderboard", params={"age_band": age_band, "gender": gender})
+
+    async def video(self) -> httpx.Response:
+        # Seek-style ranged read through /api/media; needs --storage local
+        if not self.video_urls:
+            return await self.upload()
+        start = self.rng.randrange(len(self.video_content))
+        return await self.client.get(
+            httpx.URL(self.rng.choice(self.video_urls)).path,
+            headers={"Range": f"bytes={start}-{start + 65535}"}
+        )
+
+    async def benchmark(self) -> httpx.Response:
+        return await self.client.get(f"/api/benchmark/{self.rng.randint(13, 35)}/male/{self.rng.randint(5, 50)}")
+
+    async def run(self, total: int, concurrency: int, weights: Dict[str, int]) -> float:
+        operations = list(weights)
+        plan = self.rng.choices(operations, weights=[weights[op] for op in operations], k=total)
+        # Always start with an upload so read paths have something to hit
+        plan.insert(0, "upload")
+        queue: asyncio.Queue = asyncio.Queue()
+        for op in plan:
+            queue.put_nowait(op)
+
+        async def worker():
+            while not queue.empty():
+                op = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    response = await getattr(self, op)()
+                    if response.status_code >= 400:
+                        self.errors[f"{op}:{response.status_code}"] += 1
+                except Exception as e:
+                    self.errors[f"{op}:{type(e).__name__}"] += 1
+                self.latencies[op].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> Dict:
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        per_operation = {
+            op: {
+                "count": len(samples),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+                "p99_ms": round(_percentile(samples, 99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+            }
+            for op, samples in sorted(self.latencies.items())
+        }
+        return {
+            "requests": len(all_samples),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(all_samples) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(_percentile(all_samples, 50) * 1000, 2),
+            "p99_ms": round(_percentile(all_samples, 99) * 1000, 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "errors": dict(self.errors),
+            "operations": per_operation,
+        }
+
+async def run_load_test(total: int, concurrency: int, mix: str, video_duration: int, seed: int,
+                        backend: str = "firestore", cache: str = "memory", storage: str = "memory") -> Dict:
+    from api.main import app
+    from api.services.submission_cache import get_submission_cache
+
+    install_fakes(backend, cache=cache, storage=storage)
+    transport = httpx.ASGITransport(app=app)
+    # Run the app's lifespan so warm-up happens outside the measured window
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            driver = LoadDriver(client, video_duration, seed)
+            elapsed = await driver.run(total, concurrency, _parse_mix(mix))
+    report = driver.report(elapsed)
+    report["submission_cache"] = get_submission_cache().stats()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Talent Spark end-to-end load driver")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="upload=1,status=4,leaderboard=2,benchmark=2,decision=1")
+    parser.add_argument("--video-duration", type=int, default=10, help="Seconds of synthetic video per upload")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["firestore", "sqlite"], default="firestore")
+    parser.add_argument("--cache", choices=["memory", "redis"], default="memory")
+    parser.add_argument("--storage", choices=["memory", "local", "s3"], default="memory")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(
+        args.requests, args.concurrency, args.mix, args.video_duration, args.seed, args.backend, args.cache, args.storage
+    ))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"requests:    {report['requests']} in {report['elapsed_s']}s")
+    print(f"throughput:  {report['throughput_rps']} req/s")
+    print(f"latency:     p50 {report['p50_ms']} ms, p99 {report['p99_ms']} ms")
+    print(f"peak RSS:    {report['peak_rss_mb']} MB")
+    print(f"cache:       hit rate {report['submission_cache']['hit_rate']:.1%} "
+          f"({report['submission_cache']['hits']} hits, {report['submission_cache']['misses']} misses)")
+    if report["errors"]:
+        print(f"errors:      {report['errors']}")
+    print(f"\n{'operation':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for op, stats in report["operations"].items():
+        print(f"{op:<14}{stats['count']:>8}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['mean_ms']:>10}")
+
+if __name__ == "__main__":
+    main()
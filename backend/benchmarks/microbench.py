@@ -0,0 +1,211 @@
+"""
+Microbenchmarks for the scoring, verification, leaderboard and submission
+read hot paths.
+
+    cd backend
+    python -m benchmarks.microbench [--iterations 2000] [--filter verify] [--backend sqlite] [--cache redis]
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from .fakes import install_fakes
+from .synthetic import build_submission
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def bench(name: str, func: Callable, iterations: int, warmup: int = 10) -> Dict:
+    """Time `func` per call and return summary statistics in microseconds"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    return {
+        "name": name,
+        "iterations": iterations,
+        "mean_us": statistics.fmean(samples),
+        "p50_us": _percentile(samples, 50),
+        "p99_us": _percentile(samples, 99),
+        "ops_per_sec": 1e6 / statistics.fmean(samples) if samples else 0.0,
+    }
+
+def _request(path: str = "/") -> "Request":
+    from starlette.requests import Request
+    return Request({"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""})
+
+def build_cases(iterations: int, backend: str = "firestore", cache: str = "memory") -> List[tuple]:
+    """Return (name, callable, iterations) for every benchmark"""
+    from api.routes import decisions, submissions
+    from api.models.schemas import LeaderboardWindow
+    from api.services.submission_cache import get_submission_cache, STATUS
+    from api.services.history import load_histories, anomaly_flags, record_submission
+    from api.services.fingerprint import record_sighting
+    from api.services.event_log import get_event_log, SUBMISSION_VERIFIED, SUBMISSION_DECIDED
+    from api.services.review import face_timeline
+    from api.services.review_queue import queue_fields, claim_next, release
+    from api.services.media import render_review_media, rep_offsets, media_options
+    from api.services.export import stream_export, LEADERBOARD_FIELDS, DEFAULT_LEADERBOARD_FIELDS
+    from api.services.scoring import ScoreCalculator
+    from api.services.verify import IntegrityVerifier
+
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+
+    video_content, _, bundle = build_submission(duration=10, reps=20, seed=7)
+    verifier = IntegrityVerifier()
+    result = run(verifier.verify_bundle(bundle, video_content))
+    calculator = ScoreCalculator()
+    assessment = bundle.assessment_data.dict()
+    profile = {"age": 20, "gender": "male", "height": 170, "weight": 65}
+
+    # Seed a leaderboard with a realistic number of approved entries; the
+    # profile goes through JSON so enums look as they would coming from Firestore
+    repository, _ = install_fakes(backend, cache=cache)
+    seed_doc = {
+        "id": "sub_0_seed00",
+        "profile_data": json.loads(bundle.profile_data.json()),
+        "assessment_data": assessment,
+        "created_at": datetime.now(),
+    }
+
+    def project_approval(doc):
+        # What the event log runs for an approval's SUBMISSION_DECIDED event
+        return decisions.apply_decision(repository, {
+            "submission_id": doc["id"],
+            "data": {"leaderboard_entry": decisions.leaderboard_entry_for(doc)},
+        })
+
+    for i in range(1000):
+        seed_doc["id"] = f"sub_{i}_{i:06d}"
+        seed_doc["assessment_data"] = dict(assessment, total_reps=i % 60, form_score=float(i % 100))
+        project_approval(seed_doc)
+    age_band = decisions.get_age_band(bundle.profile_data.age)
+    gender = bundle.profile_data.gender
+    
+    submission_doc = dict(seed_doc, id="sub_cache_000001", status="pending", risk_score="green",
+                          risk_flags=[], video_url="memory://videos/bench.webm",
+                          integrity_bundle=json.loads(bundle.json()), verification_result=result,
+                          face_timeline=face_timeline(bundle.face_snapshots, None, 30000, 0.7))
+    repository.create_submission(submission_doc)
+    # Target of the event log cases, so their events don't pile onto submission_doc's audit trail
+    repository.create_submission(dict(submission_doc, id="sub_events_000001"))
+    for i in range(200):
+        risk = ("green", "yellow", "red")[i % 3]
+        repository.create_submission(dict(
+            submission_doc, id=f"sub_queue_{i:06d}", risk_score=risk,
+            **queue_fields(risk, datetime.now(), result, [])
+        ))
+    submission_cache = get_submission_cache()
+    history_keys = ["athlete:bench", "device:bench"]
+    for _ in range(5):
+        record_submission(repository, history_keys, assessment, datetime.now())
+    submission_cache.put(submission_doc)
+    
+    offsets = rep_offsets(assessment["timestamps"], bundle.video_metrics.duration)
+    fd, video_path = tempfile.mkstemp(prefix="talentspark-bench-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(video_content)
+    atexit.register(os.remove, video_path)
+    
+    def export_leaderboard():
+        rows = repository.iter_leaderboard(age_band, gender.value, fields=DEFAULT_LEADERBOARD_FIELDS)
+        for _ in stream_export(rows, DEFAULT_LEADERBOARD_FIELDS, LEADERBOARD_FIELDS, "ndjson", "leaderboard"):
+            pass
+    
+    event_log = get_event_log()
+    rejection = {"decision": "rejected", "update": {"status": "rejected"}, "leaderboard_entry": None}
+    
+    def flush_decisions():
+        # One background flush of 50 buffered decisions: batch append plus projections
+        for _ in range(50):
+            event_log.append(SUBMISSION_DECIDED, "sub_events_000001", rejection)
+        run(event_log.flush(repository))
+    
+    def claim_and_release():
+        claimed = claim_next(repository, "bench")
+        release(repository, claimed["id"], claimed["lease"]["token"])
+    
+    def cache_miss():
+        submission_cache.invalidate(submission_doc["id"])
+        return submission_cache.get(submission_doc["id"], repository.get_submission)
+
+    slow = max(5, iterations // 20)
+    return [
+        ("scoring.compare_performance", lambda: calculator.compare_performance(33, profile), iterations),
+        ("scoring.composite_score", lambda: calculator.calculate_composite_score(assessment), iterations),
+        ("scoring.init", ScoreCalculator, iterations),
+        ("verify.content_hash", lambda: run(verifier.verify_content_hash(bundle, video_content)), iterations),
+        ("verify.timestamps", lambda: verifier.verify_timestamps(bundle), iterations),
+        ("verify.face_continuity", lambda: verifier.verify_face_continuity(bundle), iterations),
+        ("verify.video_metrics", lambda: run(verifier.verify_video_metrics(bundle, video_content)), slow),
+        ("verify.device_info", lambda: verifier.verify_device_info(bundle), iterations),
+        ("verify.session_integrity", lambda: verifier.verify_session_integrity(bundle), iterations),
+        ("verify.risk_score", lambda: verifier.calculate_risk_score(result, bundle), iterations),
+        ("history.anomaly_check",
+         lambda: anomaly_flags(load_histories(repository, history_keys), assessment), iterations),
+        ("history.record", lambda: record_submission(repository, history_keys, assessment, datetime.now()), slow),
+        ("fingerprint.record_sighting", lambda: record_sighting(repository, bundle, datetime.now()), slow),
+        ("verify.bundle", lambda: run(verifier.verify_bundle(bundle, video_content)), slow),
+        ("events.append",
+         lambda: event_log.append(SUBMISSION_VERIFIED, "sub_events_000001", {"risk_score": "green"}), iterations),
+        ("events.flush_decisions", flush_decisions, slow),
+        ("leaderboard.project_approval", lambda: project_approval(seed_doc), slow),
+        ("leaderboard.get_top100",
+         lambda: run(decisions.get_leaderboard(_request("/api/leaderboard"), age_band, gender, 100)), slow),
+        ("leaderboard.get_weekly",
+         lambda: run(decisions.get_leaderboard(_request("/api/leaderboard"), age_band, gender, 100,
+                                               LeaderboardWindow.WEEKLY)), slow),
+        ("submission.repository_get", lambda: repository.get_submission(submission_doc["id"]), iterations),
+        ("submission.cache_hit_full",
+         lambda: submission_cache.get(submission_doc["id"], repository.get_submission), iterations),
+        ("submission.cache_hit_status",
+         lambda: submission_cache.get(submission_doc["id"], repository.get_submission, STATUS), iterations),
+        ("submission.cache_miss", cache_miss, iterations),
+        ("review.face_timeline", lambda: face_timeline(bundle.face_snapshots, None, 30000, 0.7), iterations),
+        ("review_queue.claim_release", claim_and_release, slow),
+        ("review.bundle",
+         lambda: run(submissions.get_review_bundle(submission_doc["id"], _request())), slow),
+        ("export.leaderboard_ndjson", export_leaderboard, slow),
+        # In-process here; the API runs this in the media worker pool
+        ("media.render_review_media",
+         lambda: render_review_media(video_path, offsets, bundle.video_metrics.fps, media_options()),
+         max(3, iterations // 200)),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Talent Spark backend microbenchmarks")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--backend", choices=["firestore", "sqlite"], default="firestore",
+                        help="Repository under test: fake Firestore or an in-memory SQLite database")
+    parser.add_argument("--cache", choices=["memory", "redis"], default="memory",
+                        help="Submission cache backend: in-process LRU or Redis (faked)")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<32}{'iters':>8}{'mean us':>12}{'p50 us':>12}{'p99 us':>12}{'ops/s':>12}")
+    for name, func, iterations in build_cases(args.iterations, args.backend, args.cache):
+        if args.filter not in name:
+            continue
+        stats = bench(name, func, iterations)
+        print(
+            f"{name:<32}{stats['iterations']:>8}{stats['mean_us']:>12.1f}"
+            f"{stats['p50_us']:>12.1f}{stats['p99_us']:>12.1f}{stats['ops_per_sec']:>12.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic assessment generator: renders a short video with OpenCV's
+VideoWriter and builds a matching IntegrityBundle whose content hash,
+video metrics and timestamps all pass verification.
+"""
+import base64
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+from api.models.schemas import IntegrityBundle
+
+# (fourcc, extension, content type); VP8 may be missing from some OpenCV builds
+_CODECS = {
+    "webm": ("VP80", ".webm", "video/webm"),
+    "mp4": ("mp4v", ".mp4", "video/mp4"),
+}
+
+def generate_video(duration: int = 10, fps: int = 15, resolution: Tuple[int, int] = (320, 240),
+                   container: str = "webm") -> Tuple[bytes, str]:
+    """Render a moving-block test video and return (bytes, content_type)"""
+    fourcc, extension, content_type = _CODECS[container]
+    width, height = resolution
+
+    fd, path = tempfile.mkstemp(suffix=extension)
+    os.close(fd)
+    try:
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"OpenCV cannot encode {container} ({fourcc}) on this system")
+
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        block = max(8, height // 6)
+        for i in range(duration * fps):
+            frame[:] = (32, 32, 32)
+            # Vertical bob approximates a squat rep every two seconds
+            y = int((height - block) * (0.5 + 0.4 * np.sin(i / fps * np.pi)))
+            x = (i * 3) % (width - block)
+            frame[y:y + block, x:x + block] = (40, 200, 120)
+            writer.write(frame)
+        writer.release()
+
+        with open(path, "rb") as f:
+            return f.read(), content_type
+    finally:
+        os.remove(path)
+
+def _snapshot_image(size: int = 48) -> str:
+    image = np.full((size, size, 3), 180, dtype=np.uint8)
+    cv2.circle(image, (size // 2, size // 2), size // 3, (90, 120, 200), -1)
+    ok, encoded = cv2.imencode(".jpg", image)
+    return base64.b64encode(encoded.tobytes()).decode()
+
+def compute_content_hash(video_size: int, assessment_data: Dict, session_id: str, timestamp: int) -> str:
+    """Mirror IntegrityVerifier.verify_content_hash"""
+    combined_data = json.dumps({
+        "videoSize": video_size,
+        "assessmentData": assessment_data,
+        "sessionId": session_id,
+        "timestamp": timestamp
+    }, sort_keys=True)
+    return hashlib.sha256(combined_data.encode()).hexdigest()
+
+def build_bundle(video_content: bytes, duration: int = 10, fps: int = 15,
+                 resolution: Tuple[int, int] = (320, 240), reps: int = 20,
+                 seed: int = None) -> IntegrityBundle:
+    """Build a bundle that passes every integrity check for the given video"""
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    session_id = f"ts_{now_ms}_{rng.randrange(16 ** 8):08x}"
+
+    start_ms = now_ms - duration * 1000
+    rep_interval = duration * 1000 // max(reps, 1)
+    assessment_data = {
+        "total_reps": reps,
+        "average_depth": round(rng.uniform(60, 90), 1),
+        "form_score": round(rng.uniform(70, 95), 1),
+        "average_rep_time": max(1000, rep_interval),
+        "consistency": round(rng.uniform(70, 95), 1),
+        "timestamps": [start_ms + i * rep_interval for i in range(reps)],
+    }
+
+    image = _snapshot_image()
+    face_snapshots = [
+        {"timestamp": start_ms + t * 1000, "image_data": image, "confidence": round(rng.uniform(0.8, 0.99), 2)}
+        for t in range(0, duration + 1, 5)
+    ]
+
+    bundle = {
+        "session_id": session_id,
+        "profile_data": {
+            "age": rng.randint(13, 35),
+            "gender": rng.choice(["male", "female"]),
+            "height": rng.randint(150, 195),
+            "weight": rng.randint(45, 95),
+        },
+        "device_info": {
+            # Distinct per bundle so load tests look like many devices to the rate limiter
+            "user_agent": f"Mozilla/5.0 (Linux; Android 13; SYN-{rng.randrange(10 ** 6):06d}) Synthetic/1.0",
+            "platform": "Linux armv8l",
+            "timestamp": now_ms,
+            "timezone": "Asia/Kolkata",
+            "screen_resolution": "1080x2400",
+        },
+        "face_snapshots": face_snapshots,
+        "video_metrics": {
+            "duration": duration,
+            "fps": fps,
+            "resolution": f"{resolution[0]}x{resolution[1]}",
+            "file_size": len(video_content),
+        },
+        "assessment_data": assessment_data,
+        "content_hash": "",
+        "version": "1.0",
+    }
+
+    parsed = IntegrityBundle(**bundle)
+    bundle["content_hash"] = compute_content_hash(
+        len(video_content), parsed.assessment_data.dict(), session_id, now_ms
+    )
+    return IntegrityBundle(**bundle)
+
+def build_submission(duration: int = 10, fps: int = 15, resolution: Tuple[int, int] = (320, 240),
+                     container: str = "webm", reps: int = 20, seed: int = None) -> Tuple[bytes, str, IntegrityBundle]:
+    """Return (video bytes, content type, bundle) ready for POST /api/submissions"""
+    video_content, content_type = generate_video(duration, fps, resolution, container)
+    bundle = build_bundle(video_content, duration, fps, resolution, reps, seed)
+    return video_content, content_type, bundle
@@ -0,0 +1,78 @@
+"""
+Shared fixtures. Every test runs against the in-memory fakes from
+benchmarks/fakes.py (or a throwaway SQLite file), so no Firestore,
+object storage or network access is needed.
+
+    cd backend
+    python -m pytest
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.config import get_settings
+from api.services.admission import get_admission_controller, get_upload_rate_limiter
+from api.services.review_queue import queue_fields
+from benchmarks.fakes import install_fakes
+
+VERIFICATION = {
+    "content_hash_valid": True,
+    "timestamp_consistent": True,
+    "face_continuity_valid": True,
+    "video_metrics_valid": True,
+    "device_info_consistent": True,
+    "session_integrity_valid": True,
+}
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+    # No media worker processes in tests
+    monkeypatch.setattr(settings, "media_pipeline_enabled", False)
+    get_upload_rate_limiter.cache_clear()
+    get_admission_controller.cache_clear()
+    return settings
+
+@pytest.fixture(params=["firestore", "sqlite"])
+def backend(request, settings, tmp_path):
+    """Each test using this runs once per repository implementation"""
+    repository, storage = install_fakes(request.param, sqlite_path=str(tmp_path / "talent_spark.db"))
+    return repository
+
+@pytest.fixture
+def repository(backend):
+    return backend
+
+@pytest.fixture
+def client(backend):
+    # Not entered as a context manager, so the lifespan (and its pre-warming) never runs
+    from api.main import app
+    return TestClient(app)
+
+@pytest.fixture
+def make_submission(repository):
+    """Store a pending submission document directly and return it"""
+    def make(submission_id: str, **overrides) -> dict:
+        created_at = overrides.pop("created_at", datetime.now())
+        risk_score = overrides.get("risk_score", "green")
+        doc = {
+            "id": submission_id,
+            "profile_data": {"age": 20, "gender": "male", "height": 175, "weight": 70},
+            "assessment_data": {
+                "total_reps": 30, "average_depth": 80.0, "form_score": 85.0,
+                "average_rep_time": 1500, "consistency": 90.0, "timestamps": [1000, 2500, 4000]
+            },
+            "video_url": f"memory://videos/submissions/{submission_id}/video.webm",
+            "risk_score": risk_score,
+            "risk_flags": [],
+            "status": "pending",
+            "created_at": created_at,
+            "updated_at": created_at,
+            "verification_result": dict(VERIFICATION),
+            **queue_fields(risk_score, created_at, VERIFICATION, []),
+        }
+        doc.update(overrides)
+        repository.create_submission(doc)
+        return doc
+    return make
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import api.routes.decisions  # noqa: F401  registers the leaderboard projection
+from api.routes.decisions import leaderboard_entry_for
+from api.services.event_log import EventLog, SUBMISSION_DECIDED, get_counters
+
+def _decided(log, submission_id, reps=30):
+    entry = leaderboard_entry_for({
+        "id": submission_id,
+        "profile_data": {"age": 20, "gender": "male"},
+        "assessment_data": {"total_reps": reps, "form_score": 85.0},
+        "created_at": datetime(2026, 1, 1),
+    })
+    return log.append(SUBMISSION_DECIDED, submission_id, {"decision": "approved", "leaderboard_entry": entry})
+
+class RecordingRepository:
+    """Counts batch commits per event, optionally holding each one open for `delay` seconds"""
+
+    def __init__(self, inner, delay: float = 0.0):
+        self.inner = inner
+        self.delay = delay
+        self.committed = []
+        self.started = threading.Event()
+
+    def append_events(self, events):
+        self.started.set()
+        time.sleep(self.delay)
+        self.committed.extend(event["id"] for event in events)
+        self.inner.append_events(events)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+def test_flush_projects_and_counts(repository, tmp_path):
+    log = EventLog(str(tmp_path / "spool"))
+    event = _decided(log, "sub_log_000001")
+    assert log.buffered("sub_log_000001") == [event]
+
+    asyncio.run(log.flush(repository))
+
+    assert [e["id"] for e in repository.list_events("sub_log_000001")][0] == event["id"]
+    assert [e["total_reps"] for e in repository.get_leaderboard("19-25", "male")] == [30]
+    counters = get_counters(repository)
+    assert counters["submission_decided"] == 1
+    assert counters["submission_decided_approved"] == 1
+    assert log.stats()["buffered"] == 0
+
+def test_orphaned_spool_replays_without_double_counting(repository, tmp_path):
+    spool_dir = str(tmp_path / "spool")
+    crashed = EventLog(spool_dir)
+    events = [_decided(crashed, f"sub_log_00001{i}") for i in range(3)]
+    asyncio.run(crashed.flush(repository))
+    # Crash after the commit but before the spool was cleared
+    crashed.spool.rewrite(events)
+    crashed.spool.close()
+
+    restarted = EventLog(spool_dir)
+    restarted._recover()
+    assert restarted.stats()["buffered"] == 3
+    asyncio.run(restarted.flush(repository))
+
+    counters = get_counters(repository)
+    assert counters["submission_decided"] == 3
+    assert len(repository.get_leaderboard()) == 3
+    assert counters["leaderboard_updated"] == 3
+    assert restarted.stats()["buffered"] == 0
+
+def test_stop_mid_commit_commits_the_batch_once(repository, tmp_path):
+    slow = RecordingRepository(repository, delay=0.3)
+    log = EventLog(str(tmp_path / "spool"), batch_size=1, interval=60)
+
+    async def scenario():
+        log.start(lambda: slow)
+        event = _decided(log, "sub_log_000020")  # a full batch wakes the flusher
+        await asyncio.to_thread(slow.started.wait, 5)
+        await log.stop(slow)
+        return event
+
+    event = asyncio.run(scenario())
+    assert slow.committed.count(event["id"]) == 1
+    assert log.stats()["buffered"] == 0
+    assert get_counters(repository)["submission_decided"] == 1
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from api.routes.decisions import leaderboard_entry_for
+
+# (submission id, age, gender, reps, form score), deliberately spread over several boards
+RESULTS = [
+    ("sub_export_0001", 20, "male", 30, 85.0),
+    ("sub_export_0002", 14, "female", 42, 70.0),
+    ("sub_export_0003", 40, "male", 42, 90.0),
+    ("sub_export_0004", 22, "female", 12, 60.0),
+    ("sub_export_0005", 17, "male", 30, 95.0),
+]
+RANKED = ["sub_export_0003", "sub_export_0002", "sub_export_0005", "sub_export_0001", "sub_export_0004"]
+
+@pytest.fixture
+def leaderboard(repository):
+    for submission_id, age, gender, reps, form_score in RESULTS:
+        repository.add_leaderboard_entry(leaderboard_entry_for({
+            "id": submission_id,
+            "profile_data": {"age": age, "gender": gender},
+            "assessment_data": {"total_reps": reps, "form_score": form_score},
+            "created_at": datetime(2026, 1, 1),
+        }))
+
+def _user(submission_id):
+    return f"user_{submission_id[-8:]}"
+
+def test_unfiltered_leaderboard_merges_every_board(client, leaderboard):
+    entries = client.get("/api/leaderboard").json()
+    assert [entry["user_id"] for entry in entries] == [_user(s) for s in RANKED]
+
+    top = client.get("/api/leaderboard?limit=2").json()
+    assert [entry["user_id"] for entry in top] == [_user(s) for s in RANKED[:2]]
+
+    male = client.get("/api/leaderboard?gender=male").json()
+    assert [entry["user_id"] for entry in male] == [
+        _user("sub_export_0003"), _user("sub_export_0005"), _user("sub_export_0001")
+    ]
+
+def test_unfiltered_export_ndjson(client, leaderboard):
+    response = client.get("/api/exports/leaderboard?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [row["submission_id"] for row in rows] == RANKED
+
+def test_unfiltered_export_csv_with_fields(client, leaderboard):
+    response = client.get("/api/exports/leaderboard?format=csv&fields=submission_id,total_reps")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["submission_id"] for row in rows] == RANKED
+    assert set(rows[0]) == {"submission_id", "total_reps"}
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_unfiltered_export_columnar(client, leaderboard, format):
+    pyarrow = pytest.importorskip("pyarrow")
+    response = client.get(f"/api/exports/leaderboard?format={format}")
+    assert response.status_code == 200
+    if format == "parquet":
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(io.BytesIO(response.content))
+    else:
+        table = pyarrow.ipc.open_stream(response.content).read_all()
+    assert table.column("submission_id").to_pylist() == RANKED
+
+def test_export_rejects_unknown_field(client):
+    assert client.get("/api/exports/leaderboard?fields=user_id,password").status_code == 400
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from api.services.fingerprint import device_fingerprint, record_sighting
+from api.services.history import history_keys
+from api.services.verify import IntegrityVerifier
+from benchmarks.synthetic import build_bundle
+
+SAME_MODEL = {
+    "user_agent": "Mozilla/5.0 (Linux; Android 14; SM-A155F) Chrome/124.0.6367.82 Mobile",
+    "platform": "Linux armv8l",
+    "timezone": "Asia/Kolkata",
+    "screen_resolution": "1080x2340",
+}
+SHARED_FLAG = "Device shared across many profiles"
+PASSED = {check: True for check in (
+    "content_hash_valid", "timestamp_consistent", "face_continuity_valid",
+    "video_metrics_valid", "device_info_consistent", "session_integrity_valid",
+)}
+
+def _bundle(seed: int, athlete_id=None, age=None):
+    bundle = build_bundle(b"video", seed=seed)
+    device_info = type(bundle.device_info)(**dict(bundle.device_info.dict(), **SAME_MODEL))
+    update = {"athlete_id": athlete_id, "device_info": device_info}
+    if age is not None:
+        update["profile_data"] = bundle.profile_data.copy(update={"age": age})
+    return bundle.copy(update=update)
+
+def _risk_flags(bundle, sighting):
+    return IntegrityVerifier().calculate_risk_score(PASSED, bundle, None, sighting)[1]
+
+def test_distinct_installs_of_one_model_are_not_flagged(settings, repository):
+    installs = [_bundle(i, f"ath_{i}") for i in range(settings.shared_device_max_profiles + 3)]
+    sightings = [record_sighting(repository, bundle, datetime.now()) for bundle in installs]
+
+    assert len({sighting["fingerprint"] for sighting in sightings}) == len(installs)
+    assert all(sighting["profiles"] == 1 for sighting in sightings)
+    assert all(SHARED_FLAG not in _risk_flags(b, s) for b, s in zip(installs, sightings))
+
+def test_one_install_cycling_profiles_is_flagged(settings, repository):
+    profiles = [_bundle(i, "ath_shared", age=14 + i) for i in range(settings.shared_device_max_profiles + 1)]
+    sightings = [record_sighting(repository, bundle, datetime.now()) for bundle in profiles]
+
+    assert sightings[-1]["profiles"] == len(profiles)
+    assert SHARED_FLAG in _risk_flags(profiles[-1], sightings[-1])
+
+MODEL_FLAG = "Device model shared across many profiles"
+
+def test_identical_phones_below_the_model_threshold_are_not_flagged(settings, repository):
+    clients = [_bundle(i, age=14 + i) for i in range(settings.shared_device_max_profiles + 2)]
+    sightings = [record_sighting(repository, bundle, datetime.now()) for bundle in clients]
+
+    assert sightings[-1]["coarse"] and sightings[-1]["model_profiles"] == len(clients)
+    flags = _risk_flags(clients[-1], sightings[-1])
+    assert SHARED_FLAG not in flags and MODEL_FLAG not in flags
+
+def test_farming_without_install_ids_is_flagged(settings, monkeypatch, repository):
+    monkeypatch.setattr(settings, "shared_model_max_profiles", 6)
+    accounts = [_bundle(i, age=14 + i) for i in range(7)]
+    sightings = [record_sighting(repository, bundle, datetime.now()) for bundle in accounts]
+
+    assert MODEL_FLAG not in _risk_flags(accounts[5], sightings[5])
+    assert MODEL_FLAG in _risk_flags(accounts[-1], sightings[-1])
+
+def test_farming_with_rotated_install_ids_is_flagged(settings, monkeypatch, repository):
+    # Clearing local storage between accounts: every install entry stays at one profile
+    monkeypatch.setattr(settings, "shared_model_max_profiles", 6)
+    accounts = [_bundle(i, f"ath_rotated_{i}") for i in range(7)]
+    sightings = [record_sighting(repository, bundle, datetime.now()) for bundle in accounts]
+
+    assert all(sighting["profiles"] == 1 for sighting in sightings)
+    assert sightings[-1]["model_profiles"] == 7
+    assert MODEL_FLAG in _risk_flags(accounts[-1], sightings[-1])
+
+def test_history_keeps_installs_apart():
+    first, second, anonymous = _bundle(1, "ath_1"), _bundle(2, "ath_2"), _bundle(3)
+    assert history_keys(first) == ["athlete:ath_1"]
+    assert history_keys(second) == ["athlete:ath_2"]
+    assert history_keys(anonymous) == [f"device:{device_fingerprint(anonymous.device_info)}"]
@@ -0,0 +1,78 @@
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.services.history import (
+    _fold, _ring_values, std, anomaly_flags, record_submission, MIN_STD, HISTORY_COLLECTION
+)
+
+START = datetime(2026, 4, 1, 9)
+
+def _assessment(total_reps=30, form_score=80.0, average_rep_time=1500.0):
+    return {"total_reps": total_reps, "form_score": form_score, "average_rep_time": average_rep_time}
+
+def _history(*assessments, capacity=20):
+    history = None
+    for i, assessment in enumerate(assessments):
+        history = _fold(history, assessment, START + timedelta(days=i), 0.3, capacity)
+    return history
+
+def test_running_stats_match_statistics():
+    reps = [28, 31, 35, 30, 26, 40, 33]
+    history = _history(*(_assessment(total_reps=r) for r in reps))
+    stats = history["metrics"]["total_reps"]
+
+    assert stats["count"] == len(reps) == history["count"]
+    assert stats["mean"] == pytest.approx(statistics.mean(reps))
+    assert std(stats) == pytest.approx(statistics.stdev(reps))
+    assert (stats["min"], stats["max"], stats["last"]) == (26, 40, 33)
+
+    ewma = reps[0]
+    for value in reps[1:]:
+        ewma = 0.3 * value + 0.7 * ewma
+    assert stats["ewma"] == pytest.approx(ewma)
+    assert (history["first_at"], history["updated_at"]) == (START, START + timedelta(days=6))
+
+def test_ring_values_are_oldest_first_after_wrapping():
+    history = _history(*(_assessment(total_reps=r) for r in range(1, 7)), capacity=4)
+    assert _ring_values(history["recent"]["total_reps"], 6) == [3, 4, 5, 6]
+
+    short = _history(_assessment(total_reps=7), _assessment(total_reps=9), capacity=4)
+    assert _ring_values(short["recent"]["total_reps"], 2) == [7, 9]
+    assert _ring_values(None, 0) == []
+
+def test_steady_history_uses_the_std_floor():
+    history = _history(*[_assessment()] * 5)
+    assert std(history["metrics"]["total_reps"]) == 0.0
+    histories = {"athlete:a1": history}
+
+    # 2.5 floored std-devs up: not enough
+    assert anomaly_flags(histories, _assessment(total_reps=30 + 2.5 * MIN_STD["total_reps"])) == {}
+    assert anomaly_flags(histories, _assessment(total_reps=37)) == {"Rep count far above athlete history": 3.5}
+
+def test_only_suspicious_directions_are_flagged():
+    histories = {"device:d1": _history(*[_assessment()] * 5)}
+
+    # Fewer reps, worse form and slower reps are a bad day, not a red flag
+    assert anomaly_flags(histories, _assessment(total_reps=10, form_score=40.0, average_rep_time=3000.0)) == {}
+    assert anomaly_flags(histories, _assessment(average_rep_time=600.0)) == {"Rep time far below device history": -6.0}
+    assert anomaly_flags(histories, _assessment(form_score=100.0)) == {"Form score far above device history": 4.0}
+
+def test_short_history_flags_nothing():
+    histories = {"athlete:a1": _history(_assessment(), _assessment()), "device:d1": None}
+    assert anomaly_flags(histories, _assessment(total_reps=90)) == {}
+
+def test_progress_route(client, repository):
+    for i, reps in enumerate([28, 30, 32]):
+        record_submission(repository, ["athlete:ath_0001"], _assessment(total_reps=reps), START + timedelta(days=i))
+    assert repository.get_document(HISTORY_COLLECTION, "athlete:ath_0001")["key"] == "athlete:ath_0001"
+
+    response = client.get("/api/athletes/ath_0001/progress")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["athlete_id"] == "ath_0001" and body["submissions"] == 3
+    reps = body["metrics"]["total_reps"]
+    assert (reps["mean"], reps["std"], reps["last"], reps["recent"]) == (30.0, 2.0, 32, [28, 30, 32])
+
+    assert client.get("/api/athletes/ath_unknown/progress").status_code == 404
@@ -0,0 +1,68 @@
+import asyncio
+
+from api.services.event_log import get_event_log
+
+def _approve(client, repository, submission_id):
+    response = client.post(f"/api/submissions/{submission_id}/decision", json={"decision": "approved"})
+    assert response.status_code == 200
+    # Leaderboards follow on the event log's next flush
+    asyncio.run(get_event_log().flush(repository))
+
+def test_submission_revalidates_with_304(client, make_submission):
+    make_submission("sub_etag_000001")
+
+    first = client.get("/api/submissions/sub_etag_000001")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = client.get("/api/submissions/sub_etag_000001", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+    client.post("/api/submissions/sub_etag_000001/decision", json={"decision": "rejected"})
+    changed = client.get("/api/submissions/sub_etag_000001", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["status"] == "rejected"
+
+def test_leaderboard_etag_changes_on_approval(client, repository, make_submission):
+    make_submission("sub_etag_000002")
+    paths = ["/api/leaderboard", "/api/leaderboard?age_band=19-25&gender=male", "/api/leaderboard?window=weekly"]
+    etags = {path: client.get(path).headers["etag"] for path in paths}
+    for path, etag in etags.items():
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    _approve(client, repository, "sub_etag_000002")
+
+    for path, etag in etags.items():
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200, path
+    for path in paths[:2]:
+        assert [entry["total_reps"] for entry in client.get(path).json()] == [30], path
+
+def test_versions_are_one_key_per_leaderboard(client, repository, make_submission):
+    make_submission("sub_etag_000003")
+    _approve(client, repository, "sub_etag_000003")
+
+    versions = repository.get_versions()
+    assert set(versions) == {"submissions", "leaderboard_19-25_male"}
+
+def test_admin_stats_revalidate(client, make_submission):
+    make_submission("sub_etag_000004")
+    first = client.get("/api/admin/stats")
+    assert first.json()["pending_reviews"] == 1
+    assert client.get("/api/admin/stats", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    client.post("/api/submissions/sub_etag_000004/decision", json={"decision": "approved"})
+    changed = client.get("/api/admin/stats", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.json()["pending_reviews"] == 0
+
+def test_benchmark_is_publicly_cacheable(client):
+    response = client.get("/api/benchmark/20/male/30")
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    assert client.get("/api/benchmark/20/male/30",
+                      headers={"If-None-Match": response.headers["etag"]}).status_code == 304
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+from api.routes.decisions import leaderboard_entry_for
+from api.services.leaderboard_windows import (
+    window_bounds, record_approval, get_window_entries, compact, bucket_id, ROLLUP_COLLECTION, INDEX_DOC
+)
+
+def _entry(submission_id, reps, approved_at, form_score=80.0, submitted_at=None):
+    return leaderboard_entry_for({
+        "id": submission_id,
+        "profile_data": {"age": 20, "gender": "male"},
+        "assessment_data": {"total_reps": reps, "form_score": form_score},
+        "created_at": submitted_at or approved_at - timedelta(hours=1),
+        "reviewed_at": approved_at,
+    })
+
+def _ids(entries):
+    return [entry["submission_id"] for entry in entries]
+
+def test_daily_and_weekly_bounds_across_the_year_end():
+    assert window_bounds("daily", datetime(2025, 12, 31, 23, 59)) == (
+        "daily:2025-12-31", datetime(2025, 12, 31), datetime(2026, 1, 1)
+    )
+    # 1 January 2026 is a Thursday, so its ISO week starts in December
+    assert window_bounds("weekly", datetime(2026, 1, 1, 12)) == (
+        "weekly:2026-W01", datetime(2025, 12, 29), datetime(2026, 1, 5)
+    )
+    assert window_bounds("weekly", datetime(2027, 1, 1)) == (
+        "weekly:2026-W53", datetime(2026, 12, 28), datetime(2027, 1, 4)
+    )
+
+def test_season_bounds_with_a_late_season_start(settings, monkeypatch):
+    monkeypatch.setattr(settings, "season_start_month", 9)
+    monkeypatch.setattr(settings, "season_length_months", 3)
+    # Seasons start in September, December, March and June
+    assert window_bounds("season", datetime(2026, 2, 15)) == (
+        "season:2025-12", datetime(2025, 12, 1), datetime(2026, 3, 1)
+    )
+    assert window_bounds("season", datetime(2026, 9, 1))[0] == "season:2026-09"
+
+    monkeypatch.setattr(settings, "season_start_month", 4)
+    monkeypatch.setattr(settings, "season_length_months", 6)
+    assert window_bounds("season", datetime(2026, 1, 10)) == (
+        "season:2025-10", datetime(2025, 10, 1), datetime(2026, 4, 1)
+    )
+
+def test_windows_follow_the_approval_not_the_upload(repository):
+    # Uploaded just before midnight, approved the next morning
+    record_approval(repository, _entry("sub_window_0001", 30, datetime(2026, 1, 2, 8),
+                                       submitted_at=datetime(2026, 1, 1, 23, 50)))
+
+    assert _ids(get_window_entries(repository, "daily:2026-01-02", None, None, 10)) == ["sub_window_0001"]
+    assert get_window_entries(repository, "daily:2026-01-01", None, None, 10) == []
+
+def test_top_k_cutoff_and_reapproval(repository, settings, monkeypatch):
+    monkeypatch.setattr(settings, "leaderboard_window_top_k", 2)
+    at = datetime(2026, 3, 4, 12)
+    key = "daily:2026-03-04"
+
+    record_approval(repository, _entry("sub_window_0001", 30, at))
+    record_approval(repository, _entry("sub_window_0002", 40, at))
+    # Below the cutoff of a full board, so the document is not rewritten
+    record_approval(repository, _entry("sub_window_0003", 20, at))
+    assert _ids(get_window_entries(repository, key, None, None, 10)) == ["sub_window_0002", "sub_window_0001"]
+
+    # Ties on reps fall back to form score
+    record_approval(repository, _entry("sub_window_0004", 30, at, form_score=90.0))
+    assert _ids(get_window_entries(repository, key, None, None, 10)) == ["sub_window_0002", "sub_window_0004"]
+
+    # Re-approving replaces the submission's row instead of adding a second one
+    record_approval(repository, _entry("sub_window_0004", 50, at, form_score=90.0))
+    entries = get_window_entries(repository, key, "19-25", "male", 10)
+    assert _ids(entries) == ["sub_window_0004", "sub_window_0002"]
+    assert entries[0]["total_reps"] == 50
+
+def test_compaction_removes_only_expired_windows(repository, settings, monkeypatch):
+    monkeypatch.setattr(settings, "leaderboard_window_retention_days", 30)
+    record_approval(repository, _entry("sub_window_0001", 30, datetime(2026, 1, 5, 12)))
+    record_approval(repository, _entry("sub_window_0002", 30, datetime(2026, 3, 1, 12)))
+
+    result = compact(repository, now=datetime(2026, 3, 2))
+
+    assert result["expired_windows"] == ["daily:2026-01-05", "weekly:2026-W02"]
+    # Four filter buckets per window
+    assert result["deleted_documents"] == 8
+    assert repository.get_document(ROLLUP_COLLECTION, bucket_id("daily:2026-01-05", None, None)) is None
+    assert _ids(get_window_entries(repository, "daily:2026-03-01", None, None, 10)) == ["sub_window_0002"]
+    # The season that started in January is still within retention
+    assert _ids(get_window_entries(repository, "season:2026-01", None, None, 10)) == [
+        "sub_window_0001", "sub_window_0002"
+    ]
+    windows = repository.get_document(ROLLUP_COLLECTION, INDEX_DOC)["windows"]
+    assert "daily:2026-01-05" not in windows and "daily:2026-03-01" in windows
+
+def test_windowed_leaderboard_route(client, repository):
+    now = datetime.now()
+    record_approval(repository, _entry("sub_window_0001", 30, now))
+    record_approval(repository, _entry("sub_window_0002", 40, datetime(2024, 1, 2, 8)))
+
+    today = client.get("/api/leaderboard?window=daily").json()
+    assert [entry["user_id"] for entry in today] == ["user_dow_0001"]
+    assert client.get("/api/leaderboard?window=weekly&gender=male&age_band=19-25").json() == today
+
+    past = client.get("/api/leaderboard?window=daily&day=2024-01-02").json()
+    assert [entry["user_id"] for entry in past] == ["user_dow_0002"]
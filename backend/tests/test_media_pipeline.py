@@ -0,0 +1,105 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.services.media import MediaPipeline, MEDIA_JOBS
+from benchmarks.synthetic import generate_video
+
+@pytest.fixture
+def pipeline(tmp_path):
+    pipeline = MediaPipeline(workers=1, max_pending=2, spool_dir=str(tmp_path))
+    # Threads instead of spawned processes keep the tests fast; the job code is the same
+    pipeline._executor = ThreadPoolExecutor(max_workers=1)
+    yield pipeline
+    pipeline.shutdown()
+
+def test_full_pipeline_defers(pipeline):
+    deferred = MEDIA_JOBS.value(result="deferred")
+    first, second = pipeline.reserve(), pipeline.reserve()
+    assert first is not None and second is not None
+    assert pipeline.reserve() is None
+    assert MEDIA_JOBS.value(result="deferred") == deferred + 1
+
+    first.release()
+    first.release()  # only counted once
+    assert pipeline.pending == 1
+    assert pipeline.reserve() is not None
+
+def test_job_renders_from_a_spooled_file(pipeline, repository, make_submission, tmp_path):
+    make_submission("sub_media_000001")
+    video, _ = generate_video(duration=2, fps=10, container="mp4")
+
+    async def scenario():
+        task = await pipeline.schedule(pipeline.reserve(), "sub_media_000001", video, [500, 1500], 2, 10)
+        return await task
+
+    media = asyncio.run(scenario())
+    assert media["status"] == "ready", media
+    assert repository.get_submission("sub_media_000001")["media"]["poster_url"] == media["poster_url"]
+    # The spooled copy is gone and the slot is free again
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("talentspark-media-")]
+    assert pipeline.pending == 0
+
+def test_failure_to_record_is_counted_not_raised(pipeline, repository, tmp_path):
+    unrecorded = MEDIA_JOBS.value(result="unrecorded")
+    missing = str(tmp_path / "missing.webm")
+
+    async def scenario():
+        # Neither the video nor the submission exist
+        task = await pipeline.schedule(pipeline.reserve(), "sub_media_gone", b"", [], 2, 10, stored_path=missing)
+        return await task
+
+    media = asyncio.run(scenario())
+    assert media["status"] == "failed"
+    assert MEDIA_JOBS.value(result="unrecorded") == unrecorded + 1
+    assert pipeline.pending == 0
+
+async def _settle(pipeline):
+    """Wait for the sweep, drain and render tasks, including those they start"""
+    while pipeline._tasks:
+        await asyncio.gather(*list(pipeline._tasks), return_exceptions=True)
+
+def test_deferred_media_renders_once_a_slot_frees(pipeline, repository, make_submission, tmp_path, monkeypatch):
+    from api.services import storage as storage_module
+    from api.services.storage import LocalStorageService, video_key
+
+    storage = LocalStorageService(root=str(tmp_path / "storage"))
+    monkeypatch.setattr(storage_module, "_storage_service", storage)
+    video, _ = generate_video(duration=2, fps=10, container="mp4")
+    asyncio.run(storage.upload_video(video, video_key("sub_media_000002")))
+    make_submission("sub_media_000002", media={"status": "deferred"},
+                    integrity_bundle={"video_metrics": {"duration": 2, "fps": 10}})
+
+    async def scenario():
+        held = [pipeline.reserve(), pipeline.reserve()]
+        pipeline.start(lambda: repository)
+        await _settle(pipeline)
+        # Still full, so the sweep only queued it
+        assert repository.get_submission("sub_media_000002")["media"]["status"] == "deferred"
+        held[0].release()
+        await _settle(pipeline)
+        held[1].release()
+
+    asyncio.run(scenario())
+    assert repository.get_submission("sub_media_000002")["media"]["status"] == "ready"
+    assert pipeline.pending == 0
+
+def test_startup_sweep_renders_media_left_pending(pipeline, repository, make_submission, tmp_path):
+    video, _ = generate_video(duration=2, fps=10, container="mp4")
+    source = tmp_path / "upload.mp4"
+    source.write_bytes(video)
+    # A job cancelled by shutdown leaves the media pending; the upload is only reachable by URL
+    make_submission("sub_media_000003", media={"status": "pending"}, video_url=source.as_uri(),
+                    integrity_bundle={"video_metrics": {"duration": 2, "fps": 10}})
+    make_submission("sub_media_000004", media={"status": "failed", "error": "Media worker crashed"})
+
+    async def scenario():
+        pipeline.start(lambda: repository)
+        await _settle(pipeline)
+
+    asyncio.run(scenario())
+    assert repository.get_submission("sub_media_000003")["media"]["status"] == "ready"
+    assert repository.get_submission("sub_media_000004")["media"]["status"] == "failed"
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("talentspark-media-")]
@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import install_fakes
+
+VIDEO = bytes(range(256)) * 40
+KEY = "videos/submissions/sub_media_0001/video.webm"
+
+@pytest.fixture
+def media(settings, tmp_path):
+    """Local disk storage holding one video, and a client for the media route"""
+    from api.main import app
+    repository, storage = install_fakes("sqlite", sqlite_path=str(tmp_path / "talent_spark.db"), storage="local")
+    asyncio.run(storage.upload_video(VIDEO, KEY))
+    return storage, TestClient(app)
+
+def test_full_file(media):
+    storage, client = media
+    response = client.get(f"/api/media/{KEY}")
+    assert response.status_code == 200
+    assert response.content == VIDEO
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "video/webm"
+
+def test_range_request(media):
+    storage, client = media
+    response = client.get(f"/api/media/{KEY}", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == VIDEO[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(VIDEO)}"
+
+    suffix = client.get(f"/api/media/{KEY}", headers={"Range": "bytes=-10"})
+    assert suffix.status_code == 206
+    assert suffix.content == VIDEO[-10:]
+
+def test_unsatisfiable_range_is_416(media):
+    storage, client = media
+    response = client.get(f"/api/media/{KEY}", headers={"Range": f"bytes={len(VIDEO)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(VIDEO)}"
+
+def test_stale_if_range_sends_whole_file(media):
+    storage, client = media
+    etag = client.get(f"/api/media/{KEY}").headers["etag"]
+    fresh = client.get(f"/api/media/{KEY}", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206
+    stale = client.get(f"/api/media/{KEY}", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == VIDEO
+
+def test_etag_revalidates_with_304(media):
+    storage, client = media
+    etag = client.get(f"/api/media/{KEY}").headers["etag"]
+    response = client.get(f"/api/media/{KEY}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_directories_are_not_served(media):
+    storage, client = media
+    os.makedirs(storage.path_for("videos/submissions/sub_media_0001/frames"))
+    assert client.get("/api/media/videos/submissions/sub_media_0001/frames").status_code == 404
+
+def test_in_progress_uploads_are_not_served(media):
+    storage, client = media
+    partial = "videos/submissions/sub_media_0001/.upload-abc123"
+    with open(storage.path_for(partial), "wb") as f:
+        f.write(VIDEO[:10])
+    assert client.get(f"/api/media/{partial}").status_code == 404
+
+@pytest.mark.parametrize("path", ["../etc/passwd", "videos/missing.webm"])
+def test_missing_or_escaping_paths_are_404(media, path):
+    storage, client = media
+    assert client.get(f"/api/media/{path}").status_code == 404
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from api.services.admission import RateLimiter, get_upload_rate_limiter, upload_rate_keys
+from benchmarks.synthetic import build_bundle
+
+SAME_PHONE = {
+    "user_agent": "Mozilla/5.0 (Linux; Android 14; SM-A155F) Chrome/124.0.6367.82 Mobile",
+    "platform": "Linux armv8l",
+    "timezone": "Asia/Kolkata",
+    "screen_resolution": "1080x2340",
+}
+
+def _bundle(seed: int, athlete_id=None):
+    bundle = build_bundle(b"video", seed=seed)
+    device_info = dict(bundle.device_info.dict(), **SAME_PHONE)
+    return bundle.copy(update={"athlete_id": athlete_id, "device_info": type(bundle.device_info)(**device_info)})
+
+def test_keys_on_athlete_then_session():
+    with_athlete = _bundle(1, "ath_1")
+    without = _bundle(2)
+    assert upload_rate_keys(with_athlete)[0] == "athlete:ath_1"
+    assert upload_rate_keys(without)[0] == f"session:{without.session_id}"
+    # Same phone model, OS and timezone: one coarse device bucket
+    assert upload_rate_keys(with_athlete)[1] == upload_rate_keys(without)[1]
+
+def test_athletes_on_identical_phones_do_not_share_a_bucket(settings):
+    limiter = get_upload_rate_limiter()
+    athletes = [_bundle(i, f"ath_{i}") for i in range(10)]
+    for bundle in athletes:
+        for _ in range(settings.upload_burst):
+            assert limiter.acquire(*upload_rate_keys(bundle)) == 0
+    # Each athlete has used their own burst
+    assert limiter.acquire(*upload_rate_keys(athletes[0])) > 0
+
+def test_device_bucket_is_a_looser_backstop():
+    limiter = RateLimiter(6, 1, scopes={"device": (60, 3)})
+    assert [limiter.acquire(f"athlete:{i}", "device:phone") == 0 for i in range(4)] == [True, True, True, False]
+    # A rejection consumes nothing, so the athlete still has their token
+    assert limiter.acquire("athlete:3", "device:other") == 0
+
+def test_rejected_formats_do_not_use_tokens(client, settings):
+    bundle = _bundle(3, "ath_format")
+    for _ in range(settings.upload_burst + 2):
+        response = client.post(
+            "/api/submissions",
+            files={"video": ("clip.txt", b"not a video", "text/plain")},
+            data={"integrity_bundle": bundle.json()}
+        )
+        assert response.status_code == 400
+    assert get_upload_rate_limiter().acquire(*upload_rate_keys(bundle)) == 0
+
+def test_over_limit_upload_gets_429(client, settings):
+    bundle = _bundle(4, "ath_limited")
+    limiter = get_upload_rate_limiter()
+    for _ in range(settings.upload_burst):
+        limiter.acquire(*upload_rate_keys(bundle))
+
+    response = client.post(
+        "/api/submissions",
+        files={"video": ("clip.webm", b"video", "video/webm")},
+        data={"integrity_bundle": bundle.json()}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
@@ -0,0 +1,46 @@
+import pytest
+
+from api.services.review import stored_bundle, stored_timeline
+from benchmarks.synthetic import build_submission
+
+@pytest.fixture
+def submitted(client, repository):
+    video, content_type, bundle = build_submission(duration=3, container="mp4", reps=5, seed=7)
+    response = client.post(
+        "/api/submissions",
+        files={"video": ("clip.mp4", video, content_type)},
+        data={"integrity_bundle": bundle.json()}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["submission_id"], bundle
+
+def test_stored_bundle_keeps_thumbnail_urls_not_images(repository, submitted):
+    submission_id, bundle = submitted
+    snapshots = repository.get_submission(submission_id)["integrity_bundle"]["face_snapshots"]
+
+    assert len(snapshots) == len(bundle.face_snapshots)
+    assert all("image_data" not in snapshot for snapshot in snapshots)
+    assert all(snapshot["thumbnail_url"] for snapshot in snapshots)
+
+def test_images_are_kept_when_thumbnails_failed(submitted):
+    submission_id, bundle = submitted
+    kept = stored_bundle(bundle, None)
+    assert [s["image_data"] for s in kept["face_snapshots"]] == [s.image_data for s in bundle.face_snapshots]
+
+def test_older_documents_rebuild_the_timeline(repository, submitted):
+    submission_id, bundle = submitted
+    data = repository.get_submission(submission_id)
+    rebuilt = stored_timeline({"integrity_bundle": data["integrity_bundle"]})
+    assert rebuilt["offsets_ms"] == data["face_timeline"]["offsets_ms"]
+    assert rebuilt["thumbnails"] == data["face_timeline"]["thumbnails"]
+
+def test_review_bundle_revalidates_with_304(client, submitted):
+    submission_id, bundle = submitted
+    first = client.get(f"/api/submissions/{submission_id}/review")
+    assert first.status_code == 200
+    timeline = first.json()["timeline"]
+    assert len(timeline["thumbnails"]) == len(bundle.face_snapshots)
+    assert all(timeline["thumbnails"])
+
+    again = client.get(f"/api/submissions/{submission_id}/review", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
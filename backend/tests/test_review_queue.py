@@ -0,0 +1,122 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.services.review_queue import QUEUE_FIELDS, claim_next
+
+def _queue(make_submission, count):
+    """Pending submissions, oldest (so first in the queue) first"""
+    start = datetime.now() - timedelta(hours=count)
+    return [make_submission(f"sub_queue_{i:06d}", created_at=start + timedelta(hours=i))["id"]
+            for i in range(count)]
+
+def _claim(client, reviewer):
+    return client.post("/api/review-queue/claim", json={"reviewer": reviewer})
+
+def _decide(client, submission_id, token=None, decision="approved"):
+    return client.post(f"/api/submissions/{submission_id}/decision",
+                       json={"decision": decision, "reviewer": "rev", "lease_token": token})
+
+def test_claims_follow_queue_order_and_never_share(client, make_submission):
+    ids = _queue(make_submission, 2)
+    first, second = _claim(client, "alice").json(), _claim(client, "bob").json()
+    assert [first["submission_id"], second["submission_id"]] == ids
+    assert _claim(client, "carol").status_code == 204
+    # Claiming again renews the same lease rather than taking another item
+    again = _claim(client, "alice").json()
+    assert (again["submission_id"], again["lease_token"]) == (ids[0], first["lease_token"])
+
+def test_lease_conflicts_are_409(client, make_submission):
+    (submission_id,) = _queue(make_submission, 1)
+    lease = _claim(client, "alice").json()
+
+    assert _decide(client, submission_id).status_code == 409
+    assert _decide(client, submission_id, "not-the-token").status_code == 409
+    assert client.post(f"/api/review-queue/{submission_id}/renew",
+                       json={"lease_token": "not-the-token"}).status_code == 409
+
+    renewed = client.post(f"/api/review-queue/{submission_id}/renew", json={"lease_token": lease["lease_token"]})
+    assert renewed.status_code == 200
+    assert renewed.json()["lease_token"] == lease["lease_token"]
+
+    assert _decide(client, submission_id, lease["lease_token"]).status_code == 200
+    assert client.get(f"/api/submissions/{submission_id}").json()["status"] == "approved"
+
+def test_double_decision_is_409(client, make_submission):
+    (submission_id,) = _queue(make_submission, 1)
+    assert _decide(client, submission_id).status_code == 200
+    second = _decide(client, submission_id, decision="rejected")
+    assert second.status_code == 409
+    assert client.get(f"/api/submissions/{submission_id}").json()["status"] == "approved"
+
+def test_release_returns_item_to_queue(client, make_submission):
+    (submission_id,) = _queue(make_submission, 1)
+    lease = _claim(client, "alice").json()
+    assert client.post(f"/api/review-queue/{submission_id}/release",
+                       json={"lease_token": lease["lease_token"]}).status_code == 200
+    assert _claim(client, "bob").json()["submission_id"] == submission_id
+    # Alice's token died with the release
+    assert _decide(client, submission_id, lease["lease_token"]).status_code == 409
+
+def test_lease_writes_leave_the_rest_of_the_document(repository, make_submission):
+    (submission_id,) = _queue(make_submission, 1)
+    before = repository.get_submission(submission_id)
+    claimed = claim_next(repository, "alice")
+    assert claimed["profile_data"] == before["profile_data"]
+
+    released = repository.transact_submission(submission_id, lambda current: {"lease": None}, fields=QUEUE_FIELDS)
+    assert released["lease"] is None
+    after = repository.get_submission(submission_id)
+    assert after["lease"] is None
+    assert {k: v for k, v in after.items() if k != "lease"} == {k: v for k, v in before.items() if k != "lease"}
+
+def test_concurrent_claims_get_distinct_items(repository, make_submission):
+    ids = _queue(make_submission, 6)
+    claimed, barrier = {}, threading.Barrier(8)
+
+    def reviewer(name):
+        barrier.wait()
+        result = claim_next(repository, name)
+        claimed[name] = result["id"] if result else None
+
+    threads = [threading.Thread(target=reviewer, args=(f"rev{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    won = [submission_id for submission_id in claimed.values() if submission_id]
+    assert sorted(won) == ids
+    assert list(claimed.values()).count(None) == 2
+
+def test_claims_page_past_leased_items(settings, monkeypatch, repository, make_submission):
+    monkeypatch.setattr(settings, "review_queue_scan", 2)
+    ids = _queue(make_submission, 5)
+    assert [claim_next(repository, f"rev{i}")["id"] for i in range(5)] == ids
+    assert claim_next(repository, "late") is None
+
+def test_queue_listing_pages_by_cursor(client, make_submission):
+    ids = _queue(make_submission, 5)
+    first = client.get("/api/review-queue?limit=2").json()
+    assert [item["submission_id"] for item in first] == ids[:2]
+
+    last = first[-1]
+    rest = client.get("/api/review-queue", params={
+        "limit": 10, "after_key": last["queue_key"], "after_id": last["submission_id"]
+    }).json()
+    assert [item["submission_id"] for item in rest] == ids[2:]
+
+    assert client.get("/api/review-queue", params={"after_key": last["queue_key"]}).status_code == 400
+
+def test_equal_keys_page_without_gaps(repository, make_submission):
+    created_at = datetime.now()
+    ids = sorted(make_submission(f"sub_tie_{i:06d}", created_at=created_at)["id"] for i in range(5))
+    seen, after = [], None
+    while True:
+        page = repository.list_review_queue(limit=2, after=after, fields=QUEUE_FIELDS)
+        seen.extend(item["id"] for item in page)
+        if len(page) < 2:
+            break
+        after = (page[-1]["review_queue_key"], page[-1]["id"])
+    assert seen == ids
@@ -0,0 +1,62 @@
+import sqlite3
+
+from api.services.sqlite_repository import SQLiteRepository, _MIGRATIONS
+
+def _entry(submission_id, reps):
+    return {"submission_id": submission_id, "age_band": "19-25", "gender": "male",
+            "total_reps": reps, "form_score": 80.0, "user_id": f"user_{submission_id}"}
+
+def _legacy_database(path):
+    """A database from before the migrations: no unique index, duplicate entries, user_version 0"""
+    SQLiteRepository(path).pool.close()
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_leaderboard_submission")
+    conn.execute("PRAGMA user_version = 0")
+    for reps in (10, 20):
+        conn.execute("INSERT INTO leaderboard (submission_id, age_band, gender, total_reps, form_score, data) "
+                     "VALUES ('sub_dup', '19-25', 'male', ?, 80.0, '{}')", (reps,))
+    conn.commit()
+    conn.close()
+
+def _rows(path, submission_id):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT total_reps FROM leaderboard WHERE submission_id = ?", (submission_id,)).fetchall()
+    finally:
+        conn.close()
+
+def test_new_database_is_fully_migrated(tmp_path):
+    path = str(tmp_path / "fresh.db")
+    repository = SQLiteRepository(path)
+    with repository.pool.connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(_MIGRATIONS)
+    repository.add_leaderboard_entry(_entry("sub_a", 10))
+    repository.add_leaderboard_entry(_entry("sub_a", 12))
+    assert _rows(path, "sub_a") == [(12,)]
+
+def test_legacy_duplicates_are_removed_once(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    _legacy_database(path)
+
+    repository = SQLiteRepository(path)
+    # The newest entry survives, and every pooled connection sees the unique index
+    assert _rows(path, "sub_dup") == [(20,)]
+    for _ in range(repository.pool.size):
+        repository.add_leaderboard_entry(_entry("sub_dup", 30))
+    assert _rows(path, "sub_dup") == [(30,)]
+    repository.pool.close()
+
+def test_migrations_do_not_rerun_on_open(tmp_path):
+    path = str(tmp_path / "migrated.db")
+    SQLiteRepository(path).pool.close()
+
+    # Rows the dedupe would delete if it ran again
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_leaderboard_submission")
+    conn.executemany("INSERT INTO leaderboard (submission_id, age_band, gender, total_reps, form_score, data) "
+                     "VALUES ('sub_keep', '19-25', 'male', ?, 80.0, '{}')", [(1,), (2,)])
+    conn.commit()
+    conn.close()
+
+    SQLiteRepository(path).pool.close()
+    assert len(_rows(path, "sub_keep")) == 2
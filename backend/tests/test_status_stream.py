@@ -0,0 +1,28 @@
+import asyncio
+from datetime import datetime
+
+from api.routes.submissions import stream_submission_status
+from api.services.repository import get_repository
+from api.services.status_broker import status_broker, status_payload
+from api.services.submission_cache import get_submission_cache
+
+def test_change_before_stream_starts_is_not_lost(make_submission):
+    make_submission("sub_stream_000001")
+
+    async def scenario():
+        response = await stream_submission_status("sub_stream_000001")
+        # Decided after the handler returned but before the client reads anything
+        reviewed_at = datetime.now()
+        get_repository().update_submission("sub_stream_000001", {"status": "approved", "reviewed_at": reviewed_at})
+        data = get_repository().get_submission("sub_stream_000001")
+        get_submission_cache().put(data)
+        status_broker.publish("sub_stream_000001", status_payload("sub_stream_000001", data))
+
+        chunks = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+        return chunks
+
+    chunks = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert len(chunks) == 1
+    assert '"status": "approved"' in chunks[0]
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import pytest
+
+from api.services import submission_cache as cache_module
+from api.services.submission_cache import (
+    SubmissionCache, InProcessCacheBackend, RedisCacheBackend, CACHE_EVICTIONS, FULL, STATUS, STATUS_FIELDS,
+    get_submission_cache
+)
+from benchmarks.fakes import FakeRedisClient
+
+def _document(submission_id, status="pending"):
+    now = datetime(2026, 5, 1, 12)
+    return {
+        "id": submission_id, "status": status, "risk_score": "green",
+        "created_at": now, "updated_at": now, "reviewed_at": None,
+        "integrity_bundle": {"video_metrics": {"duration": 30, "fps": 30}},
+    }
+
+def _unreachable(submission_id):
+    raise AssertionError(f"Loader called for {submission_id}")
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the cache and FakeRedisClient expiry checks"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+def test_lru_evicts_the_least_recently_used_entry():
+    backend = InProcessCacheBackend(max_entries=2)
+    evictions = CACHE_EVICTIONS.value()
+    backend.set("a", {"v": 1}, 60)
+    backend.set("b", {"v": 2}, 60)
+    # Reading "a" makes "b" the oldest
+    assert backend.get("a") == {"v": 1}
+    backend.set("c", {"v": 3}, 60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == {"v": 1} and backend.get("c") == {"v": 3}
+    assert backend.size() == 2
+    assert CACHE_EVICTIONS.value() == evictions + 1
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_entries_expire_after_the_ttl(backend, clock):
+    store = InProcessCacheBackend() if backend == "memory" else RedisCacheBackend(client=FakeRedisClient())
+    cache = SubmissionCache(store, ttl=30)
+    cache.put(_document("sub_cache_0001"))
+
+    clock[0] += 29
+    assert cache.get("sub_cache_0001", _unreachable)["status"] == "pending"
+
+    clock[0] += 2
+    reloaded = []
+    assert cache.get("sub_cache_0001", lambda i: reloaded.append(i) or _document(i, "approved"))["status"] == "approved"
+    assert reloaded == ["sub_cache_0001"]
+
+def test_status_projection_is_served_without_the_full_document():
+    cache = SubmissionCache(InProcessCacheBackend(), ttl=30)
+    document = _document("sub_cache_0001")
+
+    assert cache.get("sub_cache_0001", lambda i: document, projection=STATUS) == {
+        field: document.get(field) for field in STATUS_FIELDS
+    }
+    # The miss filled both projections
+    assert cache.get("sub_cache_0001", _unreachable, projection=FULL) == document
+    status = cache.get("sub_cache_0001", _unreachable, projection=STATUS)
+    assert set(status) == set(STATUS_FIELDS) and "integrity_bundle" not in status
+
+    # Callers get a copy, not the cached document
+    status["status"] = "approved"
+    assert cache.get("sub_cache_0001", _unreachable, projection=STATUS)["status"] == "pending"
+
+def test_hit_rate_through_redis():
+    client = FakeRedisClient()
+    cache = SubmissionCache(RedisCacheBackend(client=client), ttl=30)
+    loads = []
+
+    def loader(submission_id):
+        loads.append(submission_id)
+        return _document(submission_id)
+
+    cache.get("sub_cache_0001", loader)
+    cache.get("sub_cache_0001", loader)
+    cache.get("sub_cache_0001", loader, projection=STATUS)
+    assert cache.get("sub_cache_0002", lambda i: None) is None
+
+    assert loads == ["sub_cache_0001"]
+    assert cache.stats() == {"backend": "redis", "entries": None, "hits": 2, "misses": 2, "hit_rate": 0.5}
+    assert client.reads == 4
+    # One write per projection
+    assert client.writes == 2
+
+def test_decision_writes_through_to_the_cache(client, make_submission):
+    make_submission("sub_cache_0001")
+    cache = get_submission_cache()
+    assert client.get("/api/submissions/sub_cache_0001/status").json()["status"] == "pending"
+
+    lease = client.post("/api/review-queue/claim", json={"reviewer": "rev"}).json()
+    response = client.post("/api/submissions/sub_cache_0001/decision",
+                           json={"decision": "approved", "reviewer": "rev", "lease_token": lease["lease_token"]})
+    assert response.status_code == 200
+
+    # Both projections already hold the decision; no reload needed
+    assert cache.get("sub_cache_0001", _unreachable, projection=STATUS)["status"] == "approved"
+    assert cache.get("sub_cache_0001", _unreachable)["reviewed_by"] == "rev"
+    assert client.get("/api/submissions/sub_cache_0001/status").json()["status"] == "approved"
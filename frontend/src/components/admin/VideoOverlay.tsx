@@ -1,15 +1,25 @@
 import React from 'react'
+import { ReviewMedia } from '../../services/api'
+
+interface VideoOverlayProps {
+  videoUrl?: string
+  media?: ReviewMedia | null
+}
+
+const VideoOverlay: React.FC<VideoOverlayProps> = ({ videoUrl = '/demo-squat.webm', media }) => {
+  // Scrub the downscaled proxy; the original upload is only needed if rendering failed
+  const src = media?.status === 'ready' && media.proxy_url ? media.proxy_url : videoUrl
 
-const VideoOverlay: React.FC = () => {
   return (
     <div className="relative">
       <video 
         controls 
+        preload="metadata"
+        poster={media?.poster_url ?? undefined}
         className="w-full rounded-lg bg-gray-900"
         style={{ aspectRatio: '16/9' }}
-      >
-        <source src="/demo-squat.webm" type="video/webm" />
-      </video>
+        src={src}
+      />
       
       {/* Rep Timeline Overlay */}
       <div className="absolute bottom-4 left-4 right-4 bg-black/70 text-white p-3 rounded-lg">
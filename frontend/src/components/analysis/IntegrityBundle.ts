@@ -37,6 +37,19 @@ interface IntegrityData {
   assessmentData: AssessmentData
   contentHash: string
   version: string
+  athleteId: string
+}
+
+const ATHLETE_ID_KEY = 'talentspark_athlete_id'
+
+// Stable per-install ID so the server can keep this athlete's performance history
+export function getAthleteId(): string {
+  let athleteId = localStorage.getItem(ATHLETE_ID_KEY)
+  if (!athleteId) {
+    athleteId = `ath_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`
+    localStorage.setItem(ATHLETE_ID_KEY, athleteId)
+  }
+  return athleteId
 }
 
 export class IntegrityBundleManager {
@@ -81,7 +94,8 @@ export class IntegrityBundleManager {
       videoMetrics,
       assessmentData,
       contentHash: await this.generateContentHash(videoBlob, assessmentData),
-      version: '1.0.0'
+      version: '1.0.0',
+      athleteId: getAthleteId()
     }
 
     return bundle
@@ -6,6 +6,38 @@ export interface SubmissionResponse {
   message: string
 }
 
+// Review assets rendered after ingestion; absent until the media pipeline finishes
+export interface ReviewMedia {
+  status: 'pending' | 'ready' | 'failed' | 'deferred'
+  proxy_url: string | null
+  preview_url: string | null
+  poster_url: string | null
+  sprite_url: string | null
+  sprite: {
+    tile_width: number
+    tile_height: number
+    columns: number
+    offsets: number[]
+  } | null
+  error: string | null
+}
+
+// Thrown when the server sheds load (429/503); the upload should be retried later, not failed
+export class RetryableUploadError extends Error {
+  constructor(message: string, public retryAfterMs: number) {
+    super(message)
+    this.name = 'RetryableUploadError'
+  }
+}
+
+function parseRetryAfter(header: string | null, fallbackMs = 30000): number {
+  if (!header) return fallbackMs
+  const seconds = Number(header)
+  if (!Number.isNaN(seconds)) return Math.max(1, seconds) * 1000
+  const date = Date.parse(header)
+  return Number.isNaN(date) ? fallbackMs : Math.max(1000, date - Date.now())
+}
+
 export async function submitAssessment(
   videoBlob: Blob, 
   integrityBundle: any
@@ -19,6 +51,13 @@ export async function submitAssessment(
     body: formData,
   })
 
+  if (response.status === 429 || response.status === 503) {
+    throw new RetryableUploadError(
+      `Upload deferred: ${response.statusText}`,
+      parseRetryAfter(response.headers.get('Retry-After'))
+    )
+  }
+
   if (!response.ok) {
     throw new Error(`Upload failed: ${response.statusText}`)
   }
@@ -26,6 +65,125 @@ export async function submitAssessment(
   return await response.json()
 }
 
+export interface MetricProgress {
+  count: number
+  mean: number
+  std: number
+  ewma: number
+  min: number
+  max: number
+  last: number
+  recent: number[]
+}
+
+export interface AthleteProgress {
+  athlete_id: string
+  submissions: number
+  first_at: string | null
+  updated_at: string | null
+  metrics: Record<'total_reps' | 'form_score' | 'average_rep_time', MetricProgress>
+}
+
+// Returns null until the athlete has at least one submission on record
+export async function getAthleteProgress(athleteId: string): Promise<AthleteProgress | null> {
+  const response = await fetch(`${API_BASE_URL}/api/athletes/${encodeURIComponent(athleteId)}/progress`)
+
+  if (response.status === 404) return null
+  if (!response.ok) {
+    throw new Error(`Progress fetch failed: ${response.statusText}`)
+  }
+
+  return await response.json()
+}
+
+// Columnar: offsets_ms[i], confidence[i], gap_before[i] and thumbnails[i] describe one snapshot
+export interface FaceTimeline {
+  started_at: number | null
+  offsets_ms: number[]
+  confidence: number[]
+  gap_before: boolean[]
+  thumbnails: (string | null)[]
+  max_gap_ms: number
+  low_confidence: number
+  min_confidence: number
+}
+
+export interface VerificationCheck {
+  check: string
+  label: string
+  passed: boolean
+  detail: string | null
+}
+
+export interface ReviewBundle {
+  submission: {
+    id: string
+    status: 'pending' | 'approved' | 'rejected'
+    risk_score: 'green' | 'yellow' | 'red'
+    risk_flags: string[]
+    video_url: string
+    media: ReviewMedia | null
+    [field: string]: unknown
+  }
+  checks: VerificationCheck[]
+  timeline: FaceTimeline
+  history_zscores: Record<string, number>
+  device_profiles: number | null
+  events: { type: string; at: string; actor: string | null }[]
+}
+
+// Everything the admin review screen shows, in one request
+export async function getReviewBundle(submissionId: string): Promise<ReviewBundle> {
+  const response = await fetch(`${API_BASE_URL}/api/submissions/${encodeURIComponent(submissionId)}/review`)
+
+  if (!response.ok) {
+    throw new Error(`Review fetch failed: ${response.statusText}`)
+  }
+
+  return await response.json()
+}
+
+export interface ReviewLease {
+  submission_id: string
+  reviewer: string
+  lease_token: string
+  expires_at: string
+}
+
+// Next item from the risk-prioritised review queue, or null when nothing is free
+export async function claimNextReview(reviewer: string): Promise<ReviewLease | null> {
+  const response = await fetch(`${API_BASE_URL}/api/review-queue/claim`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ reviewer })
+  })
+
+  if (response.status === 204) return null
+  if (!response.ok) {
+    throw new Error(`Claim failed: ${response.statusText}`)
+  }
+
+  return await response.json()
+}
+
+// Extend the lease while the reviewer is still looking, or give the item back
+export async function updateReviewLease(lease: ReviewLease, action: 'renew' | 'release') {
+  const response = await fetch(
+    `${API_BASE_URL}/api/review-queue/${encodeURIComponent(lease.submission_id)}/${action}`,
+    {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ lease_token: lease.lease_token })
+    }
+  )
+
+  if (!response.ok) {
+    throw new Error(`Lease ${action} failed: ${response.statusText}`)
+  }
+
+  return await response.json()
+}
+
 export async function getSubmissionStatus(submissionId: string) {
   const response = await fetch(`${API_BASE_URL}/api/submissions/${submissionId}`)
   
@@ -36,9 +194,11 @@ export async function getSubmissionStatus(submissionId: string) {
   return await response.json()
 }
 
-export async function getLeaderboard(ageBand: string, gender: string) {
+export type LeaderboardWindow = 'all' | 'daily' | 'weekly' | 'season'
+
+export async function getLeaderboard(ageBand: string, gender: string, window: LeaderboardWindow = 'all') {
   const response = await fetch(
-    `${API_BASE_URL}/api/leaderboard?age_band=${ageBand}&gender=${gender}`
+    `${API_BASE_URL}/api/leaderboard?age_band=${ageBand}&gender=${gender}&window=${window}`
   )
   
   if (!response.ok) {
@@ -47,3 +207,50 @@ export async function getLeaderboard(ageBand: string, gender: string) {
 
   return await response.json()
 }
+
+export interface SubmissionStatusUpdate {
+  submission_id: string
+  status: 'pending' | 'approved' | 'rejected' | 'flagged'
+  created_at: string
+  reviewed_at: string | null
+}
+
+const TERMINAL_STATUSES = ['approved', 'rejected']
+
+// Push status changes over Server-Sent Events; falls back to slow polling
+// where EventSource is unavailable. Returns an unsubscribe function.
+export function subscribeToSubmissionStatus(
+  submissionId: string,
+  onStatus: (update: SubmissionStatusUpdate) => void,
+  pollIntervalMs = 15000
+): () => void {
+  if (typeof EventSource !== 'undefined') {
+    const source = new EventSource(`${API_BASE_URL}/api/submissions/${submissionId}/events`)
+    source.addEventListener('status', (event) => {
+      const update: SubmissionStatusUpdate = JSON.parse((event as MessageEvent).data)
+      onStatus(update)
+      if (TERMINAL_STATUSES.includes(update.status)) {
+        source.close()
+      }
+    })
+    return () => source.close()
+  }
+
+  let stopped = false
+  const poll = async () => {
+    if (stopped) return
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/submissions/${submissionId}/status`)
+      if (response.ok) {
+        const update: SubmissionStatusUpdate = await response.json()
+        onStatus(update)
+        if (TERMINAL_STATUSES.includes(update.status)) return
+      }
+    } catch (error) {
+      console.error('Status poll failed:', error)
+    }
+    setTimeout(poll, pollIntervalMs)
+  }
+  poll()
+  return () => { stopped = true }
+}
@@ -1,10 +1,11 @@
 import IndexedDBManager from './idb'
-import { submitAssessment } from '../services/api'
+import { submitAssessment, RetryableUploadError } from '../services/api'
 
 class SyncQueue {
   private idb: IndexedDBManager
   private isOnline = navigator.onLine
   private syncInProgress = false
+  private retryTimer: ReturnType<typeof setTimeout> | null = null
 
   constructor() {
     this.idb = new IndexedDBManager()
@@ -58,6 +59,11 @@ class SyncQueue {
           await submitAssessment(assessment.videoBlob, assessment.integrityBundle)
           await this.idb.updateAssessmentStatus(assessment.id, 'uploaded')
         } catch (error) {
+          if (error instanceof RetryableUploadError) {
+            // Server asked us to back off: keep the rest pending and try again later
+            this.scheduleRetry(error.retryAfterMs)
+            break
+          }
           console.error('Upload failed:', error)
           await this.idb.updateAssessmentStatus(assessment.id, 'failed')
         }
@@ -67,6 +73,16 @@ class SyncQueue {
     }
   }
 
+  private scheduleRetry(delayMs: number) {
+    if (this.retryTimer) clearTimeout(this.retryTimer)
+    // Jitter so devices shed at the same moment don't all come back together
+    const jitter = Math.random() * delayMs * 0.2
+    this.retryTimer = setTimeout(() => {
+      this.retryTimer = null
+      this.processPendingUploads()
+    }, delayMs + jitter)
+  }
+
   async getPendingCount(): Promise<number> {
     const pending = await this.idb.getPendingAssessments()
     return pending.length